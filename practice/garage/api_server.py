@@ -4,26 +4,38 @@ Web API Server for PDF OCR Processing
 """
 
 import asyncio
+import json
 import logging
 import mimetypes
 import time
 import uuid
 from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Dict, List, Optional, Union
+from typing import Dict, List, Optional, Tuple, Union
 
 import uvicorn
-from fastapi import FastAPI, File, HTTPException, UploadFile, BackgroundTasks, Depends, Security
+from fastapi import FastAPI, File, HTTPException, UploadFile, Depends, Security, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import FileResponse, StreamingResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from pydantic import BaseModel, Field
-from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
 from starlette.responses import Response
 
-from config import Config, ConfigManager
-from pdf_processor import PDFProcessor, ProcessorFactory, ProcessingConfig, DocumentResult, ProcessingStatus
+from config import CacheSettings, Config, ConfigManager, SecuritySettings
+from pdf_processor import ProcessingConfig, DocumentResult, ProcessingStatus
+from search_pdf import process_image_simple, process_pdf_with_checkpoint
+from uploads import UploadSizeLimitMiddleware, UploadTooLarge, stream_to_disk
+from job_queue import Job, JobScheduler, QueueFull, SchedulerUnavailable
+from task_store import MemoryTaskStore, TaskStore, create_task_store
+from progress import ProgressHub, ProgressRelay, init_progress_worker, progress_reporter
+from rate_limit import RateLimiter, RateLimitMiddleware, client_key_from_scope
+
+# SSE 연결 유지용 주석 전송 간격 (프록시 유휴 타임아웃 방지)
+SSE_HEARTBEAT_SECONDS = 15
+
+# multipart 경계/헤더 등 파일 본문 외 요청 크기 여유분
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
 
 
 # Pydantic 모델들
@@ -72,43 +84,64 @@ class HealthCheck(BaseModel):
     uptime: float
     active_tasks: int
     system_info: Dict[str, Union[str, int, float]]
+    queue: Optional[Dict[str, Union[bool, int, float]]] = None
 
 
 # 태스크 매니저
+ACTIVE_STATUSES = (ProcessingStatus.PENDING, ProcessingStatus.IN_PROGRESS)
+
+
 class TaskManager:
-    """비동기 태스크 관리자"""
+    """비동기 태스크 관리자 (저장은 TaskStore 백엔드에 위임)"""
     
-    def __init__(self):
-        self.tasks: Dict[str, Dict] = {}
-        self.results: Dict[str, DocumentResult] = {}
+    def __init__(self, store: Optional[TaskStore] = None):
+        self.store = store or MemoryTaskStore(ACTIVE_STATUSES)
         self.start_time = time.time()
+        self._cleanup_task: Optional[asyncio.Task] = None
+    
+    def use_store(self, store: TaskStore):
+        """저장소 교체 (설정 로드 후 SQLite 등으로 전환)"""
+        self.store.close()
+        self.store = store
     
-    def create_task(self, file_path: Path, config: ProcessingConfig) -> str:
+    def create_task(self, file_path: Path, config: ProcessingConfig, sha256: Optional[str] = None) -> str:
         """새 태스크 생성"""
         task_id = str(uuid.uuid4())
-        self.tasks[task_id] = {
+        self.store.add(task_id, {
             "status": ProcessingStatus.PENDING,
             "file_path": file_path,
             "config": config,
             "created_at": time.time(),
             "progress": 0.0,
             "total_pages": 0,
-            "processed_pages": 0
-        }
+            "processed_pages": 0,
+            "sha256": sha256
+        })
+        return task_id
+    
+    def find_duplicate(self, sha256: str) -> Optional[str]:
+        """같은 내용의 문서를 처리 중이거나 처리 완료한 태스크 ID (실패/취소는 제외)"""
+        task_id = self.store.find_by_fingerprint(sha256)
+        task = self.store.get(task_id) if task_id else None
+        if task is None or task["status"] in [ProcessingStatus.FAILED, ProcessingStatus.CANCELLED]:
+            return None
         return task_id
     
     def update_task(self, task_id: str, **kwargs):
         """태스크 상태 업데이트"""
-        if task_id in self.tasks:
-            self.tasks[task_id].update(kwargs)
+        self.store.update(task_id, **kwargs)
     
     def get_task(self, task_id: str) -> Optional[Dict]:
         """태스크 정보 조회"""
-        return self.tasks.get(task_id)
+        return self.store.get(task_id)
+    
+    def remove_task(self, task_id: str):
+        """태스크 삭제 (큐 등록 실패 시 되돌리기용)"""
+        self.store.delete(task_id)
     
     def set_result(self, task_id: str, result: DocumentResult):
         """태스크 결과 저장"""
-        self.results[task_id] = result
+        self.store.set_result(task_id, result)
         self.update_task(
             task_id,
             status=result.status,
@@ -119,65 +152,49 @@ class TaskManager:
     
     def get_result(self, task_id: str) -> Optional[DocumentResult]:
         """태스크 결과 조회"""
-        return self.results.get(task_id)
+        return self.store.get_result(task_id)
     
     def get_active_task_count(self) -> int:
-        """활성 태스크 수"""
-        return sum(
-            1 for task in self.tasks.values()
-            if task["status"] in [ProcessingStatus.PENDING, ProcessingStatus.IN_PROGRESS]
-        )
-    
-    def cleanup_old_tasks(self, max_age_hours: int = 24):
-        """오래된 태스크 정리"""
-        current_time = time.time()
-        cutoff_time = current_time - (max_age_hours * 3600)
+        """활성 태스크 수 (저장소가 상태 변경 시 갱신하는 카운터)"""
+        return self.store.count_active()
+    
+    def list_tasks(self, limit: int = 10, cursor: Optional[str] = None,
+                   status: Optional[str] = None) -> Tuple[List[Tuple[str, Dict]], Optional[str]]:
+        """최신순 태스크 목록 한 페이지와 다음 커서"""
+        return self.store.page(limit, cursor, status)
+    
+    def fail_interrupted_tasks(self) -> int:
+        """재시작 전에 대기/실행 중이던 태스크를 실패로 표시 (작업 큐는 메모리에만 있으므로)"""
+        interrupted = self.store.ids_with_status(ACTIVE_STATUSES)
+        for task_id in interrupted:
+            self.update_task(task_id, status=ProcessingStatus.FAILED, error_message="서버 재시작으로 중단됨")
+        return len(interrupted)
+    
+    def cleanup_old_tasks(self, max_age_hours: int = 24) -> int:
+        """오래된 태스크 정리 (created_at 인덱스로 만료분만 삭제)"""
+        cutoff_time = time.time() - (max_age_hours * 3600)
+        return len(self.store.expire(cutoff_time))
+    
+    def start_cleanup(self, max_age_hours: int = 24, interval_seconds: float = 600):
+        """TTL 만료 태스크를 주기적으로 정리하는 백그라운드 타이머 시작"""
+        async def loop():
+            while True:
+                await asyncio.sleep(interval_seconds)
+                try:
+                    removed = self.cleanup_old_tasks(max_age_hours)
+                    if removed:
+                        logging.info(f"만료 태스크 {removed}개 정리됨")
+                except Exception as e:
+                    logging.error(f"태스크 정리 실패: {e}")
         
-        old_task_ids = [
-            task_id for task_id, task in self.tasks.items()
-            if task["created_at"] < cutoff_time
-        ]
-        
-        for task_id in old_task_ids:
-            self.tasks.pop(task_id, None)
-            self.results.pop(task_id, None)
-
-
-# 미들웨어
-class RateLimitMiddleware(BaseHTTPMiddleware):
-    """요청 제한 미들웨어"""
+        self.stop_cleanup()
+        self._cleanup_task = asyncio.create_task(loop())
     
-    def __init__(self, app, requests_per_minute: int = 60):
-        super().__init__(app)
-        self.requests_per_minute = requests_per_minute
-        self.requests: Dict[str, List[float]] = {}
-    
-    async def dispatch(self, request: Request, call_next):
-        client_ip = request.client.host if request.client else "unknown"
-        current_time = time.time()
-        
-        # 클라이언트별 요청 기록 관리
-        if client_ip not in self.requests:
-            self.requests[client_ip] = []
-        
-        # 1분 이내 요청들만 유지
-        self.requests[client_ip] = [
-            req_time for req_time in self.requests[client_ip]
-            if current_time - req_time < 60
-        ]
-        
-        # 요청 제한 확인
-        if len(self.requests[client_ip]) >= self.requests_per_minute:
-            return JSONResponse(
-                status_code=429,
-                content={"detail": "Rate limit exceeded. Try again later."}
-            )
-        
-        # 현재 요청 기록
-        self.requests[client_ip].append(current_time)
-        
-        response = await call_next(request)
-        return response
+    def stop_cleanup(self):
+        """정리 타이머 중지"""
+        if self._cleanup_task is not None:
+            self._cleanup_task.cancel()
+            self._cleanup_task = None
 
 
 # 인증
@@ -204,34 +221,51 @@ class APIKeyAuth:
 task_manager = TaskManager()
 config_manager = ConfigManager()
 app_config: Config = None
-processor: PDFProcessor = None
+scheduler: JobScheduler = None
 auth: APIKeyAuth = None
+progress_hub = ProgressHub()
+progress_relay: ProgressRelay = None
+rate_limiter = RateLimiter()  # 설정 로드 전에는 기본값 (분당 60회)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """앱 생명주기 관리"""
-    global app_config, processor, auth
+    global app_config, scheduler, auth, progress_relay
     
     # 시작 시 초기화
     app_config = config_manager.load_config()
     
-    # 프로세서 초기화
-    processing_config = ProcessingConfig(
-        dpi=app_config.image.default_dpi,
-        language=app_config.ocr.default_language,
-        confidence_threshold=app_config.ocr.confidence_threshold,
+    # 태스크 저장소 (SQLite 면 재시작 전 태스크 유지, 중단된 작업은 실패로 표시)
+    if app_config.api.task_store != "memory":
+        task_manager.use_store(create_task_store(
+            app_config.api.task_store, app_config.api.task_db_path, ACTIVE_STATUSES
+        ))
+        interrupted = task_manager.fail_interrupted_tasks()
+        if interrupted:
+            logging.warning(f"재시작으로 중단된 태스크 {interrupted}개를 실패로 표시함")
+    task_manager.start_cleanup(app_config.api.task_ttl_hours, app_config.api.task_cleanup_interval)
+    
+    # 워커 프로세스의 페이지 진행 이벤트를 이벤트 루프로 넘기는 중계기
+    progress_relay = ProgressRelay(on_progress_event)
+    progress_relay.start(asyncio.get_running_loop())
+    
+    # OCR 작업 스케줄러: processing.max_workers 개의 워커 프로세스가 전역 동시 작업 수 상한
+    scheduler = JobScheduler(
         workers=app_config.processing.max_workers,
-        auto_dpi=app_config.image.auto_dpi_enabled,
-        save_json=app_config.output.save_json,
-        cache_enabled=app_config.cache.enabled,
-        cache_ttl=app_config.cache.ttl_seconds
+        max_queue=app_config.api.max_queue_size,
+        max_per_key=app_config.api.max_queued_per_key,
+        initializer=init_progress_worker,
+        initargs=(progress_relay.queue,)
     )
-    processor = ProcessorFactory.create_processor(processing_config)
+    await scheduler.start()
     
     # 인증 초기화
     auth = APIKeyAuth(app_config.api.api_key)
     
+    # 요청 제한 (설정이 잘못되면 ValueError 로 시작 실패)
+    rate_limiter.configure_from_settings(app_config.api)
+    
     # 출력 디렉토리 생성
     Path(app_config.output.output_directory).mkdir(parents=True, exist_ok=True)
     
@@ -239,7 +273,12 @@ async def lifespan(app: FastAPI):
     
     yield
     
-    # 종료 시 정리
+    # 종료 시 정리 (대기 작업 취소, 실행 중인 워커 프로세스 종료 대기)
+    await scheduler.stop()
+    progress_relay.stop()
+    task_manager.stop_cleanup()
+    task_manager.store.close()
+    rate_limiter.close()
     logging.info("PDF OCR API 서버 종료됨")
 
 
@@ -252,6 +291,16 @@ app = FastAPI(
 )
 
 
+def upload_limit_bytes() -> int:
+    """업로드 요청 본문 상한 (설정 로드 전에는 기본값)"""
+    security = app_config.security if app_config else SecuritySettings()
+    return security.max_file_size_mb * 1024 * 1024 + MULTIPART_OVERHEAD_BYTES
+
+
+# 업로드 크기 제한: multipart 파싱 전에 Content-Length/수신 바이트로 조기 거절
+app.add_middleware(UploadSizeLimitMiddleware, max_bytes=upload_limit_bytes)
+
+
 # CORS 설정
 async def setup_cors():
     if app_config and app_config.api.cors_enabled:
@@ -264,38 +313,126 @@ async def setup_cors():
         )
 
 
-# Rate limiting 설정
-async def setup_rate_limiting():
-    if app_config and app_config.api.rate_limit_enabled:
-        app.add_middleware(
-            RateLimitMiddleware,
-            requests_per_minute=app_config.api.requests_per_minute
+# Rate limiting 설정: 미들웨어는 공유 제한기를 쓰고, lifespan 에서 api.rate_limit_* 로 재구성
+app.add_middleware(RateLimitMiddleware, limiter=rate_limiter)
+
+
+# OCR 작업 (워커 프로세스에서 실행)
+def run_ocr_job(file_path: Path, output_dir: Path, config: ProcessingConfig,
+                task_id: Optional[str] = None, cache_settings: Optional[CacheSettings] = None) -> DocumentResult:
+    """
+    문서 하나를 OCR 처리 (JobScheduler 워커 프로세스 안에서 실행)
+
+    PDF 는 search_pdf 체크포인트 파이프라인으로 처리하며, 단계/페이지 완료 이벤트를
+    중계 큐로 보낸다 (task_id 가 있을 때). 결과 파일은 <output_dir>/<stem>_searchable.pdf(.json).
+    일부 페이지가 실패하면 RuntimeError (태스크는 실패로 기록됨).
+    """
+    report = progress_reporter(task_id) if task_id else None
+    last: Dict = {}
+    
+    def on_progress(event: Dict):
+        last.update(event)
+        if report is not None:
+            report(event)
+    
+    start = time.time()
+    output_dir.mkdir(parents=True, exist_ok=True)
+    if file_path.suffix.lower() == ".pdf":
+        process_pdf_with_checkpoint(
+            file_path, output_dir,
+            dpi=config.dpi, auto_dpi=config.auto_dpi,
+            lang_opt=config.language, conf=config.confidence_threshold,
+            save_json=config.save_json, workers=config.workers,
+            resume=False, keep_ckpt=False,
+            cache_settings=cache_settings,
+            progress_callback=on_progress
         )
+    else:
+        process_image_simple(file_path, output_dir, config.language, config.confidence_threshold,
+                             config.save_json, cache_settings)
+        on_progress({"stage": "done", "processed_pages": 1, "total_pages": 1})
+    
+    total = last.get("total_pages") or 0
+    processed = last.get("processed_pages", 0)
+    if last.get("stage") != "done":
+        raise RuntimeError(f"{total - processed}/{total} 페이지 처리 실패")
+    return DocumentResult(
+        file_path=file_path,
+        total_pages=total,
+        processed_pages=processed,
+        status=ProcessingStatus.COMPLETED,
+        processing_time=time.time() - start
+    )
 
 
-# 백그라운드 태스크
-async def process_document_task(task_id: str, file_path: Path, config: ProcessingConfig):
-    """문서 처리 백그라운드 태스크"""
-    try:
-        # 태스크 상태 업데이트
-        task_manager.update_task(task_id, status=ProcessingStatus.IN_PROGRESS)
-        
-        # 문서 처리
-        result = await processor.process_document(
-            file_path, 
-            Path(app_config.output.output_directory)
-        )
-        
-        # 결과 저장
-        task_manager.set_result(task_id, result)
-        
-    except Exception as e:
-        logging.error(f"태스크 {task_id} 처리 실패: {e}")
+def task_event(task_id: str, task: Dict, **extra) -> Dict:
+    """진행 스트림으로 보내는 태스크 상태 스냅샷"""
+    status = task["status"]
+    return {
+        "task_id": task_id,
+        "status": status.value if hasattr(status, "value") else str(status),
+        "progress": task.get("progress", 0.0),
+        "total_pages": task.get("total_pages", 0),
+        "processed_pages": task.get("processed_pages", 0),
+        "error_message": task.get("error_message"),
+        **extra
+    }
+
+
+def publish_task(task_id: str, **extra):
+    """현재 태스크 상태를 구독자들에게 발행"""
+    task = task_manager.get_task(task_id)
+    if task is not None:
+        progress_hub.publish(task_id, task_event(task_id, task, **extra))
+
+
+def on_progress_event(task_id: str, event: Dict):
+    """워커의 페이지 진행 이벤트 → 태스크 진행률 갱신 + 발행 (이벤트 루프 스레드)"""
+    task = task_manager.get_task(task_id)
+    if task is None or task["status"] != ProcessingStatus.IN_PROGRESS:
+        return  # 취소/완료 뒤 늦게 도착한 이벤트
+    total = event.get("total_pages") or 0
+    processed = event.get("processed_pages", 0)
+    task_manager.update_task(
+        task_id,
+        total_pages=total,
+        processed_pages=processed,
+        progress=round(100.0 * processed / total, 1) if total else 0.0
+    )
+    publish_task(task_id, stage=event.get("stage"), page=event.get("page"))
+
+
+def on_job_start(job: Job):
+    """작업이 워커에 배정됨"""
+    task_manager.update_task(job.job_id, status=ProcessingStatus.IN_PROGRESS)
+    publish_task(job.job_id)
+
+
+def on_job_done(job: Job):
+    """작업 완료/실패 결과를 태스크에 반영"""
+    task = task_manager.get_task(job.job_id)
+    if task is None or task["status"] == ProcessingStatus.CANCELLED:
+        return
+    if job.error is None:
+        task_manager.set_result(job.job_id, job.result)
+        if job.result.status == ProcessingStatus.COMPLETED:
+            task_manager.update_task(job.job_id, progress=100.0)
+    else:
+        logging.error(f"태스크 {job.job_id} 처리 실패: {job.error}")
         task_manager.update_task(
-            task_id, 
+            job.job_id,
             status=ProcessingStatus.FAILED,
-            error_message=str(e)
+            error_message=str(job.error)
         )
+    publish_task(job.job_id)
+
+
+def client_key(request: Request) -> str:
+    """공정 스케줄링 단위: 설정된 API 키와 일치하는 토큰이면 키 해시, 아니면 클라이언트 IP (요청 제한과 같은 키)
+
+    인증이 꺼져 있으면 토큰은 검증되지 않으므로 토큰을 바꿔 가며 키별 대기 한도를 피하지 못하도록 IP 로 묶는다.
+    """
+    return client_key_from_scope(request.scope, app_config.api.api_key if app_config else None)
 
 
 # API 엔드포인트들
@@ -317,6 +454,7 @@ async def health_check():
     import platform
     
     return HealthCheck(
+        queue=scheduler.stats() if scheduler else None,
         status="healthy",
         version="1.0.0",
         uptime=time.time() - task_manager.start_time,
@@ -334,7 +472,7 @@ async def health_check():
 
 @app.post("/upload", response_model=ProcessingResponse)
 async def upload_file(
-    background_tasks: BackgroundTasks,
+    http_request: Request,
     file: UploadFile = File(...),
     request: ProcessingRequest = ProcessingRequest(),
     authenticated: bool = Depends(auth)
@@ -352,50 +490,82 @@ async def upload_file(
             detail=f"지원하지 않는 파일 형식입니다: {file_path.suffix}"
         )
     
+    if scheduler is None:
+        raise HTTPException(status_code=503, detail="작업 스케줄러가 시작되지 않았습니다")
+    
     # 임시 파일 저장
     temp_dir = Path(app_config.security.temp_directory)
     temp_dir.mkdir(parents=True, exist_ok=True)
     
     temp_file_path = temp_dir / f"{uuid.uuid4()}_{file.filename}"
     
+    max_bytes = app_config.security.max_file_size_mb * 1024 * 1024
+    
     try:
-        with open(temp_file_path, "wb") as buffer:
-            content = await file.read()
-            buffer.write(content)
-        
-        # 파일 크기 검증
-        if not app_config.security.is_file_size_valid(temp_file_path):
-            temp_file_path.unlink()
+        # 고정 크기 청크로 디스크에 스트리밍 (크기 제한/SHA-256 은 받는 동안 계산)
+        try:
+            stored = await stream_to_disk(file, temp_file_path, max_bytes)
+        except UploadTooLarge:
             raise HTTPException(
-                status_code=400,
+                status_code=413,
                 detail=f"파일 크기가 너무 큽니다 (최대: {app_config.security.max_file_size_mb}MB)"
             )
         
-        # 처리 설정 생성
+        # 중복 문서: 기존 태스크를 돌려주고 새 파일은 버린다
+        duplicate_id = task_manager.find_duplicate(stored.sha256)
+        if duplicate_id:
+            await asyncio.to_thread(temp_file_path.unlink)
+            return ProcessingResponse(
+                task_id=duplicate_id,
+                status="duplicate",
+                message="동일한 문서가 이미 처리 중이거나 처리되었습니다.",
+                estimated_time=None
+            )
+        
+        # 처리 설정 생성 (문서 하나는 워커 프로세스 하나에서 처리: 전역 동시 OCR 수 = 스케줄러 워커 수)
         processing_config = ProcessingConfig(
             dpi=request.dpi or app_config.image.default_dpi,
             language=request.language or app_config.ocr.default_language,
             confidence_threshold=request.confidence_threshold or app_config.ocr.confidence_threshold,
-            workers=request.workers or app_config.processing.max_workers,
+            workers=1,
             auto_dpi=request.auto_dpi if request.auto_dpi is not None else app_config.image.auto_dpi_enabled,
-            save_json=request.save_json if request.save_json is not None else app_config.output.save_json
+            save_json=request.save_json if request.save_json is not None else app_config.output.save_json,
+            cache_enabled=app_config.cache.enabled,
+            cache_ttl=app_config.cache.ttl_seconds
         )
         
         # 태스크 생성
-        task_id = task_manager.create_task(temp_file_path, processing_config)
+        task_id = task_manager.create_task(temp_file_path, processing_config, sha256=stored.sha256)
         
-        # 백그라운드에서 처리 시작
-        background_tasks.add_task(
-            process_document_task,
-            task_id,
-            temp_file_path,
-            processing_config
-        )
+        # 작업 큐에 등록 (가득 차면 429/503 + Retry-After)
+        try:
+            scheduler.submit(
+                task_id,
+                client_key(http_request),
+                run_ocr_job,
+                temp_file_path,
+                Path(app_config.output.output_directory),
+                processing_config,
+                task_id,
+                app_config.cache,
+                on_start=on_job_start,
+                on_done=on_job_done
+            )
+        except (QueueFull, SchedulerUnavailable) as e:
+            task_manager.remove_task(task_id)
+            if isinstance(e, QueueFull) and e.scope == "key":
+                status_code, detail, retry_after = 429, "대기 중인 작업이 너무 많습니다", e.retry_after
+            elif isinstance(e, QueueFull):
+                status_code, detail, retry_after = 503, "작업 큐가 가득 찼습니다", e.retry_after
+            else:
+                status_code, detail, retry_after = 503, "작업 스케줄러를 사용할 수 없습니다", 30
+            raise HTTPException(status_code=status_code, detail=detail,
+                                headers={"Retry-After": str(retry_after)})
         
         return ProcessingResponse(
             task_id=task_id,
             status="accepted",
-            message="파일 업로드 완료. 처리가 시작되었습니다.",
+            message="파일 업로드 완료. 처리 대기열에 등록되었습니다.",
             estimated_time=None
         )
         
@@ -440,6 +610,53 @@ async def get_task_status(task_id: str, authenticated: bool = Depends(auth)):
     )
 
 
+@app.get("/events/{task_id}")
+async def stream_task_events(task_id: str, authenticated: bool = Depends(auth)):
+    """태스크 진행률 Server-Sent Events 스트림 (종료 상태 이벤트 후 닫힘)"""
+    task = task_manager.get_task(task_id)
+    if not task:
+        raise HTTPException(status_code=404, detail="태스크를 찾을 수 없습니다")
+    
+    async def events():
+        async for event in progress_hub.subscribe(task_id, task_event(task_id, task),
+                                                  heartbeat=SSE_HEARTBEAT_SECONDS):
+            if event is None:
+                yield ": keepalive\n\n"
+            else:
+                yield f"event: progress\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@app.websocket("/ws/tasks/{task_id}")
+async def task_progress_websocket(websocket: WebSocket, task_id: str):
+    """태스크 진행률 WebSocket (API 키는 Authorization 헤더 또는 token 쿼리)"""
+    api_key = app_config.api.api_key if app_config else None
+    if api_key:
+        authorization = websocket.headers.get("authorization", "")
+        token = authorization[7:] if authorization.lower().startswith("bearer ") else websocket.query_params.get("token")
+        if token != api_key:
+            await websocket.close(code=1008)
+            return
+    
+    task = task_manager.get_task(task_id)
+    if not task:
+        await websocket.close(code=1008, reason="task not found")
+        return
+    
+    await websocket.accept()
+    try:
+        async for event in progress_hub.subscribe(task_id, task_event(task_id, task)):
+            await websocket.send_json(event)
+        await websocket.close()
+    except WebSocketDisconnect:
+        pass
+
+
 @app.get("/download/{task_id}/{file_type}")
 async def download_result(
     task_id: str, 
@@ -484,17 +701,22 @@ async def download_result(
 
 @app.get("/tasks", response_model=List[TaskStatus])
 async def list_tasks(
+    response: Response,
     limit: int = 10,
     status_filter: Optional[str] = None,
+    cursor: Optional[str] = None,
     authenticated: bool = Depends(auth)
 ):
-    """태스크 목록 조회"""
-    tasks = []
+    """태스크 목록 조회 (최신순, 다음 페이지 커서는 X-Next-Cursor 헤더)"""
+    try:
+        page, next_cursor = task_manager.list_tasks(max(1, min(limit, 100)), cursor, status_filter)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="잘못된 커서입니다")
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     
-    for task_id, task_data in list(task_manager.tasks.items())[-limit:]:
-        if status_filter and str(task_data["status"]) != status_filter:
-            continue
-        
+    tasks = []
+    for task_id, task_data in page:
         result_urls = None
         if task_data["status"] == ProcessingStatus.COMPLETED:
             result = task_manager.get_result(task_id)
@@ -528,17 +750,20 @@ async def cancel_task(task_id: str, authenticated: bool = Depends(auth)):
     if task["status"] in [ProcessingStatus.COMPLETED, ProcessingStatus.FAILED]:
         raise HTTPException(status_code=400, detail="이미 완료된 태스크입니다")
     
-    # 태스크 취소 (실제 구현에서는 더 정교한 취소 로직 필요)
+    # 대기 중이면 큐에서 제거, 실행 중이면 결과만 버린다 (워커 프로세스는 중단하지 않음)
+    if scheduler:
+        scheduler.cancel(task_id)
     task_manager.update_task(task_id, status=ProcessingStatus.CANCELLED)
+    publish_task(task_id)
     
     return {"message": "태스크가 취소되었습니다"}
 
 
 @app.post("/cleanup")
 async def cleanup_old_tasks(authenticated: bool = Depends(auth)):
-    """오래된 태스크 정리"""
-    task_manager.cleanup_old_tasks()
-    return {"message": "오래된 태스크가 정리되었습니다"}
+    """오래된 태스크 정리 (백그라운드 타이머와 별개로 즉시 실행)"""
+    removed = task_manager.cleanup_old_tasks(app_config.api.task_ttl_hours if app_config else 24)
+    return {"message": "오래된 태스크가 정리되었습니다", "removed": removed}
 
 
 # 서버 실행 함수
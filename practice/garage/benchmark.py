@@ -0,0 +1,590 @@
+"""
+OCR Pipeline Benchmarks
+OCR 파이프라인 단계별 벤치마크 (+ 키워드 추출 토크나이저)
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import re
+import shutil
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from pdf2image import convert_from_path
+
+from rasterize import chunk_page_ranges, get_page_count, iter_page_images
+
+
+# ───────────── 래스터화 ─────────────
+def _raster_per_page(pdf_path: str, page: int, dpi: int) -> int:
+    """기존 방식: 페이지마다 pdftoppm 실행 + 문서 재파싱"""
+    imgs = convert_from_path(pdf_path, dpi=dpi, first_page=page, last_page=page)
+    return len(imgs)
+
+
+def _raster_chunk(pdf_path: str, first: int, last: int, dpi: int) -> int:
+    """스트리밍 방식: 구간당 문서 1회 오픈"""
+    count = 0
+    for _, img in iter_page_images(pdf_path, first, last, dpi):
+        img.close()
+        count += 1
+    return count
+
+
+def _rate(pages: int, seconds: float) -> Dict[str, float]:
+    return {
+        "seconds": round(seconds, 3),
+        "pages_per_min": round(pages / seconds * 60, 1) if seconds > 0 else 0.0,
+    }
+
+
+def bench_rasterization(pdf_path: Path,
+                        dpi: int = 300,
+                        workers: int = 4,
+                        chunk_size: int = 8,
+                        max_pages: Optional[int] = None) -> Dict:
+    """페이지별 래스터화 vs 구간 스트리밍 래스터화 처리량 비교"""
+    total = get_page_count(pdf_path)
+    pages = list(range(1, (min(total, max_pages) if max_pages else total) + 1))
+
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        start = time.perf_counter()
+        done = sum(ex.map(_raster_per_page, [str(pdf_path)] * len(pages), pages, [dpi] * len(pages)))
+        per_page = _rate(done, time.perf_counter() - start)
+
+    chunk = max(1, min(chunk_size, -(-len(pages) // workers)))
+    ranges = chunk_page_ranges(pages, chunk)
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        start = time.perf_counter()
+        done = sum(ex.map(_raster_chunk, [str(pdf_path)] * len(ranges),
+                          [r[0] for r in ranges], [r[1] for r in ranges], [dpi] * len(ranges)))
+        streaming = _rate(done, time.perf_counter() - start)
+
+    return {
+        "file": Path(pdf_path).name,
+        "pages": len(pages),
+        "dpi": dpi,
+        "workers": workers,
+        "chunk_size": chunk,
+        "per_page": per_page,
+        "streaming": streaming,
+        "speedup": round(per_page["seconds"] / streaming["seconds"], 2) if streaming["seconds"] > 0 else None,
+    }
+
+
+# ───────────── 체크포인트 ─────────────
+def bench_checkpointing(pages: int = 5000, directory: Optional[Path] = None) -> Dict:
+    """페이지 완료 기록 비용: 매니페스트 전체 재작성(기존) vs 저널 추가 기록"""
+    from search_pdf import ProgressJournal, save_manifest
+
+    def manifest_for(n: int) -> Dict:
+        return {"file": "bench.pdf", "dpi": 300, "lang_opt": "eng", "conf": 50,
+                "total_pages": n, "completed_pages": []}
+
+    with tempfile.TemporaryDirectory(dir=directory) as tmp:
+        rewrite_dir = Path(tmp) / "rewrite"
+        journal_dir = Path(tmp) / "journal"
+        rewrite_dir.mkdir()
+        journal_dir.mkdir()
+
+        # 기존: 페이지마다 정렬된 완료 목록으로 manifest.json 전체 재작성 (O(n^2))
+        manifest = manifest_for(pages)
+        completed = set()
+        bytes_written = 0
+        start = time.perf_counter()
+        for page in range(1, pages + 1):
+            completed.add(page)
+            manifest["completed_pages"] = sorted(list(completed))
+            (rewrite_dir / "manifest.json").write_text(json.dumps(manifest, ensure_ascii=False, indent=2),
+                                                       encoding="utf-8")
+            bytes_written += (rewrite_dir / "manifest.json").stat().st_size
+        rewrite = {"seconds": round(time.perf_counter() - start, 3), "bytes_written": bytes_written}
+
+        # 신규: 저널 한 줄 추가 + 종료 시 1회 압축
+        manifest = manifest_for(pages)
+        save_manifest(journal_dir, manifest)
+        journal = ProgressJournal(journal_dir)
+        completed = set()
+        start = time.perf_counter()
+        for page in range(1, pages + 1):
+            completed.add(page)
+            journal.record(page)
+        record_seconds = time.perf_counter() - start
+        journal_bytes = journal.path.stat().st_size
+        journal.compact(journal_dir, manifest, completed)
+        total_seconds = time.perf_counter() - start
+        journaled = {
+            "seconds": round(total_seconds, 3),
+            "record_seconds": round(record_seconds, 3),
+            "bytes_written": journal_bytes + (journal_dir / "manifest.json").stat().st_size,
+        }
+
+    return {
+        "pages": pages,
+        "manifest_rewrite": rewrite,
+        "journal": journaled,
+        "speedup": round(rewrite["seconds"] / journaled["seconds"], 1) if journaled["seconds"] > 0 else None,
+    }
+
+
+# ───────────── 최종 병합 ─────────────
+def bench_merge(pages: int = 300, directory: Optional[Path] = None) -> Dict:
+    """최종 병합 피크 메모리/시간: 메모리 일괄 병합(기존) vs 스트리밍 병합"""
+    from PIL import Image
+    from search_pdf import finalize_merge
+
+    def measure(fn) -> Dict[str, float]:
+        tracemalloc.start()
+        start = time.perf_counter()
+        fn()
+        seconds = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return {"seconds": round(seconds, 3), "peak_mb": round(peak / 1024 / 1024, 2)}
+
+    with tempfile.TemporaryDirectory(dir=directory) as tmp:
+        ckpt_dir = Path(tmp) / "ckpt"
+        ckpt_dir.mkdir()
+        # 압축이 잘 안 되는 노이즈 페이지로 실제 스캔 페이지 크기를 흉내냄
+        for i in range(1, pages + 1):
+            Image.effect_noise((600, 800), 64).convert("RGB").save(ckpt_dir / f"page_{i:05d}.pdf")
+            (ckpt_dir / f"page_{i:05d}.json").write_text(
+                json.dumps({"page": i, "lang": "eng", "words": [{"text": "word", "conf": 90}] * 200}),
+                encoding="utf-8")
+        src = Path(tmp) / "bench.pdf"
+
+        results = {}
+        for mode in ("memory", "stream"):
+            out_pdf = Path(tmp) / f"out_{mode}.pdf"
+            results[mode] = measure(lambda: finalize_merge(src, ckpt_dir, out_pdf, True, pages, mode))
+            results[mode]["output_mb"] = round(out_pdf.stat().st_size / 1024 / 1024, 2)
+
+    return {"pages": pages, **results}
+
+
+# ───────────── 전처리 ─────────────
+def bench_preprocess(pages: int = 8, width: int = 2550, height: int = 3300, repeat: int = 3) -> Dict:
+    """전처리 엔진 비교: 기존 PIL 체인 vs NumPy/LUT 엔진 (페이지 배치, 임계값 방식 포함, 최솟값 기준)"""
+    import numpy as np
+    from PIL import Image
+    import preprocess as pp
+
+    rng = np.random.default_rng(0)
+    arrays = [rng.integers(0, 256, (height, width, 3), dtype=np.uint8) for _ in range(pages)]
+    images = [Image.fromarray(a) for a in arrays]
+
+    def best_of(fn) -> Dict[str, float]:
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - start)
+        return _rate(pages, min(times))
+
+    return {
+        "pages": pages,
+        "size": f"{width}x{height}",
+        "binarize": {
+            "pil": best_of(lambda: [pp.reference_binarize_pil(im) for im in images]),
+            "engine": best_of(lambda: [pp.binarize_image(im) for im in images]),
+            "engine_batch": best_of(lambda: pp.preprocess_batch(arrays, pp.binarize_gray)),
+            "engine_batch_otsu": best_of(lambda: pp.preprocess_batch(arrays, pp.binarize_gray, mode="otsu")),
+            "engine_batch_adaptive": best_of(lambda: pp.preprocess_batch(arrays, pp.binarize_gray, mode="adaptive")),
+        },
+        "denoise": {
+            "pil": best_of(lambda: [pp.reference_denoise_pil(im) for im in images]),
+            "engine": best_of(lambda: [pp.denoise_page(a) for a in arrays]),
+            "engine_batch": best_of(lambda: pp.preprocess_batch(arrays, pp.denoise_gray)),
+        },
+    }
+
+
+# ───────────── 키워드 토크나이저 ─────────────
+_KO_WORDS = ("한국어", "키워드", "추출", "문서", "검색", "분석", "결과", "성능", "최적화", "처리",
+             "자연어", "모델", "학습", "서버", "요청", "응답", "그리고", "하지만", "매우", "것")
+_EN_WORDS = ("the", "and", "is", "of", "keyword", "extraction", "token", "pipeline", "report", "revenue",
+             "performance", "search", "index", "market", "2024", "aaa", "---", "state-of-the-art")
+_NOISE = ("https://example.com/a?b=1", "www.test.org", "user@example.com", "#태그", "@mention",
+          "(괄호 안)", "[참고]", '"인용구"', "3.14", "!!", "...", "—")
+
+
+def make_keyword_text(lang: str = "ko", size: int = 1 << 20, seed: int = 0) -> str:
+    """size 문자 분량의 합성 문서 (단어 + URL/이메일/태그/괄호/문장부호 잡음)"""
+    rng = random.Random(seed)
+    words = _KO_WORDS if lang == "ko" else _EN_WORDS
+    parts, length = [], 0
+    while length < size:
+        token = rng.choice(_NOISE) if rng.random() < 0.08 else rng.choice(words)
+        if rng.random() < 0.07:
+            token += rng.choice(".!?,")
+        parts.append(token)
+        length += len(token) + 1
+    return " ".join(parts)[:size]
+
+
+def _legacy_tokenize(extractor, text: str, aggressive: bool = False, min_length: int = 2, max_length: int = 20):
+    """기존 방식: 전체 텍스트 re.sub 6회 + 필터별 리스트 컴프리헨션 5회 (비교 기준)"""
+    lang = extractor._detect_lang(text)
+    text = extractor._validate_text(text).lower()
+    text = re.sub(r"https?://\S+|www\.\S+", " ", text)
+    text = re.sub(r"\S+@\S+\.\S+", " ", text)
+    text = re.sub(r"#\S+|@\S+", " ", text)
+    if aggressive:
+        text = re.sub(r"\([^)]*\)|\[[^\]]*\]|\{[^}]*\}", " ", text)
+        text = re.sub(r'"[^"]*"|\'[^\']*\'', " ", text)
+        text = re.sub(r"[^\w가-힣\s-]", " ", text)
+    else:
+        text = re.sub(r"[^0-9A-Za-z가-힣\s\-_]", " ", text)
+    text = re.sub(r"\s+", " ", text).strip()
+
+    tokens = text.split()
+    tokens = [t for t in tokens if min_length <= len(t) <= max_length]
+    tokens = [t for t in tokens if t not in extractor.stopwords.get(lang, set())]
+    tokens = [t for t in tokens if not t.isdigit()]
+    tokens = [t for t in tokens if not re.match(r'^(.)\1{2,}$', t)]
+    tokens = [t for t in tokens if not re.match(r'^-+$', t)]
+    return text, tokens
+
+
+def bench_tokenizer(size: int = 1 << 20, repeat: int = 3) -> Dict:
+    """KeywordExtractor 정제+토큰화+통계: 기존 다중 패스 vs 단일 패스 (한국어/영어, 최솟값 기준)"""
+    from keyword_extractor import KeywordExtractor
+
+    def best_of(fn) -> float:
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - start)
+        return min(times)
+
+    results = {"size_chars": size}
+    for lang in ("ko", "en"):
+        text = make_keyword_text(lang, size)
+        extractor = KeywordExtractor(lang=lang, max_text_length=size + 1)
+        detected = extractor._detect_lang(text)
+
+        def legacy():
+            clean, tokens = _legacy_tokenize(extractor, text)
+            # 기존 get_stats 는 같은 텍스트를 한 번 더 정제/토큰화하고 문자 종류별로 findall
+            _legacy_tokenize(extractor, text)
+            for pattern in (r"[가-힣]", r"[a-zA-Z]", r"[0-9]"):
+                len(re.findall(pattern, text))
+            len(re.sub(r"\s+", "", text))
+            re.split(r"[.!?]+", text)
+            return clean, tokens
+
+        def fused():
+            words, tokens = extractor._token_pass(text, detected)
+            extractor._compute_stats(text, detected, words, tokens)
+            return words, tokens
+
+        clean, expected = legacy()
+        words, tokens = fused()
+        row = {
+            "tokens": len(tokens),
+            "identical": tokens == expected and " ".join(words) == clean,
+            "legacy_seconds": round(best_of(legacy), 4),
+            "single_pass_seconds": round(best_of(fused), 4),
+        }
+        row["speedup"] = round(row["legacy_seconds"] / row["single_pass_seconds"], 2) if row["single_pass_seconds"] else None
+        row["single_pass_mb_per_s"] = round(size / (1 << 20) / row["single_pass_seconds"], 2) if row["single_pass_seconds"] else None
+        results[lang] = row
+    return results
+
+
+def bench_advanced_scoring(size: int = 1 << 20, top_k: int = 500, repeat: int = 3) -> Dict:
+    """고급 점수의 키워드 첫 위치 탐색: 키워드마다 lower()+find vs KeywordMatcher 1회 스캔"""
+    from keyword_extractor import KeywordExtractor
+
+    def best_of(fn) -> float:
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - start)
+        return min(times)
+
+    results = {"size_chars": size, "top_k": top_k}
+    for lang in ("ko", "en"):
+        text = make_keyword_text(lang, size)
+        extractor = KeywordExtractor(lang=lang, enable_semantic_analysis=False, max_text_length=size + 1)
+        for n_gram in (2, 3):
+            keywords = extractor.extract_keywords(text, n_gram=n_gram, top_k=top_k, include_stats=False).keywords
+            legacy = best_of(lambda: [text.lower().find(kw.lower()) for kw, _ in keywords])
+            matcher = best_of(lambda: extractor._calculate_advanced_scores(keywords, text))
+            results[f"{lang}_{n_gram}gram"] = {
+                "keywords": len(keywords),
+                "legacy_seconds": round(legacy, 4),
+                "matcher_seconds": round(matcher, 4),
+                "speedup": round(legacy / matcher, 1) if matcher else None,
+            }
+    return results
+
+
+def bench_keyword_batch(docs: int = 10000, doc_size: int = 2000, max_workers: int = 4,
+                        method: str = "tfidf") -> Dict:
+    """batch_extract_parallel 처리량: 워커 수 1, 2, 4 … max_workers (문서/초, 1워커 대비 배율)"""
+    from keyword_extractor import KeywordExtractor
+
+    texts = [make_keyword_text("ko" if i % 2 else "en", doc_size, seed=i) for i in range(docs)]
+    counts = sorted({w for w in (1, 2, 4, 8, 16) if w < max_workers} | {max_workers})
+    results = {"docs": docs, "doc_size": doc_size, "method": method, "cpu_count": os.cpu_count(), "workers": {}}
+    base = None
+    for workers in counts:
+        extractor = KeywordExtractor(enable_semantic_analysis=False)
+        start = time.perf_counter()
+        extractor.batch_extract_parallel(texts, method=method, max_workers=workers)
+        seconds = time.perf_counter() - start
+        base = base or seconds
+        results["workers"][str(workers)] = {
+            "seconds": round(seconds, 3),
+            "docs_per_s": round(docs / seconds, 1),
+            "speedup": round(base / seconds, 2),
+        }
+    return results
+
+
+# ───────────── 파이프라인 스위트 ─────────────
+SUITE_STAGES = ("rasterize", "preprocess", "ocr", "pdf_write")
+PREPROCESS_MODES = ("none", "binarize", "denoise")
+
+_WORDS = ("invoice", "total", "amount", "report", "quarter", "revenue", "growth", "market", "customer",
+          "account", "balance", "summary", "section", "figure", "table", "analysis", "result", "data")
+
+
+def make_synthetic_pdf(path: Path, pages: int = 6, seed: int = 0, resolution: int = 150) -> Path:
+    """OCR 가능한 텍스트 줄로 채운 합성 문서 PDF 생성 (Letter 크기, 재현 가능한 난수)"""
+    from PIL import Image, ImageDraw, ImageFont
+
+    rng = random.Random(seed)
+    font = ImageFont.load_default(size=resolution // 6)
+    width, height = int(8.5 * resolution), int(11 * resolution)
+    line_h = resolution // 4
+    images = []
+    for _ in range(pages):
+        img = Image.new("RGB", (width, height), "white")
+        draw = ImageDraw.Draw(img)
+        for y in range(resolution // 2, height - resolution // 2, line_h):
+            line = " ".join(rng.choice(_WORDS) for _ in range(8))
+            draw.text((resolution // 2, y), line, fill="black", font=font)
+        images.append(img)
+    images[0].save(path, save_all=True, append_images=images[1:], resolution=resolution)
+    return path
+
+
+def tesseract_available() -> bool:
+    import pytesseract
+    return shutil.which(pytesseract.pytesseract.tesseract_cmd) is not None
+
+
+def _suite_worker(pdf_path: str, first: int, last: int, dpi: int, mode: str,
+                  run_ocr: bool, pdf_dir: Optional[str]) -> Dict[str, float]:
+    """구간을 파이프라인 순서대로 처리하며 단계별 소요 시간 집계"""
+    import pytesseract
+    from preprocess import binarize_image, denoise_page, to_image
+
+    seconds = {stage: 0.0 for stage in SUITE_STAGES}
+    pages = iter_page_images(pdf_path, first, last, dpi)
+    while True:
+        start = time.perf_counter()
+        item = next(pages, None)
+        seconds["rasterize"] += time.perf_counter() - start
+        if item is None:
+            break
+        page_no, img = item
+
+        start = time.perf_counter()
+        if mode == "binarize":
+            img = binarize_image(img)
+        elif mode == "denoise":
+            img = to_image(denoise_page(img))
+        seconds["preprocess"] += time.perf_counter() - start
+
+        if run_ocr:
+            start = time.perf_counter()
+            pytesseract.image_to_data(img, lang="eng", output_type=pytesseract.Output.DICT)
+            seconds["ocr"] += time.perf_counter() - start
+
+            start = time.perf_counter()
+            pdf = pytesseract.image_to_pdf_or_hocr(img, lang="eng", extension="pdf")
+            seconds["pdf_write"] += time.perf_counter() - start
+        else:
+            start = time.perf_counter()
+            bio = BytesIO()
+            img.save(bio, format="PDF", resolution=dpi)
+            pdf = bio.getvalue()
+            seconds["pdf_write"] += time.perf_counter() - start
+
+        if pdf_dir:
+            (Path(pdf_dir) / f"page_{page_no:05d}.pdf").write_bytes(pdf)
+    return seconds
+
+
+def _stage_rates(pages: int, workers: int, stage_seconds: Dict[str, float]) -> Dict[str, Optional[float]]:
+    """단계별 처리량 (워커 수만큼 병렬로 돌았다고 보고 pages/min 환산)"""
+    rates = {}
+    for stage, secs in stage_seconds.items():
+        rates[stage] = round(pages * 60 * workers / secs, 1) if secs > 0 else None
+    return rates
+
+
+def bench_suite(pages: int = 6,
+                max_workers: int = 2,
+                dpis: List[int] = (150, 300),
+                modes: List[str] = PREPROCESS_MODES,
+                ocr: Optional[bool] = None,
+                directory: Optional[Path] = None) -> Dict:
+    """
+    합성 문서로 래스터화/전처리/OCR/PDF 기록/병합 처리량을 따로 측정
+    조합: DPI × 전처리 모드 × 워커 1..max_workers. 결과의 metrics 는 run 간 비교용 평탄화 키
+    """
+    from pdf_merge import stream_merge_pdfs
+
+    run_ocr = tesseract_available() if ocr is None else ocr
+    metrics: Dict[str, Optional[float]] = {}
+    runs = []
+
+    with tempfile.TemporaryDirectory(dir=directory) as tmp:
+        pdf_path = make_synthetic_pdf(Path(tmp) / "synthetic.pdf", pages)
+        for dpi in dpis:
+            for mode in modes:
+                for workers in range(1, max_workers + 1):
+                    page_dir = Path(tmp) / f"pages_{dpi}_{mode}_{workers}"
+                    page_dir.mkdir()
+                    ranges = chunk_page_ranges(list(range(1, pages + 1)), -(-pages // workers))
+                    start = time.perf_counter()
+                    with ProcessPoolExecutor(max_workers=workers) as ex:
+                        parts = list(ex.map(_suite_worker, [str(pdf_path)] * len(ranges),
+                                            [r[0] for r in ranges], [r[1] for r in ranges],
+                                            [dpi] * len(ranges), [mode] * len(ranges),
+                                            [run_ocr] * len(ranges), [str(page_dir)] * len(ranges)))
+                    wall = time.perf_counter() - start
+                    stage_seconds = {stage: sum(p[stage] for p in parts) for stage in SUITE_STAGES}
+                    if not run_ocr:
+                        stage_seconds.pop("ocr")
+                    if mode == "none":
+                        stage_seconds.pop("preprocess")
+
+                    start = time.perf_counter()
+                    stream_merge_pdfs(sorted(page_dir.glob("page_*.pdf")), Path(tmp) / "merged.pdf")
+                    merge_seconds = time.perf_counter() - start
+
+                    rates = _stage_rates(pages, workers, stage_seconds)
+                    rates["merge"] = round(pages * 60 / merge_seconds, 1) if merge_seconds > 0 else None
+                    rates["end_to_end"] = round(pages * 60 / wall, 1) if wall > 0 else None
+                    runs.append({"dpi": dpi, "preprocess": mode, "workers": workers, "pages_per_min": rates})
+                    for stage, rate in rates.items():
+                        metrics[f"{stage}/dpi={dpi}/pre={mode}/workers={workers}"] = rate
+                    shutil.rmtree(page_dir, ignore_errors=True)
+
+    return {
+        "suite": "ocr-pipeline",
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "environment": {"python": platform.python_version(), "machine": platform.machine(),
+                        "ocr": "tesseract" if run_ocr else "skipped (tesseract not found)"},
+        "pages": pages,
+        "runs": runs,
+        "metrics": metrics,
+    }
+
+
+def compare_results(current: Dict, baseline: Dict, tolerance: float = 0.15) -> List[Dict]:
+    """baseline 대비 처리량이 tolerance 비율 이상 떨어진 지표 목록"""
+    regressions = []
+    for key, base in baseline.get("metrics", {}).items():
+        now = current.get("metrics", {}).get(key)
+        if not base or now is None:
+            continue
+        change = (now - base) / base
+        if change < -tolerance:
+            regressions.append({"metric": key, "baseline": base, "current": now, "change": round(change, 3)})
+    return regressions
+
+
+# ───────────── 엔트리 ─────────────
+def main():
+    ap = argparse.ArgumentParser(description="OCR pipeline benchmarks")
+    sub = ap.add_subparsers(dest="bench", required=True)
+
+    raster = sub.add_parser("raster", help="래스터화 처리량 (페이지별 vs 스트리밍)")
+    raster.add_argument("pdf", help="벤치마크용 PDF")
+    raster.add_argument("--dpi", type=int, default=300)
+    raster.add_argument("--workers", type=int, default=4)
+    raster.add_argument("--chunk-size", type=int, default=8)
+    raster.add_argument("--pages", type=int, default=None, help="앞쪽 N 페이지만 측정")
+
+    ckpt = sub.add_parser("checkpoint", help="체크포인트 기록 비용 (매니페스트 재작성 vs 저널)")
+    ckpt.add_argument("--pages", type=int, default=5000)
+    ckpt.add_argument("--dir", default=None, help="측정할 파일시스템 경로 (예: NFS 마운트)")
+
+    merge = sub.add_parser("merge", help="최종 병합 피크 메모리 (메모리 일괄 vs 스트리밍)")
+    merge.add_argument("--pages", type=int, default=300)
+    merge.add_argument("--dir", default=None)
+
+    pre = sub.add_parser("preprocess", help="전처리 처리량 (PIL vs NumPy 엔진)")
+    pre.add_argument("--pages", type=int, default=8)
+    pre.add_argument("--width", type=int, default=2550)
+    pre.add_argument("--height", type=int, default=3300)
+
+    tok = sub.add_parser("tokenize", help="키워드 토크나이저 처리량 (다중 패스 vs 단일 패스)")
+    tok.add_argument("--size", type=int, default=1 << 20, help="입력 크기 (문자 수)")
+
+    score = sub.add_parser("keyword-scoring", help="고급 점수 키워드 위치 탐색 (키워드별 find vs 다중 패턴 매처)")
+    score.add_argument("--size", type=int, default=1 << 20)
+    score.add_argument("--top-k", type=int, default=500)
+
+    kwb = sub.add_parser("keywords-batch", help="배치 키워드 추출 처리량 (워커 프로세스 수별)")
+    kwb.add_argument("--docs", type=int, default=10000)
+    kwb.add_argument("--doc-size", type=int, default=2000, help="문서당 문자 수")
+    kwb.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    kwb.add_argument("--method", default="tfidf", choices=["frequency", "tfidf", "rake"])
+
+    suite = sub.add_parser("suite", help="합성 문서로 단계별 처리량 (DPI × 전처리 × 워커 수)")
+    suite.add_argument("--pages", type=int, default=6)
+    suite.add_argument("--max-workers", type=int, default=2)
+    suite.add_argument("--dpi", default="150,300", help="쉼표 구분 DPI 목록")
+    suite.add_argument("--modes", default=",".join(PREPROCESS_MODES), help="전처리 모드 (none,binarize,denoise)")
+    suite.add_argument("--output", default=None, help="결과 JSON 저장 경로")
+    suite.add_argument("--compare", default=None, help="비교할 이전 결과 JSON (회귀 시 종료 코드 1)")
+    suite.add_argument("--tolerance", type=float, default=0.15, help="허용 처리량 감소 비율")
+
+    args = ap.parse_args()
+    if args.bench == "suite":
+        result = bench_suite(args.pages, args.max_workers,
+                             [int(d) for d in args.dpi.split(",")], args.modes.split(","))
+        if args.output:
+            Path(args.output).write_text(json.dumps(result, indent=2, ensure_ascii=False), encoding="utf-8")
+        if args.compare:
+            baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+            result["regressions"] = compare_results(result, baseline, args.tolerance)
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+        return 1 if result.get("regressions") else 0
+
+    if args.bench == "raster":
+        result = bench_rasterization(Path(args.pdf), args.dpi, args.workers, args.chunk_size, args.pages)
+    elif args.bench == "checkpoint":
+        result = bench_checkpointing(args.pages, Path(args.dir) if args.dir else None)
+    elif args.bench == "merge":
+        result = bench_merge(args.pages, Path(args.dir) if args.dir else None)
+    elif args.bench == "tokenize":
+        result = bench_tokenizer(args.size)
+    elif args.bench == "keyword-scoring":
+        result = bench_advanced_scoring(args.size, args.top_k)
+    elif args.bench == "keywords-batch":
+        result = bench_keyword_batch(args.docs, args.doc_size, args.max_workers, args.method)
+    else:
+        result = bench_preprocess(args.pages, args.width, args.height)
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -4,29 +4,41 @@ Enhanced CLI for PDF OCR Processing
 개선된 PDF OCR 처리 CLI 인터페이스
 """
 
+from __future__ import annotations
+
 import argparse
 import asyncio
 import json
 import logging
 import sys
 from pathlib import Path
-from typing import List, Optional
+from typing import TYPE_CHECKING, List, Optional
 
 import colorama
 from colorama import Fore, Style, Back
-from rich.console import Console
-from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn
-from rich.table import Table
-from rich.panel import Panel
-from rich.text import Text
 
 from config import Config, ConfigManager, config_from_args, create_sample_config
-from pdf_processor import ProcessorFactory, ProcessingConfig, DocumentResult, ProcessingStatus
-from api_server import run_server
+
+# rich 의 진행바/테이블, OCR 파이프라인(pdf_processor), API 서버(uvicorn/fastapi)는 무거우므로
+# 실제로 쓰는 명령어 안에서만 import 한다 (config/help 같은 짧은 명령의 시작 시간을 줄이기 위함)
+if TYPE_CHECKING:
+    from pdf_processor import DocumentResult, ProcessingConfig
+
+
+class _LazyConsole:
+    """처음 사용할 때 rich Console 을 만드는 프록시"""
+    
+    _console = None
+    
+    def __getattr__(self, name):
+        if self._console is None:
+            from rich.console import Console
+            self._console = Console()
+        return getattr(self._console, name)
 
 
-# Rich console 초기화
-console = Console()
+# Rich console 초기화 (지연)
+console = _LazyConsole()
 colorama.init()
 
 
@@ -106,13 +118,16 @@ def print_help_extended():
         python cli.py analyze input.pdf                    # 문서 분석
         python cli.py benchmark                            # 성능 벤치마크
     """
+    from rich.panel import Panel
+    
     console.print(Panel(help_text, title="📖 사용법 가이드", border_style="blue"))
 
 
-async def process_single_file(file_path: Path, config: Config, args) -> DocumentResult:
-    """단일 파일 처리"""
-    # 처리 설정 생성
-    processing_config = ProcessingConfig(
+def build_processing_config(config: Config, args) -> ProcessingConfig:
+    """CLI 인자 + 설정 파일로 처리 설정 생성"""
+    from pdf_processor import ProcessingConfig
+    
+    return ProcessingConfig(
         dpi=args.dpi or config.image.default_dpi,
         language=args.lang or config.ocr.default_language,
         confidence_threshold=args.conf or config.ocr.confidence_threshold,
@@ -122,9 +137,15 @@ async def process_single_file(file_path: Path, config: Config, args) -> Document
         resume=args.resume if hasattr(args, 'resume') else config.processing.resume_enabled,
         keep_checkpoints=args.keep_ckpt if hasattr(args, 'keep_ckpt') else config.output.keep_checkpoints
     )
+
+
+async def process_single_file(file_path: Path, config: Config, args, processor=None) -> DocumentResult:
+    """단일 파일 처리 (processor 를 넘기면 재사용, 없으면 새로 생성)"""
+    from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn
+    from pdf_processor import ProcessorFactory
     
-    # 프로세서 생성
-    processor = ProcessorFactory.create_processor(processing_config)
+    if processor is None:
+        processor = ProcessorFactory.create_processor(build_processing_config(config, args))
     
     # 출력 디렉토리
     output_dir = Path(args.outdir) if hasattr(args, 'outdir') else Path(config.output.output_directory)
@@ -148,15 +169,20 @@ async def process_single_file(file_path: Path, config: Config, args) -> Document
 
 async def process_files(file_paths: List[Path], config: Config, args) -> List[DocumentResult]:
     """여러 파일 처리"""
+    from pdf_processor import ProcessorFactory, ProcessingStatus
+    
     results = []
     
     console.print(f"\n🚀 {len(file_paths)}개 파일 처리 시작...")
     
+    # 처리 설정은 파일마다 같으므로 프로세서를 한 번만 만들어 모든 문서에 재사용
+    processor = ProcessorFactory.create_processor(build_processing_config(config, args))
+    
     for i, file_path in enumerate(file_paths, 1):
         console.print(f"\n[{i}/{len(file_paths)}] 처리 중: {file_path.name}")
         
         try:
-            result = await process_single_file(file_path, config, args)
+            result = await process_single_file(file_path, config, args, processor=processor)
             results.append(result)
             
             # 결과 표시
@@ -174,6 +200,9 @@ async def process_files(file_paths: List[Path], config: Config, args) -> List[Do
 
 def print_results_summary(results: List[DocumentResult]):
     """결과 요약 출력"""
+    from rich.table import Table
+    from pdf_processor import ProcessingStatus
+    
     if not results:
         return
     
@@ -229,6 +258,8 @@ def find_files(input_path: Path, recursive: bool = False, extensions: List[str]
 
 async def cmd_process(args):
     """처리 명령어"""
+    from pdf_processor import ProcessingStatus
+    
     config = config_from_args(args)
     
     # 입력 경로 검증
@@ -295,6 +326,8 @@ def cmd_config_create(args):
 
 def cmd_config_show(args):
     """현재 설정 표시"""
+    from rich.panel import Panel
+    
     try:
         config_manager = ConfigManager()
         config = config_manager.load_config()
@@ -346,6 +379,8 @@ def cmd_server_start(args):
     console.print(f"🚀 API 서버 시작 중... http://{host}:{port}")
     
     try:
+        from api_server import run_server
+        
         run_server(host=host, port=port, workers=workers)
         return 0
     except Exception as e:
@@ -356,6 +391,7 @@ def cmd_server_start(args):
 async def cmd_analyze(args):
     """문서 분석"""
     from pypdf import PdfReader
+    from rich.table import Table
     
     input_path = Path(args.input)
     if not input_path.exists():
@@ -405,11 +441,12 @@ async def cmd_analyze(args):
 
 
 def cmd_benchmark(args):
-    """성능 벤치마크"""
+    """성능 벤치마크 (합성 문서로 단계별 처리량 측정)"""
     console.print("🏃 성능 벤치마크 실행 중...")
     
-    import time
     import psutil
+    from rich.table import Table
+    from benchmark import bench_suite, compare_results
     
     # 시스템 정보
     table = Table(title="💻 시스템 정보")
@@ -422,19 +459,38 @@ def cmd_benchmark(args):
     
     console.print(table)
     
-    # 간단한 OCR 벤치마크 (가상)
-    console.print("\n🔍 OCR 성능 테스트...")
+    # 단계별 처리량 측정
+    console.print("\n🔍 OCR 파이프라인 벤치마크...")
+    dpis = [int(d) for d in args.dpi.split(",")]
+    modes = args.modes.split(",")
+    with console.status("합성 문서 처리 중..."):
+        result = bench_suite(args.pages, args.max_workers, dpis, modes)
+    
+    stages = ["rasterize", "preprocess", "ocr", "pdf_write", "merge", "end_to_end"]
+    table = Table(title=f"📈 처리량 (pages/min, {result['pages']}페이지, OCR: {result['environment']['ocr']})")
+    for col in ["DPI", "전처리", "워커"] + stages:
+        table.add_column(col, justify="right")
+    for run in result["runs"]:
+        rates = run["pages_per_min"]
+        table.add_row(str(run["dpi"]), run["preprocess"], str(run["workers"]),
+                      *[f"{rates[s]:,.0f}" if rates.get(s) else "-" for s in stages])
+    console.print(table)
     
-    with Progress(console=console) as progress:
-        task = progress.add_task("벤치마크 실행", total=100)
-        
-        for i in range(100):
-            time.sleep(0.05)  # 실제로는 OCR 처리 시뮬레이션
-            progress.update(task, advance=1)
+    if args.output:
+        Path(args.output).write_text(json.dumps(result, indent=2, ensure_ascii=False), encoding="utf-8")
+        console.print(f"💾 결과 저장: {args.output}")
+    
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        regressions = compare_results(result, baseline, args.tolerance)
+        if regressions:
+            console.print(f"❌ 성능 회귀 {len(regressions)}건 (허용 {args.tolerance:.0%})", style="red")
+            for r in regressions:
+                console.print(f"  {r['metric']}: {r['baseline']:,.0f} → {r['current']:,.0f} ({r['change']:+.0%})")
+            return 1
+        console.print("✅ 기준 결과 대비 회귀 없음")
     
     console.print("✅ 벤치마크 완료")
-    console.print("📈 예상 성능: 30-50 페이지/분 (시스템 사양에 따라 차이)")
-    
     return 0
 
 
@@ -493,7 +549,14 @@ def create_parser():
     analyze_parser.add_argument("input", help="분석할 PDF 파일")
     
     # benchmark 명령어
-    subparsers.add_parser("benchmark", help="성능 벤치마크")
+    benchmark_parser = subparsers.add_parser("benchmark", help="성능 벤치마크")
+    benchmark_parser.add_argument("--pages", type=int, default=6, help="합성 문서 페이지 수")
+    benchmark_parser.add_argument("--max-workers", type=int, default=2, help="1..N 워커까지 측정")
+    benchmark_parser.add_argument("--dpi", default="150,300", help="측정할 DPI 목록 (쉼표 구분)")
+    benchmark_parser.add_argument("--modes", default="none,binarize,denoise", help="전처리 모드 목록")
+    benchmark_parser.add_argument("--output", help="결과 JSON 저장 경로")
+    benchmark_parser.add_argument("--compare", help="비교할 이전 결과 JSON (회귀 시 종료 코드 1)")
+    benchmark_parser.add_argument("--tolerance", type=float, default=0.15, help="허용 처리량 감소 비율")
     
     # help 명령어
     subparsers.add_parser("help", help="확장된 도움말 표시")
@@ -133,6 +133,16 @@ class APISettings:
     cors_enabled: bool = True
     rate_limit_enabled: bool = True
     requests_per_minute: int = 60
+    rate_limit_burst: int = 0            # 순간 허용량 (0 = requests_per_minute)
+    rate_limit_backend: str = "memory"   # memory | sqlite (같은 호스트의 여러 워커가 제한 공유)
+    rate_limit_db_path: str = "./ratelimit.db"
+    rate_limit_max_clients: int = 10000  # 메모리 백엔드가 기억하는 클라이언트 수 (LRU)
+    max_queue_size: int = 100     # 대기 중인 OCR 작업 상한 (넘치면 503)
+    max_queued_per_key: int = 20  # API 키/클라이언트별 대기 작업 상한 (넘치면 429)
+    task_store: str = "memory"    # 태스크 저장소: memory | sqlite
+    task_db_path: str = "./tasks.db"
+    task_ttl_hours: int = 24      # 이 시간이 지난 태스크는 주기적으로 삭제
+    task_cleanup_interval: int = 600  # 초
     auth_required: bool = False
     api_key: Optional[str] = None
 
@@ -0,0 +1,255 @@
+"""
+OCR Job Scheduler
+OCR 작업 스케줄러 (유한 우선순위 큐 + 키별 공정 분배 + 고정 워커 프로세스 풀)
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+
+class QueueFull(Exception):
+    """큐가 가득 참 (scope: "key" = 클라이언트별 한도, "global" = 전체 큐)"""
+
+    def __init__(self, scope: str, retry_after: int):
+        super().__init__(f"job queue full ({scope})")
+        self.scope = scope
+        self.retry_after = retry_after
+
+
+class SchedulerUnavailable(Exception):
+    """스케줄러가 시작되지 않았거나 종료 중"""
+
+
+@dataclass
+class Job:
+    """큐에 들어간 작업 하나"""
+    job_id: str
+    key: str
+    priority: int
+    fn: Callable
+    args: Tuple
+    on_start: Optional[Callable[["Job"], None]] = None
+    on_done: Optional[Callable[["Job"], None]] = None
+    enqueued_at: float = field(default_factory=time.monotonic)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    status: str = "queued"  # queued → running → completed/failed, 또는 cancelled
+    result: Any = None
+    error: Optional[BaseException] = None
+
+    @property
+    def wait_seconds(self) -> float:
+        end = self.started_at if self.started_at is not None else time.monotonic()
+        return end - self.enqueued_at
+
+
+class JobScheduler:
+    """
+    OCR 작업 스케줄러
+
+    - 큐는 전체 max_queue, 키(API 키/클라이언트)별 max_per_key 로 제한되고 넘치면 QueueFull
+    - 키 안에서는 priority 가 작은 순(같으면 제출 순), 키 사이에서는 라운드 로빈으로 꺼내므로
+      한 클라이언트가 큐를 채워도 다른 클라이언트의 작업이 뒤로 밀리지 않는다
+    - 작업은 workers 개의 고정 프로세스 풀에서 실행되어 동시에 도는 OCR 작업 수가 전역으로 제한된다
+    - fn 은 프로세스 풀로 보내지므로 모듈 최상위 함수여야 하고, 인자/결과는 피클 가능해야 한다
+    """
+
+    def __init__(self, workers: int = 4, max_queue: int = 100, max_per_key: int = 20,
+                 executor: Optional[Executor] = None, wait_samples: int = 1000,
+                 initializer: Optional[Callable] = None, initargs: Tuple = ()):
+        self.workers = max(1, workers)
+        self.max_queue = max_queue
+        self.max_per_key = max_per_key
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._initializer = initializer  # 워커 프로세스 초기화 (예: 진행률 중계 큐 연결)
+        self._initargs = initargs
+        self._queues: Dict[str, List[Tuple[int, int, Job]]] = {}
+        self._ring: Deque[str] = deque()  # 대기 작업이 있는 키 (라운드 로빈 순서)
+        self._jobs: Dict[str, Job] = {}   # 대기/실행 중 작업
+        self._pending_per_key: Dict[str, int] = {}
+        self._seq = itertools.count()
+        self._queued = 0
+        self._running = 0
+        self._ready: Optional[asyncio.Semaphore] = None
+        self._dispatchers: List[asyncio.Task] = []
+        self._accepting = False
+        self._waits: Deque[float] = deque(maxlen=wait_samples)
+        self._counts = {"submitted": 0, "rejected": 0, "completed": 0, "failed": 0, "cancelled": 0}
+
+    # ───────── 수명 주기 ─────────
+
+    async def start(self) -> None:
+        """워커 풀과 디스패처 시작 (이벤트 루프 안에서 호출)"""
+        if self._accepting:
+            return
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=self._initializer,
+                                                 initargs=self._initargs)
+        self._ready = asyncio.Semaphore(0)
+        self._dispatchers = [asyncio.create_task(self._dispatch()) for _ in range(self.workers)]
+        self._accepting = True
+
+    async def stop(self, wait: bool = True) -> None:
+        """새 작업을 받지 않고 디스패처/워커 풀 종료 (대기 중 작업은 취소)"""
+        self._accepting = False
+        for job_id in [j.job_id for j in self._jobs.values() if j.status == "queued"]:
+            self.cancel(job_id)
+        for task in self._dispatchers:
+            task.cancel()
+        await asyncio.gather(*self._dispatchers, return_exceptions=True)
+        self._dispatchers = []
+        if self._executor is not None and self._owns_executor:
+            await asyncio.to_thread(self._executor.shutdown, wait)
+            self._executor = None
+
+    # ───────── 제출/취소 ─────────
+
+    def submit(self, job_id: str, key: str, fn: Callable, *args, priority: int = 0,
+               on_start: Optional[Callable[[Job], None]] = None,
+               on_done: Optional[Callable[[Job], None]] = None) -> Job:
+        """작업을 큐에 넣는다 (가득 차면 QueueFull, 종료 중이면 SchedulerUnavailable)"""
+        if not self._accepting:
+            raise SchedulerUnavailable("job scheduler is not running")
+        if self._queued >= self.max_queue:
+            self._counts["rejected"] += 1
+            raise QueueFull("global", self.retry_after())
+        if self._pending_per_key.get(key, 0) >= self.max_per_key:
+            self._counts["rejected"] += 1
+            raise QueueFull("key", self.retry_after())
+
+        job = Job(job_id, key, priority, fn, args, on_start, on_done)
+        queue = self._queues.get(key)
+        if queue is None:
+            queue = self._queues[key] = []
+            self._ring.append(key)
+        heapq.heappush(queue, (priority, next(self._seq), job))
+        self._jobs[job_id] = job
+        self._queued += 1
+        self._pending_per_key[key] = self._pending_per_key.get(key, 0) + 1
+        self._counts["submitted"] += 1
+        self._ready.release()
+        return job
+
+    def cancel(self, job_id: str) -> bool:
+        """대기 중인 작업 취소 (실행 중인 작업은 취소하지 않음)"""
+        job = self._jobs.get(job_id)
+        if job is None or job.status != "queued":
+            return False
+        # 힙 항목은 꺼낼 때 건너뛴다 (lazy deletion)
+        job.status = "cancelled"
+        del self._jobs[job_id]
+        self._job_left_queue(job)
+        self._counts["cancelled"] += 1
+        return True
+    
+    def _job_left_queue(self, job: Job) -> None:
+        self._queued -= 1
+        remaining = self._pending_per_key[job.key] - 1
+        if remaining:
+            self._pending_per_key[job.key] = remaining
+        else:
+            del self._pending_per_key[job.key]
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    # ───────── 실행 ─────────
+
+    def _next_job(self) -> Optional[Job]:
+        """라운드 로빈으로 다음 키를 고르고 그 키에서 우선순위가 가장 높은 작업을 꺼낸다"""
+        while self._ring:
+            key = self._ring.popleft()
+            queue = self._queues[key]
+            job = None
+            while queue:
+                _, _, candidate = heapq.heappop(queue)
+                if candidate.status == "queued":
+                    job = candidate
+                    break
+            if queue:
+                self._ring.append(key)
+            else:
+                del self._queues[key]
+            if job is not None:
+                return job
+        return None
+
+    async def _dispatch(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._ready.acquire()
+            job = self._next_job()
+            if job is None:
+                continue  # 취소된 작업 몫의 신호
+            self._job_left_queue(job)
+            self._running += 1
+            job.status = "running"
+            job.started_at = time.monotonic()
+            self._waits.append(job.wait_seconds)
+            self._notify(job.on_start, job)
+            try:
+                job.result = await loop.run_in_executor(self._executor, job.fn, *job.args)
+                job.status = "completed"
+                self._counts["completed"] += 1
+            except asyncio.CancelledError:
+                raise
+            except BaseException as e:
+                job.error = e
+                job.status = "failed"
+                self._counts["failed"] += 1
+                if isinstance(e, BrokenProcessPool):
+                    logging.error("OCR 워커 풀이 비정상 종료됨: 새 작업을 받지 않습니다")
+                    self._accepting = False
+            finally:
+                job.finished_at = time.monotonic()
+                self._running -= 1
+                self._jobs.pop(job.job_id, None)
+            self._notify(job.on_done, job)
+
+    @staticmethod
+    def _notify(callback: Optional[Callable[[Job], None]], job: Job) -> None:
+        if callback is None:
+            return
+        try:
+            callback(job)
+        except Exception as e:
+            logging.error(f"작업 콜백 실패 {job.job_id}: {e}")
+
+    # ───────── 지표 ─────────
+
+    def retry_after(self) -> int:
+        """큐가 빠질 때까지의 대략적인 대기 시간 (초, Retry-After 헤더용)"""
+        if not self._waits:
+            return 5
+        average_wait = sum(self._waits) / len(self._waits)
+        return max(1, min(300, round(average_wait)))
+
+    def stats(self) -> Dict[str, Any]:
+        """큐 깊이/대기 시간/처리 수 (/health 용)"""
+        waits = sorted(self._waits)
+        oldest = max((j.wait_seconds for j in self._jobs.values() if j.status == "queued"), default=0.0)
+
+        def percentile(q: float) -> float:
+            return round(waits[min(len(waits) - 1, int(q * len(waits)))], 3) if waits else 0.0
+
+        return {
+            "accepting": self._accepting,
+            "workers": self.workers,
+            "running": self._running,
+            "queue_depth": self._queued,
+            "max_queue": self.max_queue,
+            "queued_keys": len(self._pending_per_key),
+            "oldest_wait_seconds": round(oldest, 3),
+            "wait_p50_seconds": percentile(0.5),
+            "wait_p95_seconds": percentile(0.95),
+            **self._counts,
+        }
@@ -1,24 +1,63 @@
 import re
 import json
+import heapq
+import asyncio
+import codecs
+import hashlib
+import os
 import csv
 import logging
-import requests
 import threading
-from collections import Counter, defaultdict
-from typing import List, Tuple, Dict, Optional, Union, Set, Any, Callable
+from array import array
+from bisect import bisect_left
+from collections import Counter, OrderedDict, defaultdict
+from typing import TYPE_CHECKING, List, Tuple, Dict, Optional, Union, Set, Any, Callable, Iterable, Iterator
 from functools import lru_cache, wraps
 from pathlib import Path
 from dataclasses import dataclass, asdict, field
-from math import log, sqrt
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from datetime import datetime, timedelta
+from math import log
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from html.parser import HTMLParser
 from urllib.parse import urlparse, urljoin
-from itertools import combinations
+from itertools import combinations, repeat
 import time
-import weakref
+import sys
 import gc
 from contextlib import contextmanager
 
+import numpy as np
+
+if TYPE_CHECKING:
+    import httpx
+
+
+# ───────── 토큰화 패턴 (모듈 로드 시 1회 컴파일) ─────────
+_URL_RE = re.compile(r"https?://\S+|www\.\S+")
+_EMAIL_RE = re.compile(r"\S+@\S+\.\S+")
+_TAG_RE = re.compile(r"#\S+|@\S+")
+_BRACKET_RE = re.compile(r"\([^)]*\)|\[[^\]]*\]|\{[^}]*\}")
+_QUOTE_RE = re.compile(r'"[^"]*"|\'[^\']*\'')
+# "허용 문자 외 → 공백, 공백 정규화, split" 을 한 번의 findall 로 대체 (허용 문자의 최대 연속 구간 = 토큰)
+_WORD_RE = re.compile(r"[0-9A-Za-z가-힣_\-]+")
+_AGGRESSIVE_WORD_RE = re.compile(r"[\w가-힣-]+")
+_HANGUL_RE = re.compile(r"[가-힣]")
+_LATIN_RE = re.compile(r"[a-zA-Z]")
+_DIGIT_RE = re.compile(r"[0-9]")
+_SPACE_RE = re.compile(r"\s+")
+_SENTENCE_RE = re.compile(r"[.!?]+")
+_JAMO_CONSONANT_RE = re.compile(r"[ㄱ-ㅎ]")
+_JAMO_VOWEL_RE = re.compile(r"[ㅏ-ㅣ]")
+_UPPER_RE = re.compile(r"[A-Z]")
+_ANY_DIGIT_RE = re.compile(r"\d")
+_SPECIAL_RE = re.compile(r"[^a-zA-Z가-힣0-9]")
+_BACKREF_RE = re.compile(r"\\[1-9]|\(\?P=")
+
+
+def _count_matches(pattern: "re.Pattern", text: str) -> int:
+    """단일 문자 패턴의 등장 횟수 (findall 처럼 문자열 리스트를 만들지 않음)"""
+    return len(text) - len(pattern.sub("", text))
+
 
 @dataclass
 class ExtractionResult:
@@ -41,48 +80,125 @@ class KeywordTrend:
 
 
 class MemoryManager:
-    """메모리 사용량 최적화를 위한 관리자"""
+    """
+    메모리 사용량 최적화를 위한 관리자: 스레드 안전 LRU 캐시.
+    항목 수(max_cache_size)와 대략적 바이트 크기(max_bytes) 두 기준으로 제한하며
+    적중/실패/퇴출 횟수를 기록한다.
+    """
     
-    def __init__(self, max_cache_size: int = 1000):
+    def __init__(self, max_cache_size: int = 1000, max_bytes: int = 64 * 1024 * 1024):
+        if max_cache_size <= 0 or max_bytes <= 0:
+            raise ValueError("max_cache_size and max_bytes must be positive")
         self.max_cache_size = max_cache_size
-        self._cache_refs = weakref.WeakValueDictionary()
-        self._access_times = {}
+        self.max_bytes = max_bytes
+        self._cache: "OrderedDict[Any, Tuple[Any, int]]" = OrderedDict()  # key → (값, 추정 바이트)
+        self._bytes = 0
         self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    @staticmethod
+    def estimate_size(value: Any) -> int:
+        """값의 대략적인 메모리 크기 (컨테이너는 한 단계 원소까지)"""
+        if isinstance(value, np.ndarray):
+            return value.nbytes + 112
+        size = sys.getsizeof(value)
+        if isinstance(value, (list, tuple, set, frozenset)):
+            size += sum(sys.getsizeof(v) for v in value)
+        elif isinstance(value, dict):
+            size += sum(sys.getsizeof(k) + sys.getsizeof(v) for k, v in value.items())
+        return size
     
     @contextmanager
     def memory_cleanup(self):
-        """메모리 정리를 위한 컨텍스트 매니저"""
+        """메모리 정리를 위한 컨텍스트 매니저 (캐시 한도만 맞추고 전체 GC 는 강제하지 않음)"""
         try:
             yield
         finally:
             self._cleanup_cache()
-            gc.collect()
     
     def _cleanup_cache(self):
         """캐시 정리"""
         with self._lock:
-            if len(self._cache_refs) > self.max_cache_size:
-                # 가장 오래된 항목들 제거
-                sorted_items = sorted(self._access_times.items(), key=lambda x: x[1])
-                to_remove = len(self._cache_refs) - self.max_cache_size + 100
-                
-                for key, _ in sorted_items[:to_remove]:
-                    if key in self._cache_refs:
-                        del self._cache_refs[key]
-                    if key in self._access_times:
-                        del self._access_times[key]
-    
-    def get_or_create(self, key: str, factory: Callable):
-        """캐시에서 가져오거나 새로 생성"""
+            self._evict()
+    
+    def _evict(self) -> None:
+        """한도를 넘는 동안 가장 오래 사용되지 않은 항목 제거 (잠금 안에서 호출)"""
+        while self._cache and (len(self._cache) > self.max_cache_size or self._bytes > self.max_bytes):
+            _, (_, size) = self._cache.popitem(last=False)
+            self._bytes -= size
+            self.evictions += 1
+    
+    def get(self, key, default=None):
+        """캐시 조회 (적중 시 최근 사용으로 갱신)"""
         with self._lock:
-            if key in self._cache_refs:
-                self._access_times[key] = time.time()
-                return self._cache_refs[key]
-            
-            value = factory()
-            self._cache_refs[key] = value
-            self._access_times[key] = time.time()
-            return value
+            entry = self._cache.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+    
+    def put(self, key, value) -> None:
+        """캐시 저장. max_bytes 보다 큰 값은 저장하지 않음"""
+        size = self.estimate_size(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._cache.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._cache[key] = (value, size)
+            self._bytes += size
+            self._evict()
+    
+    def get_or_create(self, key, factory: Callable):
+        """캐시에서 가져오거나 새로 생성 (factory 는 잠금 밖에서 실행)"""
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+        
+        value = factory()
+        with self._lock:
+            # 다른 스레드가 먼저 만들었으면 그 값을 사용
+            entry = self._cache.get(key)
+            if entry is not None:
+                return entry[0]
+        self.put(key, value)
+        return value
+    
+    def clear(self) -> None:
+        """캐시 비우기 (카운터는 유지)"""
+        with self._lock:
+            self._cache.clear()
+            self._bytes = 0
+    
+    def __len__(self) -> int:
+        return len(self._cache)
+    
+    def __contains__(self, key) -> bool:
+        return key in self._cache
+    
+    def stats(self) -> Dict[str, Union[int, float]]:
+        """캐시 상태와 적중률"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._cache),
+                "bytes": self._bytes,
+                "max_entries": self.max_cache_size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
 
 
 class RakeAlgorithm:
@@ -147,161 +263,837 @@ class RakeAlgorithm:
 
 
 class SemanticAnalyzer:
-    """향상된 의미론적 분석기"""
+    """
+    향상된 의미론적 분석기.
+
+    단어 벡터는 연속된 float32 행렬(단위 벡터 행)에 보관하므로 여러 단어의 코사인 유사도를
+    행렬곱 한 번으로 계산한다. 자카드 유사도는 단어별 문자 집합 비트셋의 AND 후 popcount 로 계산한다.
+    벡터 저장소와 쌍별 유사도 캐시는 모두 LRU 로 크기가 제한되고, 문자 → 비트 배정은 저장소에 남은
+    단어가 쓰는 문자만 유지한다 (비트폭 = 저장된 단어들의 고유 문자 수).
+    """
     
-    def __init__(self, vector_dim: int = 128):
+    # 자카드 계산 시 AND 임시 버퍼 크기 상한 (uint64 개수, 8MB)
+    JACCARD_BLOCK_WORDS = 1 << 20
+    
+    def __init__(self, vector_dim: int = 128, max_vectors: int = 10000, max_cache_size: int = 10000):
+        if vector_dim <= 10:
+            raise ValueError("vector_dim must be greater than 10")
         self.vector_dim = vector_dim
-        self.word_vectors = {}
-        self.similarity_cache = {}
-        self.memory_manager = MemoryManager()
+        self.max_vectors = max_vectors
+        self.max_cache_size = max_cache_size
+        self.similarity_cache = MemoryManager(max_cache_size)
+        # 벡터 저장소: 단어 → (행 번호, 문자 비트셋), 행렬은 필요할 때 2배씩 증가
+        self._rows: "OrderedDict[str, Tuple[int, int]]" = OrderedDict()
+        self._matrix = np.zeros((min(64, max_vectors), vector_dim), dtype=np.float32)
+        # 문자 → 비트 번호, 비트별 (문자, 그 문자를 가진 저장 단어 수), 재사용할 빈 비트 (최소 힙)
+        # 참조가 0 이 된 비트는 진행 중인 조회의 비트셋 의미가 바뀌지 않도록 다음 조회 시작 때 회수
+        self._char_bits: Dict[str, int] = {}
+        self._bit_chars: List[Optional[List]] = []
+        self._free_bits: List[int] = []
+        self._released_bits: List[int] = []
+        self._lock = threading.Lock()
     
-    def _enhanced_word_vector(self, word: str) -> List[float]:
-        """향상된 단어 벡터 생성"""
-        cache_key = f"vector_{word}_{self.vector_dim}"
-        
-        def create_vector():
-            vector = [0.0] * self.vector_dim
-            
-            # 문자 기반 특성
-            for i, char in enumerate(word.lower()):
-                if i < self.vector_dim - 10:  # 마지막 10개는 다른 특성용
-                    vector[i] = ord(char) / 255.0
-            
-            # 단어 길이 특성 (정규화)
-            vector[-10] = min(len(word) / 20.0, 1.0)
-            
-            # 첫 글자와 마지막 글자 특성
-            if len(word) > 0:
-                vector[-9] = ord(word[0]) / 255.0
-                vector[-8] = ord(word[-1]) / 255.0
-            
-            # 자음/모음 비율 (한국어)
-            if re.search(r'[가-힣]', word):
-                consonant_count = len(re.findall(r'[ㄱ-ㅎ]', word))
-                vowel_count = len(re.findall(r'[ㅏ-ㅣ]', word))
-                total = consonant_count + vowel_count
-                if total > 0:
-                    vector[-7] = consonant_count / total
-                    vector[-6] = vowel_count / total
-            
+    def _enhanced_word_vector(self, word: str) -> np.ndarray:
+        """향상된 단어 벡터 생성 (정규화 전 특성 벡터)"""
+        vector = np.zeros(self.vector_dim, dtype=np.float32)
+        lowered = word.lower()
+        
+        # 문자 기반 특성 (마지막 10개는 다른 특성용)
+        head = lowered[:self.vector_dim - 10]
+        if head:
+            vector[:len(head)] = np.array([ord(c) for c in head], dtype=np.float32) / 255.0
+        
+        # 단어 길이 특성 (정규화)
+        vector[-10] = min(len(word) / 20.0, 1.0)
+        
+        # 첫 글자와 마지막 글자 특성
+        if len(word) > 0:
+            vector[-9] = ord(word[0]) / 255.0
+            vector[-8] = ord(word[-1]) / 255.0
+        
+        # 자음/모음 비율 (한국어)
+        if _HANGUL_RE.search(word):
+            consonant_count = _count_matches(_JAMO_CONSONANT_RE, word)
+            vowel_count = _count_matches(_JAMO_VOWEL_RE, word)
+            total = consonant_count + vowel_count
+            if total > 0:
+                vector[-7] = consonant_count / total
+                vector[-6] = vowel_count / total
+        
+        if word:
             # 영어 알파벳 비율
-            alpha_count = len(re.findall(r'[a-zA-Z]', word))
-            vector[-5] = alpha_count / len(word) if word else 0
-            
+            vector[-5] = _count_matches(_LATIN_RE, word) / len(word)
             # 숫자 포함 여부
-            vector[-4] = 1.0 if re.search(r'\d', word) else 0.0
-            
+            vector[-4] = 1.0 if _ANY_DIGIT_RE.search(word) else 0.0
             # 대문자 비율
-            upper_count = len(re.findall(r'[A-Z]', word))
-            vector[-3] = upper_count / len(word) if word else 0
-            
+            vector[-3] = _count_matches(_UPPER_RE, word) / len(word)
             # 특수문자 포함 여부
-            vector[-2] = 1.0 if re.search(r'[^a-zA-Z가-힣0-9]', word) else 0.0
-            
+            vector[-2] = 1.0 if _SPECIAL_RE.search(word) else 0.0
             # 단어 복잡도 (고유 문자 수)
-            vector[-1] = len(set(word.lower())) / len(word) if word else 0
-            
-            return vector
+            vector[-1] = len(set(lowered)) / len(word)
         
-        return self.memory_manager.get_or_create(cache_key, create_vector)
+        return vector
     
-    def calculate_similarity(self, word1: str, word2: str) -> float:
-        """두 단어의 향상된 코사인 유사도 계산"""
-        cache_key = tuple(sorted([word1, word2]))
-        if cache_key in self.similarity_cache:
-            return self.similarity_cache[cache_key]
+    def _char_bitset(self, word: str) -> int:
+        """소문자 문자 집합 → 비트셋 (문자마다 고유 비트, 저장소에 들어가는 단어로 참조 수 증가)"""
+        bits = 0
+        for char in set(word.lower()):
+            bit = self._char_bits.get(char)
+            if bit is None:
+                if self._free_bits:
+                    bit = heapq.heappop(self._free_bits)
+                else:
+                    bit = len(self._bit_chars)
+                    self._bit_chars.append(None)
+                self._char_bits[char] = bit
+                self._bit_chars[bit] = [char, 0]
+            self._bit_chars[bit][1] += 1
+            bits |= 1 << bit
+        return bits
+    
+    def _recycle_bits(self) -> None:
+        """여전히 아무 단어도 쓰지 않는 해제 비트를 빈 비트로 회수 (조회 시작 시, 잠금 안에서 호출)"""
+        for bit in self._released_bits:
+            entry = self._bit_chars[bit]
+            if entry is not None and entry[1] == 0:
+                del self._char_bits[entry[0]]
+                self._bit_chars[bit] = None
+                heapq.heappush(self._free_bits, bit)
+        self._released_bits.clear()
+    
+    def _release_bits(self, bits: int) -> None:
+        """저장소에서 빠진 단어의 문자 참조 해제 (참조가 0 이 된 비트는 회수 대기)"""
+        while bits:
+            low = bits & -bits
+            bit = low.bit_length() - 1
+            entry = self._bit_chars[bit]
+            entry[1] -= 1
+            if entry[1] == 0:
+                self._released_bits.append(bit)
+            bits ^= low
+    
+    def _row(self, word: str) -> Tuple[int, int]:
+        """단어의 (행 번호, 문자 비트셋). 없으면 벡터를 만들어 저장 (잠금 안에서 호출)"""
+        entry = self._rows.get(word)
+        if entry is not None:
+            self._rows.move_to_end(word)
+            return entry
+        
+        if len(self._rows) >= self.max_vectors:
+            # 가장 오래 사용되지 않은 단어의 행 재사용
+            _, (row, evicted_bits) = self._rows.popitem(last=False)
+            self._release_bits(evicted_bits)
+        else:
+            row = len(self._rows)
+            if row >= len(self._matrix):
+                grown = np.zeros((min(len(self._matrix) * 2, self.max_vectors), self.vector_dim), dtype=np.float32)
+                grown[:len(self._matrix)] = self._matrix
+                self._matrix = grown
+        
+        vector = self._enhanced_word_vector(word)
+        norm = float(np.linalg.norm(vector))
+        self._matrix[row] = vector / norm if norm > 0 else 0.0
+        entry = self._rows[word] = (row, self._char_bitset(word))
+        return entry
+    
+    def _lookup(self, *word_lists: List[str]) -> List[Tuple[np.ndarray, List[int]]]:
+        """단어 목록마다 단위 벡터 행렬 (저장소 행의 복사본)과 문자 비트셋 목록 (같은 비트 배정 기준)"""
+        found = []
+        with self._lock:
+            self._recycle_bits()
+            for words in word_lists:
+                vectors = np.empty((len(words), self.vector_dim), dtype=np.float32)
+                bitsets = []
+                for i, word in enumerate(words):
+                    row, bits = self._row(word)
+                    vectors[i] = self._matrix[row]
+                    bitsets.append(bits)
+                found.append((vectors, bitsets))
+        return found
+    
+    def word_vectors(self, words: List[str]) -> np.ndarray:
+        """단어들의 단위 벡터 (len(words), vector_dim) 행렬"""
+        return self._lookup(words)[0][0]
+    
+    @staticmethod
+    def _pack_bitsets(bitsets: List[int], words: int) -> np.ndarray:
+        """비트셋 → (단어 수, words) uint64 행렬 (리틀 엔디언 64비트 단위)"""
+        raw = b"".join(bits.to_bytes(words * 8, "little") for bits in bitsets)
+        return np.frombuffer(raw, dtype="<u8").reshape(len(bitsets), words)
+    
+    def _jaccard(self, bits_a: List[int], bits_b: List[int]) -> np.ndarray:
+        """
+        비트셋 쌍별 자카드 유사도: |A ∩ B| 는 uint64 단위 AND 후 popcount 합
+        AND 임시 버퍼가 JACCARD_BLOCK_WORDS 를 넘지 않도록 A 쪽 행을 나눠 계산
+        """
+        width = max((bits.bit_length() for bits in bits_a + bits_b), default=0)
+        words = max(1, (width + 63) // 64)
+        packed_a = self._pack_bitsets(bits_a, words)
+        packed_b = self._pack_bitsets(bits_b, words)
+        sizes_a = np.array([bits.bit_count() for bits in bits_a], dtype=np.float32)
+        sizes_b = np.array([bits.bit_count() for bits in bits_b], dtype=np.float32)
+        
+        inter = np.empty((len(bits_a), len(bits_b)), dtype=np.float32)
+        step = max(1, self.JACCARD_BLOCK_WORDS // (len(bits_b) * words))
+        for start in range(0, len(bits_a), step):
+            block = packed_a[start:start + step, None, :] & packed_b[None, :, :]
+            inter[start:start + step] = np.bitwise_count(block).sum(axis=-1, dtype=np.uint32)
+        
+        union = sizes_a[:, None] + sizes_b[None, :] - inter
+        return np.divide(inter, union, out=np.zeros_like(inter), where=union > 0)
+    
+    def cross_similarity(self, words_a: List[str], words_b: List[str]) -> np.ndarray:
+        """두 단어 목록 사이의 유사도 행렬 (0.7 × 코사인 + 0.3 × 자카드)"""
+        if not words_a or not words_b:
+            return np.zeros((len(words_a), len(words_b)), dtype=np.float32)
         
-        vec1 = self._enhanced_word_vector(word1)
-        vec2 = self._enhanced_word_vector(word2)
+        (vectors_a, bits_a), (vectors_b, bits_b) = self._lookup(words_a, words_b)
+        cosine = vectors_a @ vectors_b.T
         
-        # 코사인 유사도 계산
-        dot_product = sum(a * b for a, b in zip(vec1, vec2))
-        magnitude1 = sqrt(sum(a * a for a in vec1))
-        magnitude2 = sqrt(sum(a * a for a in vec2))
+        return 0.7 * cosine + 0.3 * self._jaccard(bits_a, bits_b)
+    
+    def similarity_matrix(self, words: List[str]) -> np.ndarray:
+        """단어 목록의 n × n 유사도 행렬"""
+        return self.cross_similarity(words, words)
+    
+    def calculate_similarity(self, word1: str, word2: str) -> float:
+        """두 단어의 향상된 코사인 유사도 계산"""
+        cache_key = (word1, word2) if word1 <= word2 else (word2, word1)
+        cached = self.similarity_cache.get(cache_key)
+        if cached is not None:
+            return cached
         
-        if magnitude1 == 0 or magnitude2 == 0:
-            similarity = 0.0
-        else:
-            similarity = dot_product / (magnitude1 * magnitude2)
+        with self._lock:
+            self._recycle_bits()
+            row1, bits1 = self._row(word1)
+            row2, bits2 = self._row(word2)
+            similarity = float(self._matrix[row1] @ self._matrix[row2])
         
         # 추가 유사도 메트릭 (자카드 유사도)
-        set1 = set(word1.lower())
-        set2 = set(word2.lower())
-        jaccard_sim = len(set1 & set2) / len(set1 | set2) if set1 | set2 else 0
+        union = (bits1 | bits2).bit_count()
+        jaccard_sim = (bits1 & bits2).bit_count() / union if union else 0
         
         # 두 메트릭의 가중 평균
         final_similarity = 0.7 * similarity + 0.3 * jaccard_sim
         
-        self.similarity_cache[cache_key] = final_similarity
+        self.similarity_cache.put(cache_key, final_similarity)
         return final_similarity
     
     def cluster_keywords(self, keywords: List[str], threshold: float = 0.7) -> Dict[str, List[str]]:
-        """키워드를 유사도 기반으로 클러스터링"""
+        """키워드를 유사도 기반으로 클러스터링 (유사도 행렬 1회 계산 후 탐욕적 묶기)"""
+        unique = list(dict.fromkeys(keywords))
+        if not unique:
+            return {}
+        
+        close = self.similarity_matrix(unique) >= threshold
+        processed = np.zeros(len(unique), dtype=bool)
         clusters = {}
-        processed = set()
         
-        for keyword in keywords:
-            if keyword in processed:
+        for i, keyword in enumerate(unique):
+            if processed[i]:
                 continue
-            
-            cluster_name = keyword
-            cluster = [keyword]
-            processed.add(keyword)
-            
-            for other_keyword in keywords:
-                if other_keyword in processed:
-                    continue
-                
-                similarity = self.calculate_similarity(keyword, other_keyword)
-                if similarity >= threshold:
-                    cluster.append(other_keyword)
-                    processed.add(other_keyword)
-            
-            clusters[cluster_name] = cluster
+            processed[i] = True
+            members = np.flatnonzero(close[i] & ~processed)
+            processed[members] = True
+            clusters[keyword] = [keyword] + [unique[j] for j in members]
         
         return clusters
 
 
+class HTMLTextExtractor(HTMLParser):
+    """
+    증분 HTML → 텍스트 변환기. feed() 로 조각을 넣는 즉시 파싱하므로 전체 문서를 모을 필요가 없다.
+    script/style 등 비가시 요소의 내용은 버리고, 엔티티는 풀어서 보관한다.
+    """
+    
+    SKIP_TAGS = {"script", "style", "noscript", "template", "svg"}
+    
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self._parts: List[str] = []
+        self._skip_depth = 0
+    
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIP_TAGS:
+            self._skip_depth += 1
+        self._parts.append(" ")  # 태그 경계는 공백 (기존 정규식 방식과 동일)
+    
+    def handle_endtag(self, tag):
+        if tag in self.SKIP_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+        self._parts.append(" ")
+    
+    def handle_data(self, data):
+        # 데이터는 조각 경계에서 나뉘어 올 수 있으므로 구분자 없이 이어 붙임
+        if not self._skip_depth:
+            self._parts.append(data)
+    
+    def text(self) -> str:
+        """지금까지 파싱한 텍스트 (공백 정규화)"""
+        return _SPACE_RE.sub(" ", "".join(self._parts)).strip()
+
+
+def _run_sync(coro, async_name: str):
+    """동기 API 용 asyncio.run 래퍼 (이미 실행 중인 이벤트 루프 안에서는 비동기 버전을 안내)"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    coro.close()
+    raise RuntimeError(f"Cannot run inside a running event loop; use 'await {async_name}(...)' instead")
+
+
 class WebScraper:
-    """웹 스크래핑 기능"""
+    """
+    웹 스크래핑 기능 (asyncio + httpx)
+
+    - 하나의 AsyncClient 커넥션 풀을 공유하고, 전체/호스트별 동시 요청 수를 제한
+    - 본문은 스트리밍으로 읽어 max_bytes 에서 중단하고, 읽는 대로 HTML 파서에 전달
+    - iter_texts 는 완료된 순서대로 결과를 내보내므로 호출 측이 바로 후속 처리 가능
+    """
+    
+    USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
     
-    def __init__(self, timeout: int = 10):
+    def __init__(self, timeout: int = 10, max_bytes: int = 2 * 1024 * 1024,
+                 max_connections: int = 20, per_host_limit: int = 4):
         self.timeout = timeout
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
+        self.max_bytes = max_bytes
+        self.max_connections = max_connections
+        self.per_host_limit = per_host_limit
     
-    def scrape_url(self, url: str) -> str:
-        """URL에서 텍스트 추출"""
-        try:
-            response = self.session.get(url, timeout=self.timeout)
+    def _client(self, max_connections: Optional[int] = None) -> "httpx.AsyncClient":
+        import httpx  # 웹 추출을 쓸 때만 로드 (import 비용이 큼)
+        
+        max_connections = max_connections or self.max_connections
+        return httpx.AsyncClient(
+            timeout=self.timeout,
+            limits=httpx.Limits(max_connections=max_connections,
+                                max_keepalive_connections=max_connections),
+            headers={"User-Agent": self.USER_AGENT},
+            follow_redirects=True,
+        )
+    
+    async def fetch_text(self, client: "httpx.AsyncClient", url: str) -> str:
+        """URL 본문을 최대 max_bytes 까지 스트리밍으로 읽어 텍스트로 변환"""
+        async with client.stream("GET", url) as response:
             response.raise_for_status()
+            content_type = response.headers.get("content-type", "text/html")
+            is_html = "html" in content_type or "xml" in content_type
+            decoder = codecs.getincrementaldecoder(response.encoding or "utf-8")(errors="replace")
+            parser = HTMLTextExtractor() if is_html else None
+            parts: List[str] = []
             
-            # HTML에서 텍스트 추출 (간단한 버전)
-            text = re.sub(r'<[^>]+>', ' ', response.text)
-            text = re.sub(r'\s+', ' ', text).strip()
+            received = 0
+            async for chunk in response.aiter_bytes():
+                chunk = chunk[:self.max_bytes - received]
+                received += len(chunk)
+                decoded = decoder.decode(chunk)
+                if parser:
+                    parser.feed(decoded)
+                else:
+                    parts.append(decoded)
+                if received >= self.max_bytes:
+                    break  # 상한 도달: 나머지 본문은 받지 않고 연결 종료
             
-            return text
-        except Exception as e:
-            raise Exception(f"Failed to scrape {url}: {e}")
+            tail = decoder.decode(b"", final=True)
+            if parser:
+                parser.feed(tail)
+                parser.close()
+                return parser.text()
+            parts.append(tail)
+            return _SPACE_RE.sub(" ", "".join(parts)).strip()
     
-    def scrape_multiple_urls(self, urls: List[str], max_workers: int = 5) -> Dict[str, str]:
-        """여러 URL을 병렬로 스크래핑"""
-        results = {}
-        
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            future_to_url = {executor.submit(self.scrape_url, url): url for url in urls}
-            
-            for future in as_completed(future_to_url):
-                url = future_to_url[future]
+    async def iter_texts(self, urls: List[str], max_connections: Optional[int] = None):
+        """(url, 텍스트 또는 예외) 를 완료 순서대로 생성하는 비동기 제너레이터
+
+        max_connections 는 이번 호출의 전체 동시 연결 수 (기본: 인스턴스 설정)
+        """
+        host_limits: Dict[str, asyncio.Semaphore] = {}
+        
+        async def fetch(client, url):
+            host = urlparse(url).netloc
+            limit = host_limits.setdefault(host, asyncio.Semaphore(self.per_host_limit))
+            async with limit:
                 try:
-                    text = future.result()
-                    results[url] = text
+                    return url, await self.fetch_text(client, url)
                 except Exception as e:
-                    results[url] = f"Error: {e}"
-        
+                    return url, Exception(f"Failed to scrape {url}: {e}")
+        
+        async with self._client(max_connections) as client:
+            tasks = [asyncio.ensure_future(fetch(client, url)) for url in urls]
+            try:
+                for next_done in asyncio.as_completed(tasks):
+                    yield await next_done
+            finally:
+                for task in tasks:
+                    task.cancel()
+    
+    async def ascrape_multiple_urls(self, urls: List[str], max_connections: Optional[int] = None) -> Dict[str, str]:
+        """여러 URL을 비동기로 스크래핑 (실패는 'Error: ...' 문자열)"""
+        results = {}
+        async for url, text in self.iter_texts(urls, max_connections):
+            results[url] = f"Error: {text}" if isinstance(text, Exception) else text
         return results
+    
+    def scrape_url(self, url: str) -> str:
+        """URL에서 텍스트 추출"""
+        text = self.scrape_multiple_urls([url])[url]
+        if text.startswith("Error: "):
+            raise Exception(text[len("Error: "):])
+        return text
+    
+    def scrape_multiple_urls(self, urls: List[str], max_workers: Optional[int] = None) -> Dict[str, str]:
+        """여러 URL을 병렬로 스크래핑 (동기 호출용, max_workers 는 이번 호출의 전체 동시 연결 수)
+
+        이벤트 루프 안에서는 ascrape_multiple_urls 를 await 해야 한다 (RuntimeError)
+        """
+        return _run_sync(self.ascrape_multiple_urls(urls, max_workers), "ascrape_multiple_urls")
+
+
+class DocumentFrequencyIndex:
+    """
+    TF-IDF 용 증분 문서 빈도(DF) 색인
+
+    - 문서는 원문 해시로 식별 (원문/용어 집합은 보관하지 않음)
+    - add: O(문서 고유 용어 수), DF 조회: O(1) → 점수 계산은 문서 용어 수에만 비례
+    - save/load 로 재시작 후에도 색인을 다시 만들지 않음
+    """
+    
+    VERSION = 1
+    
+    def __init__(self):
+        self.doc_hashes: Set[str] = set()
+        self.doc_freq: Counter = Counter()
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def hash_text(text: str) -> str:
+        return hashlib.sha1(text.encode("utf-8")).hexdigest()
+    
+    def __len__(self) -> int:
+        return len(self.doc_hashes)
+    
+    def __contains__(self, text: str) -> bool:
+        return self.hash_text(text) in self.doc_hashes
+    
+    def add(self, text: str, terms: Set[str]) -> bool:
+        """처음 보는 문서면 용어별 DF 를 1씩 올리고 True 반환"""
+        doc_hash = self.hash_text(text)
+        with self._lock:
+            if doc_hash in self.doc_hashes:
+                return False
+            self.doc_hashes.add(doc_hash)
+            self.doc_freq.update(set(terms))
+            return True
+    
+    def clear(self) -> None:
+        with self._lock:
+            self.doc_hashes.clear()
+            self.doc_freq.clear()
+    
+    def save(self, path: Union[str, Path]) -> None:
+        """JSON 으로 저장 (임시 파일에 쓴 뒤 교체)"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            data = {
+                "version": self.VERSION,
+                "documents": sorted(self.doc_hashes),
+                "doc_freq": dict(self.doc_freq),
+            }
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, path)
+    
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "DocumentFrequencyIndex":
+        """저장된 색인 로드 (파일이 없으면 빈 색인)"""
+        index = cls()
+        path = Path(path)
+        if not path.exists():
+            return index
+        data = json.loads(path.read_text(encoding="utf-8"))
+        if data.get("version") != cls.VERSION:
+            raise ValueError(f"Unsupported DF index version: {data.get('version')}")
+        index.doc_hashes = set(data["documents"])
+        index.doc_freq = Counter(data["doc_freq"])
+        return index
+
+
+# 해상도 이름 → 버킷 크기(초), 기본 보존 기간(초)
+TREND_RESOLUTIONS = {
+    "minute": (60, 2 * 86400),
+    "hour": (3600, 90 * 86400),
+    "day": (86400, 3 * 365 * 86400),
+}
+
+
+class _TrendSeries:
+    """한 키워드·한 해상도의 시계열: 정렬된 버킷 시작 시각과 점수 합계/개수 배열"""
+    
+    __slots__ = ("starts", "sums", "counts")
+    
+    def __init__(self):
+        self.starts = array("q")
+        self.sums = array("d")
+        self.counts = array("q")
+    
+    def __len__(self) -> int:
+        return len(self.starts)
+    
+    def add(self, bucket: int, score: float) -> None:
+        starts = self.starts
+        if starts and starts[-1] == bucket:
+            i = len(starts) - 1
+        elif not starts or starts[-1] < bucket:
+            starts.append(bucket)
+            self.sums.append(0.0)
+            self.counts.append(0)
+            i = len(starts) - 1
+        else:
+            # 과거 시각 (드묾): 정렬 위치에 삽입
+            i = bisect_left(starts, bucket)
+            if i == len(starts) or starts[i] != bucket:
+                starts.insert(i, bucket)
+                self.sums.insert(i, 0.0)
+                self.counts.insert(i, 0)
+        self.sums[i] += score
+        self.counts[i] += 1
+    
+    def window(self, start: float, end: float) -> Tuple[int, int]:
+        """[start, end) 구간에 시작하는 버킷의 인덱스 범위 (이진 탐색)"""
+        return bisect_left(self.starts, start), bisect_left(self.starts, end)
+    
+    def prune(self, cutoff: float) -> int:
+        """cutoff 이전 버킷 제거, 제거한 개수 반환"""
+        i = bisect_left(self.starts, cutoff)
+        if i:
+            del self.starts[:i]
+            del self.sums[:i]
+            del self.counts[:i]
+        return i
+
+
+class TrendStore:
+    """
+    키워드 점수 시계열 저장소 (트렌드 분석용)
+
+    - 점수는 분/시/일 버킷으로 롤업되어 키워드·해상도별 배열(array)에 저장
+    - 구간 조회는 버킷 시작 시각 배열 이진 탐색: O(log n)
+    - 해상도별 보존 기간이 지난 버킷은 주기적으로 제거되므로 장기 실행 시에도 크기가 제한됨
+    - top_trending 으로 전체 키워드 중 상승폭 상위 N 개 조회, save/load 로 영속화
+    """
+    
+    VERSION = 1
+    
+    def __init__(self, retention: Optional[Dict[str, float]] = None, prune_interval: float = 3600.0):
+        self.retention = {name: spec[1] for name, spec in TREND_RESOLUTIONS.items()}
+        if retention:
+            unknown = set(retention) - set(TREND_RESOLUTIONS)
+            if unknown:
+                raise ValueError(f"Unknown resolutions: {sorted(unknown)}")
+            self.retention.update(retention)
+        self.prune_interval = prune_interval
+        self._series: Dict[str, Dict[str, _TrendSeries]] = {}
+        self._last_prune = 0.0
+        self._lock = threading.Lock()
+    
+    def __len__(self) -> int:
+        return len(self._series)
+    
+    def __contains__(self, keyword: str) -> bool:
+        return keyword in self._series
+    
+    def keywords(self) -> List[str]:
+        return list(self._series)
+    
+    def add(self, keyword: str, score: float, timestamp: Optional[datetime] = None) -> None:
+        self.add_many([(keyword, score)], timestamp)
+    
+    def add_many(self, items: List[Tuple[str, Union[int, float]]], timestamp: Optional[datetime] = None) -> None:
+        """같은 시각의 (키워드, 점수) 들을 모든 해상도 버킷에 누적"""
+        ts = (timestamp or datetime.now()).timestamp()
+        buckets = {name: int(ts // size) * size for name, (size, _) in TREND_RESOLUTIONS.items()}
+        with self._lock:
+            for keyword, score in items:
+                series = self._series.get(keyword)
+                if series is None:
+                    series = self._series[keyword] = {name: _TrendSeries() for name in TREND_RESOLUTIONS}
+                for name, bucket in buckets.items():
+                    series[name].add(bucket, float(score))
+            if ts - self._last_prune >= self.prune_interval:
+                self._prune_locked(ts)
+    
+    def prune(self, now: Optional[datetime] = None) -> int:
+        """보존 기간이 지난 버킷과 빈 키워드 제거, 제거한 버킷 수 반환"""
+        with self._lock:
+            return self._prune_locked((now or datetime.now()).timestamp())
+    
+    def _prune_locked(self, now_ts: float) -> int:
+        self._last_prune = now_ts
+        removed = 0
+        for keyword in list(self._series):
+            series = self._series[keyword]
+            for name, s in series.items():
+                removed += s.prune(now_ts - self.retention[name])
+            if not any(len(s) for s in series.values()):
+                del self._series[keyword]
+        return removed
+    
+    def resolution_for(self, days: float) -> str:
+        """조회 구간을 보존하고 있는 가장 세밀한 해상도"""
+        window = days * 86400
+        for name in TREND_RESOLUTIONS:
+            if self.retention[name] >= window:
+                return name
+        return "day"
+    
+    def history(self, keyword: str, days: float = 30, resolution: Optional[str] = None,
+                now: Optional[datetime] = None) -> List[Tuple[datetime, float]]:
+        """최근 days 일의 (버킷 시작 시각, 평균 점수) 목록"""
+        resolution = resolution or self.resolution_for(days)
+        end = (now or datetime.now()).timestamp()
+        with self._lock:
+            series = self._series.get(keyword)
+            if series is None:
+                return []
+            s = series[resolution]
+            lo, hi = s.window(end - days * 86400, end + 1)
+            return [
+                (datetime.fromtimestamp(s.starts[i]), s.sums[i] / s.counts[i])
+                for i in range(lo, hi)
+            ]
+    
+    @staticmethod
+    def _trend_score(first: float, last: float) -> float:
+        return (last - first) / max(first, 0.001)
+    
+    def trend(self, keyword: str, days: float = 30, now: Optional[datetime] = None) -> KeywordTrend:
+        """첫 버킷 대비 마지막 버킷 평균 점수 변화율로 트렌드 판정"""
+        history = self.history(keyword, days, now=now)
+        if len(history) < 2:
+            return KeywordTrend(keyword, history, 0.0, False)
+        trend_score = self._trend_score(history[0][1], history[-1][1])
+        return KeywordTrend(keyword, history, trend_score, trend_score > 0.1)  # 10% 이상 증가
+    
+    def top_trending(self, n: int = 10, days: float = 1, min_points: int = 2,
+                     now: Optional[datetime] = None) -> List[KeywordTrend]:
+        """전체 키워드 중 트렌드 점수 상위 n 개 (키워드마다 구간 양 끝 버킷만 조회)"""
+        resolution = self.resolution_for(days)
+        end = (now or datetime.now()).timestamp()
+        start = end - days * 86400
+        scored = []
+        with self._lock:
+            for keyword, series in self._series.items():
+                s = series[resolution]
+                lo, hi = s.window(start, end + 1)
+                if hi - lo < max(min_points, 2):
+                    continue
+                first = s.sums[lo] / s.counts[lo]
+                last = s.sums[hi - 1] / s.counts[hi - 1]
+                scored.append((self._trend_score(first, last), keyword))
+        top = heapq.nlargest(n, scored)
+        return [self.trend(keyword, days, now=now) for _, keyword in top]
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._series.clear()
+    
+    def save(self, path: Union[str, Path]) -> None:
+        """JSON 으로 저장 (임시 파일에 쓴 뒤 교체)"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            data = {
+                "version": self.VERSION,
+                "retention": self.retention,
+                "series": {
+                    keyword: {
+                        name: [s.starts.tolist(), s.sums.tolist(), s.counts.tolist()]
+                        for name, s in series.items()
+                    }
+                    for keyword, series in self._series.items()
+                },
+            }
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, path)
+    
+    @classmethod
+    def load(cls, path: Union[str, Path], **kwargs) -> "TrendStore":
+        """저장된 시계열 로드 (파일이 없으면 빈 저장소)"""
+        path = Path(path)
+        if not path.exists():
+            return cls(**kwargs)
+        data = json.loads(path.read_text(encoding="utf-8"))
+        if data.get("version") != cls.VERSION:
+            raise ValueError(f"Unsupported trend store version: {data.get('version')}")
+        store = cls(retention=kwargs.pop("retention", None) or data["retention"], **kwargs)
+        for keyword, series in data["series"].items():
+            restored = store._series[keyword] = {}
+            for name in TREND_RESOLUTIONS:
+                s = restored[name] = _TrendSeries()
+                starts, sums, counts = series.get(name, ([], [], []))
+                s.starts.extend(starts)
+                s.sums.extend(sums)
+                s.counts.extend(counts)
+        return store
+
+
+class SpaceSaving:
+    """
+    Space-Saving 빈도 상위 항목 스케치 (Metwally et al.)
+
+    capacity 개의 카운터만 유지한다. 가득 차면 최소 카운터를 새 항목에 물려주므로
+    추정치는 실제 빈도보다 크거나 같고 과대 추정은 errors[항목] 이하이다.
+    빈도가 전체의 1/capacity 를 넘는 항목은 반드시 남는다.
+    """
+    
+    def __init__(self, capacity: int = 10000):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self.counts: Dict[str, int] = {}
+        self.errors: Dict[str, int] = {}
+        self._heap: List[Tuple[int, int, str]] = []  # (카운트, 삽입 순번, 항목) — 항목당 1개, 값은 지연 갱신
+        self._seq = 0
+    
+    def __len__(self) -> int:
+        return len(self.counts)
+    
+    def _push(self, item: str, count: int) -> None:
+        self._seq += 1
+        heapq.heappush(self._heap, (count, self._seq, item))
+    
+    def update(self, item: str, count: int = 1) -> None:
+        counts = self.counts
+        if item in counts:
+            counts[item] += count
+            return
+        if len(counts) < self.capacity:
+            counts[item] = count
+            self.errors[item] = 0
+            self._push(item, count)
+            return
+        
+        # 최소 카운터 찾기: 힙 값이 낡았으면 현재 값으로 갱신 후 다시 확인
+        heap = self._heap
+        while True:
+            stale, _, victim = heap[0]
+            current = counts[victim]
+            if current == stale:
+                break
+            self._seq += 1
+            heapq.heapreplace(heap, (current, self._seq, victim))
+        heapq.heappop(heap)
+        del counts[victim]
+        del self.errors[victim]
+        counts[item] = stale + count
+        self.errors[item] = stale
+        self._push(item, stale + count)
+    
+    def update_counts(self, counter: Dict[str, int]) -> None:
+        """(항목, 개수) 묶음 반영 (청크 단위로 미리 집계한 Counter 용)"""
+        for item, count in counter.items():
+            self.update(item, count)
+    
+    def most_common(self, n: int) -> List[Tuple[str, int]]:
+        return heapq.nlargest(n, self.counts.items(), key=lambda kv: kv[1])
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """단어 목록 → 트라이 구조 정규식 (각 위치에서 첫 글자 분기만 시도, 같은 위치에선 가장 긴 단어 우선)"""
+    trie: Dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+    
+    def build(node: Dict[str, dict]) -> str:
+        alts = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not alts:
+            return ""
+        body = alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+        return f"(?:{body})?" if "" in node else body
+    
+    return build(trie)
+
+
+class KeywordMatcher:
+    """
+    여러 키워드의 첫 등장 위치를 텍스트 1회 스캔으로 찾는 다중 패턴 매처.
+
+    키워드 집합을 트라이 정규식으로 컴파일하므로 후보 위치 탐색과 비교는 re 엔진(C)에서
+    이루어지고, 매치마다 한 글자 뒤에서 다시 검색해 겹치는 등장도 놓치지 않는다.
+    한 위치에서는 가장 긴 키워드만 보고되므로 그 키워드의 접두사인 키워드들도
+    같은 위치에 등장한 것으로 기록한다.
+    이미 찾은 키워드가 스캔을 계속 잡아먹으면 남은 키워드만으로 다시 컴파일한다.
+    """
+    
+    RECOMPILE_AFTER = 256  # 이미 찾은 키워드 매치가 이만큼 쌓이면 재컴파일
+    
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords = list(dict.fromkeys(k for k in keywords if k))
+        keyword_set = set(self.keywords)
+        # 키워드 → 그 키워드의 진접두사인 키워드들
+        self._prefixes: Dict[str, List[str]] = {}
+        for kw in self.keywords:
+            prefixes = [kw[:i] for i in range(1, len(kw)) if kw[:i] in keyword_set]
+            if prefixes:
+                self._prefixes[kw] = prefixes
+    
+    @staticmethod
+    def _compile(words: List[str]) -> Optional["re.Pattern"]:
+        return re.compile(_trie_pattern(words)) if words else None
+    
+    def first_positions(self, text: str) -> Dict[str, int]:
+        """키워드 → 첫 등장 위치 (등장하지 않으면 키 없음)"""
+        found: Dict[str, int] = {}
+        remaining = len(self.keywords)
+        pattern = self._compile(self.keywords)
+        search = pattern.search if pattern else None
+        pos = wasted = 0
+        while remaining:
+            m = search(text, pos)
+            if m is None:
+                break
+            start = m.start()
+            pos = start + 1  # 다음 검색은 한 글자 뒤부터 (겹치는 등장도 찾음)
+            new = False
+            for kw in (m.group(), *self._prefixes.get(m.group(), ())):
+                if kw not in found:
+                    found[kw] = start
+                    remaining -= 1
+                    new = True
+            if not new:
+                wasted += 1
+                if wasted >= self.RECOMPILE_AFTER and remaining:
+                    # 이미 찾은 키워드가 계속 걸리면 남은 키워드만으로 다시 컴파일
+                    search = self._compile([k for k in self.keywords if k not in found]).search
+                    wasted = 0
+        return found
+
+
+@lru_cache(maxsize=256)
+def _compile_pattern_set(patterns: Tuple[str, ...], require_all: bool) -> Callable[[str], Any]:
+    """
+    필터 정규식 목록을 하나로 합친 검사 함수 (대소문자 무시).
+    require_all=False: 하나라도 매치 (p1|p2|…), True: 모두 매치 (각 패턴을 lookahead 로 결합)
+    역참조처럼 합치면 의미가 바뀌는 패턴은 개별 컴파일로 대체한다.
+    """
+    try:
+        if _BACKREF_RE.search("".join(patterns)) and len(patterns) > 1:
+            raise re.error("backreference")
+        if require_all:
+            combined = r"\A" + "".join(f"(?=[\\s\\S]*?(?:{p}))" for p in patterns)
+        else:
+            combined = "|".join(f"(?:{p})" for p in patterns)
+        return re.compile(combined, re.IGNORECASE).search
+    except re.error:
+        compiled = [re.compile(p, re.IGNORECASE) for p in patterns]
+        check = all if require_all else any
+        return lambda keyword: check(c.search(keyword) for c in compiled)
 
 
 def timing_decorator(func: Callable) -> Callable:
@@ -333,7 +1125,11 @@ class KeywordExtractor:
                  enable_semantic_analysis: bool = True,
                  domain_stopwords: Optional[Dict[str, Set[str]]] = None,
                  max_text_length: int = 1000000,
-                 memory_limit_mb: int = 500):
+                 memory_limit_mb: int = 500,
+                 df_index_path: Optional[Union[str, Path]] = None,
+                 df_autosave_every: int = 100,
+                 trend_store_path: Optional[Union[str, Path]] = None,
+                 trend_retention: Optional[Dict[str, float]] = None):
         if lang not in ("auto", "en", "ko"):
             raise ValueError(f"Unsupported language: {lang}. Supported: 'auto', 'en', 'ko'")
         
@@ -341,14 +1137,25 @@ class KeywordExtractor:
             raise ValueError("max_text_length must be positive")
         if memory_limit_mb <= 0:
             raise ValueError("memory_limit_mb must be positive")
+        if df_autosave_every <= 0:
+            raise ValueError("df_autosave_every must be positive")
         
         self.lang = lang
         self.to_lower = to_lower
         self.max_text_length = max_text_length
         self.memory_limit_mb = memory_limit_mb
         self.stopwords = self._build_stopwords()
-        self.document_corpus = []  # TF-IDF를 위한 문서 집합
-        self.keyword_history = defaultdict(list)  # 트렌드 분석용
+        # TF-IDF를 위한 문서 빈도 색인 (경로가 있으면 디스크에서 로드, 추가될 때마다 주기적으로 저장)
+        self.df_index_path = Path(df_index_path) if df_index_path else None
+        self.df_autosave_every = df_autosave_every
+        self.df_index = DocumentFrequencyIndex.load(self.df_index_path) if self.df_index_path else DocumentFrequencyIndex()
+        self._df_unsaved = 0
+        # 트렌드 분석용 시계열 (분/시/일 롤업, 보존 기간 초과분은 자동 정리)
+        self.trend_store_path = Path(trend_store_path) if trend_store_path else None
+        if self.trend_store_path:
+            self.trend_store = TrendStore.load(self.trend_store_path, retention=trend_retention)
+        else:
+            self.trend_store = TrendStore(retention=trend_retention)
         
         # 고급 기능
         self.enable_semantic = enable_semantic_analysis
@@ -465,8 +1272,8 @@ class KeywordExtractor:
         if not text:
             return "en"
         
-        korean_chars = len(re.findall(r"[가-힣]", text))
-        total_chars = len(re.sub(r"\s+", "", text))
+        korean_chars = _count_matches(_HANGUL_RE, text)
+        total_chars = len(_SPACE_RE.sub("", text))
         
         if total_chars == 0:
             return "en"
@@ -499,56 +1306,63 @@ class KeywordExtractor:
             # psutil이 없으면 체크하지 않음
             return True
     
-    def _clean_text(self, text: str, remove_numbers: bool = True, aggressive: bool = False) -> str:
-        """향상된 텍스트 정제"""
-        text = self._validate_text(text)
-        
+    def _clean_words(self, text: str, aggressive: bool = False) -> List[str]:
+        """정제된 단어 목록 (_clean_text 결과를 공백으로 split 한 것과 동일)"""
+        return self._scan_words(self._validate_text(text), aggressive)
+
+    def _scan_words(self, text: str, aggressive: bool = False) -> List[str]:
+        """검증/길이 제한 없이 정제 + 단어 분리 (스트리밍 구간 처리용)"""
         if self.to_lower:
             text = text.lower()
         
         # 기본 정제
-        text = re.sub(r"https?://\S+|www\.\S+", " ", text)
-        text = re.sub(r"\S+@\S+\.\S+", " ", text)
-        text = re.sub(r"#\S+|@\S+", " ", text)
+        text = _URL_RE.sub(" ", text)
+        text = _EMAIL_RE.sub(" ", text)
+        text = _TAG_RE.sub(" ", text)
         
         if aggressive:
             # 공격적 정제: 괄호, 인용부호 등 제거
-            text = re.sub(r"\([^)]*\)|\[[^\]]*\]|\{[^}]*\}", " ", text)
-            text = re.sub(r'"[^"]*"|\'[^\']*\'', " ", text)
-            text = re.sub(r"[^\w가-힣\s-]", " ", text)
-        else:
-            # 기본 정제
-            text = re.sub(r"[^0-9A-Za-z가-힣\s\-_]", " ", text)
-        
-        # 연속된 공백을 하나로
-        text = re.sub(r"\s+", " ", text)
-        
-        return text.strip()
+            text = _BRACKET_RE.sub(" ", text)
+            text = _QUOTE_RE.sub(" ", text)
+            return _AGGRESSIVE_WORD_RE.findall(text)
+        return _WORD_RE.findall(text)
+
+    def _clean_text(self, text: str, remove_numbers: bool = True, aggressive: bool = False) -> str:
+        """향상된 텍스트 정제"""
+        return " ".join(self._clean_words(text, aggressive))
+
+    def _filter_tokens(self, words: List[str], lang: str, min_length: int = 2, max_length: int = 20) -> List[str]:
+        """길이/불용어/숫자/반복 문자/하이픈 필터를 한 번의 순회로 적용"""
+        stopwords = self.stopwords.get(lang, set())
+        tokens = []
+        append = tokens.append
+        for t in words:
+            n = len(t)
+            if n < min_length or n > max_length or t in stopwords or t.isdigit():
+                continue
+            # 같은 문자 3회 이상 반복 ("aaa", "ㅋㅋㅋ") 또는 하이픈으로만 구성
+            if (n >= 3 and t.count(t[0]) == n) or not t.strip("-"):
+                continue
+            append(t)
+        return tokens
 
     def _tokenize(self, text: str, lang: str, min_length: int = 2, max_length: int = 20) -> List[str]:
         """향상된 토큰화 및 불용어 제거"""
         if not text:
             return []
-        
-        tokens = text.split()
-        # 길이 필터링
-        tokens = [t for t in tokens if min_length <= len(t) <= max_length]
-        # 불용어 제거
-        tokens = [t for t in tokens if t not in self.stopwords.get(lang, set())]
-        # 순수 숫자 토큰 제거
-        tokens = [t for t in tokens if not t.isdigit()]
-        # 반복 문자 필터링
-        tokens = [t for t in tokens if not re.match(r'^(.)\1{2,}$', t)]
-        # 하이픈으로만 구성된 토큰 제거
-        tokens = [t for t in tokens if not re.match(r'^-+$', t)]
-        
-        return tokens
+        return self._filter_tokens(text.split(), lang, min_length, max_length)
+
+    def _token_pass(self, text: str, lang: str, aggressive: bool = False,
+                    min_length: int = 2, max_length: int = 20) -> Tuple[List[str], List[str]]:
+        """정제 + 토큰화 1회 수행. (정제된 단어, 필터링된 토큰) 반환"""
+        words = self._clean_words(text, aggressive)
+        return words, self._filter_tokens(words, lang, min_length, max_length)
 
     def _generate_ngrams(self, tokens: List[str], n: int) -> List[str]:
         """N-gram 생성"""
         if len(tokens) < n:
             return []
-        return [' '.join(tokens[i:i+n]) for i in range(len(tokens) - n + 1)]
+        return [" ".join(gram) for gram in zip(*(tokens[i:] for i in range(n)))]
 
     def _calculate_tfidf(self, term_freq: Dict[str, int], doc_count: int, term_doc_count: Dict[str, int]) -> Dict[str, float]:
         """TF-IDF 점수 계산"""
@@ -571,13 +1385,15 @@ class KeywordExtractor:
         """고급 점수 계산 (위치, 길이, 빈도 조합)"""
         advanced_scores = []
         text_length = len(text)
+        # 모든 키워드의 첫 등장 위치를 소문자 텍스트 1회 스캔으로 계산
+        first_positions = KeywordMatcher(kw.lower() for kw, _ in keywords).first_positions(text.lower())
         
         for keyword, score in keywords:
             # 기본 점수 (빈도 또는 TF-IDF)
             base_score = float(score)
             
             # 위치 점수 (문서 앞부분에 있으면 가산점)
-            first_occurrence = text.lower().find(keyword.lower())
+            first_occurrence = first_positions.get(keyword.lower(), -1)
             position_score = 1 - (first_occurrence / text_length) if first_occurrence != -1 else 0.5
             
             # 길이 점수 (너무 짧거나 길지 않은 키워드 선호)
@@ -621,17 +1437,21 @@ class KeywordExtractor:
             raise
     
     def _extract_pdf_text(self, path: Path) -> str:
-        """PDF에서 텍스트 추출 (PyPDF2 없이 간단 구현)"""
+        """PDF에서 텍스트 추출 (텍스트 레이어 기준, 페이지 사이는 줄바꿈)"""
         try:
-            # PDF 처리를 위해서는 실제로 PyPDF2나 pdfplumber가 필요
-            # 여기서는 간단한 플레이스홀더
-            with open(path, 'rb') as f:
-                content = f.read()
-                # 실제 구현에서는 PDF 파싱 라이브러리 사용
-                return "PDF content extraction requires additional libraries"
+            return "\n".join(self._iter_pdf_pages(path))
         except Exception as e:
             raise Exception(f"PDF processing failed: {e}")
     
+    @staticmethod
+    def _iter_pdf_pages(path: Path) -> Iterator[str]:
+        """PDF 페이지별 텍스트 (한 번에 한 페이지만 메모리에 유지)"""
+        from pypdf import PdfReader
+        
+        reader = PdfReader(str(path))
+        for page in reader.pages:
+            yield page.extract_text() or ""
+    
     def _extract_text_from_json(self, data: Any) -> str:
         """JSON에서 텍스트 추출"""
         if isinstance(data, dict):
@@ -650,6 +1470,139 @@ class KeywordExtractor:
         else:
             return str(data)
 
+    # ───────── 스트리밍 파일 추출 ─────────
+    def iter_file_text(self, file_path: Union[str, Path], chunk_chars: int = 1 << 20) -> Iterator[str]:
+        """
+        파일 텍스트를 조각 단위로 생성 (txt: chunk_chars 문자씩, jsonl: 레코드별, pdf: 페이지별)
+        .json 은 문서 전체를 파싱해야 하므로 load_from_file 과 같은 필드를 추출해 chunk_chars 문자씩 생성
+        (메모리가 문서 크기에 비례하므로 큰 입력은 .jsonl 권장)
+        """
+        path = Path(file_path)
+        if not path.exists():
+            raise FileNotFoundError(f"File not found: {file_path}")
+        suffix = path.suffix.lower()
+        
+        if suffix in (".jsonl", ".ndjson"):
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        yield self._extract_text_from_json(json.loads(line)) + "\n"
+        elif suffix == ".json":
+            with open(path, "r", encoding="utf-8") as f:
+                text = self._extract_text_from_json(json.load(f))
+            for start in range(0, len(text), chunk_chars):
+                yield text[start:start + chunk_chars]
+        elif suffix == ".pdf":
+            for page_text in self._iter_pdf_pages(path):
+                yield page_text + "\n"
+        else:
+            with open(path, "r", encoding="utf-8") as f:
+                while True:
+                    chunk = f.read(chunk_chars)
+                    if not chunk:
+                        break
+                    yield chunk
+    
+    @staticmethod
+    def _iter_segments(chunks: Iterable[str], max_carry: int) -> Iterator[str]:
+        """
+        조각을 공백 경계에서 끊어 생성. 마지막 공백 뒤의 미완성 단어는 다음 조각 앞에 붙인다.
+        URL/이메일/태그 패턴과 토큰은 공백을 넘지 않으므로 구간별 처리 결과가 전체 처리와 같다.
+        (공백 없는 구간이 max_carry 를 넘으면 그 자리에서 강제로 끊음)
+        """
+        carry = ""
+        for chunk in chunks:
+            buf = carry + chunk
+            cut = len(buf)
+            while cut > 0 and not buf[cut - 1].isspace():
+                cut -= 1
+            if cut == 0 and len(buf) <= max_carry:
+                carry = buf
+                continue
+            cut = cut or len(buf)
+            carry = buf[cut:]
+            yield buf[:cut]
+        if carry:
+            yield carry
+    
+    def extract_keywords_from_file(self,
+                                   file_path: Union[str, Path],
+                                   n_gram: int = 1,
+                                   top_k: int = 10,
+                                   min_length: int = 2,
+                                   max_length: int = 20,
+                                   chunk_chars: int = 1 << 20,
+                                   sketch_size: Optional[int] = None) -> ExtractionResult:
+        """
+        파일을 조각 단위로 읽어 빈도 기반 키워드 추출 (max_text_length 제한 없음).
+
+        메모리는 조각 크기 + 어휘 크기에 비례한다. 결과는 파일 전체를 extract_keywords(method="frequency")
+        한 것과 같다. 어휘가 매우 큰 경우 sketch_size 를 주면 Space-Saving 스케치로 카운터 수를 제한한다.
+        """
+        self._validate_extract_args("", "frequency", n_gram, top_k)
+        start_time = time.time()
+        
+        # 언어 자동 감지는 전체 텍스트 기준이므로 먼저 문자 수만 세는 패스를 한 번 더 수행
+        lang = self.lang
+        if lang not in ("en", "ko"):
+            korean_chars = total_chars = 0
+            for chunk in self.iter_file_text(file_path, chunk_chars):
+                korean_chars += _count_matches(_HANGUL_RE, chunk)
+                total_chars += len(_SPACE_RE.sub("", chunk))
+            lang = "ko" if total_chars and korean_chars / total_chars > 0.1 else "en"
+        
+        counter: Union[Counter, SpaceSaving] = SpaceSaving(sketch_size) if sketch_size else Counter()
+        tail: List[str] = []  # 이전 구간의 마지막 n-1 토큰 (구간 경계를 넘는 n-gram 용)
+        chars = token_count = total_ngrams = segments = 0
+        
+        chunks = self.iter_file_text(file_path, chunk_chars)
+        for segment in self._iter_segments(chunks, max_carry=max(chunk_chars, 1 << 16)):
+            segments += 1
+            chars += len(segment)
+            tokens = self._filter_tokens(self._scan_words(segment), lang, min_length, max_length)
+            if not tokens:
+                continue
+            token_count += len(tokens)
+            if n_gram > 1:
+                window = tail + tokens
+                ngrams = self._generate_ngrams(window, n_gram)
+                tail = window[-(n_gram - 1):]
+            else:
+                ngrams = tokens
+            total_ngrams += len(ngrams)
+            if sketch_size:
+                counter.update_counts(Counter(ngrams))
+            else:
+                counter.update(ngrams)
+        
+        if not total_ngrams:
+            return ExtractionResult([], {}, "frequency", {})
+        
+        keywords = counter.most_common(top_k)
+        self.trend_store.add_many(keywords)
+        
+        stats = {
+            "source": str(file_path),
+            "detected_language": lang,
+            "original_length": chars,
+            "segments": segments,
+            "token_count": token_count,
+            "total_ngrams": total_ngrams,
+            "tracked_ngrams": len(counter),
+            "counting": "space_saving" if sketch_size else "exact",
+        }
+        parameters = {
+            "method": "frequency",
+            "n_gram": n_gram,
+            "top_k": top_k,
+            "min_length": min_length,
+            "max_length": max_length,
+            "chunk_chars": chunk_chars,
+            "sketch_size": sketch_size,
+        }
+        return ExtractionResult(keywords, stats, "frequency", parameters, processing_time=time.time() - start_time)
+
+
     def save_results(self, results: Union[ExtractionResult, List[ExtractionResult]], 
                     output_path: Union[str, Path], format: str = 'json') -> None:
         """결과를 파일로 저장"""
@@ -696,6 +1649,24 @@ class KeywordExtractor:
                         min_score: float = 0.0,
                         exclude_patterns: List[str] = None) -> ExtractionResult:
         """통합 키워드 추출 메서드"""
+        self._validate_extract_args(text, method, n_gram, top_k)
+        
+        # 메모리 체크
+        if not self._check_memory_usage():
+            self.logger.warning("Memory usage is high. Clearing caches.")
+            self._release_memory()
+        
+        with self.memory_manager.memory_cleanup():
+            self.logger.info(f"Extracting keywords using method={method}, n_gram={n_gram}")
+            analysis = self._analyze_text(text, method, n_gram, top_k, min_length, max_length, include_stats)
+            return self._finalize_extraction(
+                text, analysis, method, n_gram, top_k, min_length, max_length, include_stats,
+                advanced_scoring, filter_keywords, min_score, exclude_patterns
+            )
+
+    @staticmethod
+    def _validate_extract_args(text: str, method: str, n_gram: int, top_k: int) -> None:
+        """추출 인자 검증"""
         if not isinstance(text, str):
             raise TypeError("Input text must be a string")
         if method not in ["frequency", "tfidf", "rake"]:
@@ -704,98 +1675,101 @@ class KeywordExtractor:
             raise ValueError("n_gram must be 1, 2, or 3")
         if top_k <= 0:
             raise ValueError("top_k must be positive")
+
+    def _analyze_text(self, text: str, method: str, n_gram: int, top_k: int,
+                      min_length: int, max_length: int, include_stats: bool) -> Optional[Dict[str, Any]]:
+        """
+        공유 상태(DF 색인, 히스토리)를 건드리지 않는 추출 단계: 정제, 토큰화, 빈도 집계, 기본 통계.
+        batch_extract_parallel 에서는 워커 프로세스가 이 단계를 수행한다. 토큰이 없으면 None.
+        """
+        if not text.strip():
+            return None
         
-        # 메모리 체크
-        if not self._check_memory_usage():
-            self.logger.warning("Memory usage is high. Consider reducing text size or clearing cache.")
+        analysis: Dict[str, Any] = {"keywords": None, "term_freq": None, "stats": {}}
         
-        with self.memory_manager.memory_cleanup():
-            if not text.strip():
-                return ExtractionResult([], {}, method, {})
-            
-            self.logger.info(f"Extracting keywords using method={method}, n_gram={n_gram}")
-            
-            # 키워드 추출
-            if method == "rake":
-                keywords = self.rake.extract_keywords(text, top_k)
-            else:
-                # 기존 방법들
-                lang = self._detect_lang(text)
-                clean = self._clean_text(text, aggressive=(method == "tfidf"))
-                tokens = self._tokenize(clean, lang, min_length, max_length)
-                
-                if not tokens:
-                    return ExtractionResult([], {}, method, {})
-                
-                if n_gram == 1:
-                    ngrams = tokens
-                else:
-                    ngrams = self._generate_ngrams(tokens, n_gram)
-                
-                if method == "frequency":
-                    counts = Counter(ngrams)
-                    keywords = counts.most_common(top_k)
-                elif method == "tfidf":
-                    current_doc = set(ngrams)
-                    if text not in [doc for doc, _ in self.document_corpus]:
-                        self.document_corpus.append((text, current_doc))
-                    
-                    term_freq = Counter(ngrams)
-                    doc_count = len(self.document_corpus)
-                    term_doc_count = {}
-                    
-                    for _, doc_terms in self.document_corpus:
-                        for term in doc_terms:
-                            term_doc_count[term] = term_doc_count.get(term, 0) + 1
-                    
-                    tfidf_scores = self._calculate_tfidf(term_freq, doc_count, term_doc_count)
-                    keywords = sorted(tfidf_scores.items(), key=lambda x: x[1], reverse=True)[:top_k]
-            
-            # 키워드 필터링
-            if filter_keywords:
-                keywords = self.filter_keywords(
-                    keywords, 
-                    min_score=min_score, 
-                    exclude_patterns=exclude_patterns
-                )
-            
-            # 고급 점수 계산
-            if advanced_scoring and method != "rake":
-                keywords = self._calculate_advanced_scores(keywords, text)[:top_k]
-            
-            # 키워드 히스토리 업데이트 (트렌드 분석용)
-            timestamp = datetime.now()
-            for keyword, score in keywords:
-                self.keyword_history[keyword].append((timestamp, score))
-            
-            # 통계 정보
-            stats = {}
+        if method == "rake":
+            analysis["keywords"] = self.rake.extract_keywords(text, top_k)
             if include_stats:
+                analysis["stats"] = self.get_stats(text)
+            return analysis
+        
+        lang = self._detect_lang(text)
+        words, tokens = self._token_pass(text, lang, method == "tfidf", min_length, max_length)
+        if not tokens:
+            return None
+        
+        ngrams = tokens if n_gram == 1 else self._generate_ngrams(tokens, n_gram)
+        counts = Counter(ngrams)
+        if method == "frequency":
+            analysis["keywords"] = counts.most_common(top_k)
+        else:
+            # TF-IDF 점수는 DF 색인이 필요하므로 _finalize_extraction 에서 계산
+            analysis["term_freq"] = counts
+        
+        if include_stats:
+            if method == "frequency" and (min_length, max_length) == (2, 20):
+                # get_stats 와 같은 정제/토큰화 조건이면 이미 만든 토큰 재사용
+                stats = self._compute_stats(text, lang, words, tokens)
+            else:
                 stats = self.get_stats(text)
-                if method != "rake":
-                    stats.update({
-                        "method": method,
-                        "n_gram": n_gram,
-                        "total_ngrams": len(ngrams) if 'ngrams' in locals() else 0,
-                        "unique_ngrams": len(set(ngrams)) if 'ngrams' in locals() else 0
-                    })
-                
-                # 키워드 품질 분석 추가
-                quality_analysis = self.analyze_keyword_quality(keywords)
-                stats["keyword_quality"] = quality_analysis
-            
-            parameters = {
+            stats.update({
                 "method": method,
                 "n_gram": n_gram,
-                "top_k": top_k,
-                "min_length": min_length,
-                "max_length": max_length,
-                "advanced_scoring": advanced_scoring,
-                "filter_keywords": filter_keywords,
-                "min_score": min_score
-            }
+                "total_ngrams": len(ngrams),
+                "unique_ngrams": len(counts)
+            })
+            analysis["stats"] = stats
+        return analysis
+
+    def _finalize_extraction(self, text: str, analysis: Optional[Dict[str, Any]], method: str, n_gram: int,
+                             top_k: int, min_length: int, max_length: int, include_stats: bool,
+                             advanced_scoring: bool, filter_keywords: bool, min_score: float,
+                             exclude_patterns: Optional[List[str]]) -> ExtractionResult:
+        """공유 상태를 갱신하는 추출 단계: DF 색인 반영, TF-IDF, 필터링, 고급 점수, 히스토리"""
+        if analysis is None:
+            return ExtractionResult([], {}, method, {})
+        
+        keywords = analysis["keywords"]
+        if method == "tfidf":
+            term_freq = analysis["term_freq"]
+            self._add_to_df_index(text, term_freq.keys())
             
-            return ExtractionResult(keywords, stats, method, parameters)
+            tfidf_scores = self._calculate_tfidf(term_freq, len(self.df_index), self.df_index.doc_freq)
+            keywords = sorted(tfidf_scores.items(), key=lambda x: x[1], reverse=True)[:top_k]
+        
+        # 키워드 필터링
+        if filter_keywords:
+            keywords = self.filter_keywords(
+                keywords, 
+                min_score=min_score, 
+                exclude_patterns=exclude_patterns
+            )
+        
+        # 고급 점수 계산
+        if advanced_scoring and method != "rake":
+            keywords = self._calculate_advanced_scores(keywords, text)[:top_k]
+        
+        # 키워드 히스토리 업데이트 (트렌드 분석용)
+        self.trend_store.add_many(keywords)
+        
+        # 통계 정보
+        stats = analysis["stats"]
+        if include_stats:
+            # 키워드 품질 분석 추가
+            stats["keyword_quality"] = self.analyze_keyword_quality(keywords)
+        
+        parameters = {
+            "method": method,
+            "n_gram": n_gram,
+            "top_k": top_k,
+            "min_length": min_length,
+            "max_length": max_length,
+            "advanced_scoring": advanced_scoring,
+            "filter_keywords": filter_keywords,
+            "min_score": min_score
+        }
+        
+        return ExtractionResult(keywords, stats, method, parameters)
 
     def extract_with_rake(self, text: str, top_k: int = 10) -> List[Tuple[str, float]]:
         """RAKE 알고리즘으로 키워드 추출"""
@@ -817,79 +1791,105 @@ class KeywordExtractor:
                              method: str = "frequency",
                              n_gram: int = 1,
                              top_k: int = 10,
-                             max_workers: int = 4) -> List[ExtractionResult]:
-        """병렬 처리로 배치 키워드 추출"""
-        self.logger.info(f"Processing {len(texts)} texts in parallel with {max_workers} workers")
-        results = []
-        
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            future_to_index = {
-                executor.submit(self.extract_keywords, text, method, n_gram, top_k): i 
-                for i, text in enumerate(texts)
-            }
-            
-            # 순서 보장을 위한 딕셔너리
-            indexed_results = {}
-            
-            for future in as_completed(future_to_index):
-                index = future_to_index[future]
-                try:
-                    result = future.result()
-                    indexed_results[index] = result
-                except Exception as e:
-                    self.logger.error(f"Failed to process text {index}: {e}")
-                    indexed_results[index] = ExtractionResult([], {}, method, {})
-            
-            # 원래 순서대로 정렬
-            results = [indexed_results[i] for i in range(len(texts))]
+                             max_workers: int = 4,
+                             chunk_size: Optional[int] = None) -> List[ExtractionResult]:
+        """
+        프로세스 풀 병렬 배치 키워드 추출.
+
+        정제/토큰화/집계(_analyze_text)는 워커 프로세스에서 chunk_size 개 문서 단위로 수행하고,
+        DF 색인·TF-IDF·히스토리 갱신(_finalize_extraction)은 부모 프로세스가 입력 순서대로 적용한다.
+        따라서 결과는 같은 문서들을 순서대로 extract_keywords 한 것과 같다.
+        """
+        self._validate_extract_args("", method, n_gram, top_k)
+        if not texts:
+            return []
+        workers = max(1, min(max_workers, len(texts)))
+        if chunk_size is None:
+            # 워커당 ~4개 청크: IPC 횟수는 줄이고 마지막 청크 대기(꼬리 지연)는 짧게
+            chunk_size = max(1, min(256, -(-len(texts) // (workers * 4))))
+        self.logger.info(f"Processing {len(texts)} texts with {workers} worker processes (chunk={chunk_size})")
+        
+        chunks = [
+            [(i, texts[i]) for i in range(start, min(start + chunk_size, len(texts)))]
+            for start in range(0, len(texts), chunk_size)
+        ]
+        options = (method, n_gram, top_k, 2, 20, True)
+        results: List[ExtractionResult] = []
         
+        with self.memory_manager.memory_cleanup():
+            if workers == 1:
+                # 단일 워커: 프로세스 생성 비용 없이 같은 경로로 처리
+                outputs = (_analyze_chunk(chunk, options, self) for chunk in chunks)
+                results = self._collect_batch(texts, outputs, method, n_gram, top_k)
+            else:
+                with ProcessPoolExecutor(max_workers=workers, initializer=_init_batch_worker,
+                                         initargs=(self._worker_settings(),)) as executor:
+                    outputs = executor.map(_analyze_chunk, chunks, repeat(options))
+                    results = self._collect_batch(texts, outputs, method, n_gram, top_k)
+        return results
+
+    def _collect_batch(self, texts: List[str], outputs, method: str, n_gram: int, top_k: int) -> List[ExtractionResult]:
+        """워커 결과를 입력 순서대로 받아 공유 상태에 반영 (도착하는 대로 처리해 워커와 겹쳐 실행)"""
+        results = []
+        for chunk_output in outputs:
+            for index, analysis, error, seconds in chunk_output:
+                if error is not None:
+                    self.logger.error(f"Failed to process text {index}: {error}")
+                    results.append(ExtractionResult([], {}, method, {}))
+                    continue
+                start = time.time()
+                result = self._finalize_extraction(
+                    texts[index], analysis, method, n_gram, top_k, 2, 20, True, False, False, 0.0, None
+                )
+                result.processing_time = seconds + (time.time() - start)
+                results.append(result)
         return results
 
+    def _worker_settings(self) -> Dict[str, Any]:
+        """워커 프로세스에서 같은 정제/토큰화 설정의 추출기를 재구성하기 위한 값"""
+        return {
+            "lang": self.lang,
+            "to_lower": self.to_lower,
+            "max_text_length": self.max_text_length,
+            "stopwords": self.stopwords,
+        }
+
     def extract_from_web(self, urls: List[str], method: str = "frequency", top_k: int = 10) -> Dict[str, ExtractionResult]:
-        """웹 페이지에서 키워드 추출"""
+        """웹 페이지에서 키워드 추출 (동기 호출용, 이벤트 루프 안에서는 aextract_from_web 사용)"""
+        return _run_sync(self.aextract_from_web(urls, method, top_k), "aextract_from_web")
+
+    async def aextract_from_web(self, urls: List[str], method: str = "frequency", top_k: int = 10) -> Dict[str, ExtractionResult]:
+        """웹 페이지에서 키워드 추출: 페이지가 도착하는 대로 추출하고 나머지 다운로드는 계속 진행"""
         self.logger.info(f"Extracting keywords from {len(urls)} web pages")
         
-        # 웹 스크래핑
-        scraped_data = self.scraper.scrape_multiple_urls(urls)
-        
-        # 키워드 추출
         results = {}
-        for url, text in scraped_data.items():
-            if text.startswith("Error:"):
-                results[url] = ExtractionResult([], {}, method, {"error": text})
-            else:
-                try:
-                    result = self.extract_keywords(text, method, top_k=top_k)
-                    results[url] = result
-                except Exception as e:
-                    results[url] = ExtractionResult([], {}, method, {"error": str(e)})
-        
-        return results
+        async for url, text in self.scraper.iter_texts(urls):
+            if isinstance(text, Exception):
+                results[url] = ExtractionResult([], {}, method, {"error": f"Error: {text}"})
+                continue
+            try:
+                # 추출은 CPU 작업이므로 스레드에서 실행해 다른 다운로드를 막지 않음
+                results[url] = await asyncio.to_thread(self.extract_keywords, text, method, top_k=top_k)
+            except Exception as e:
+                results[url] = ExtractionResult([], {}, method, {"error": str(e)})
+        
+        # 입력 URL 순서로 반환
+        return {url: results[url] for url in urls if url in results}
 
     def analyze_trends(self, keyword: str, days: int = 30) -> KeywordTrend:
         """키워드 트렌드 분석"""
-        if keyword not in self.keyword_history:
-            return KeywordTrend(keyword, [], 0.0, False)
-        
-        cutoff_date = datetime.now() - timedelta(days=days)
-        recent_history = [
-            (timestamp, score) for timestamp, score in self.keyword_history[keyword]
-            if timestamp >= cutoff_date
-        ]
-        
-        if len(recent_history) < 2:
-            return KeywordTrend(keyword, recent_history, 0.0, False)
-        
-        # 간단한 트렌드 점수 계산
-        scores = [score for _, score in recent_history]
-        if len(scores) >= 2:
-            trend_score = (scores[-1] - scores[0]) / max(scores[0], 0.001)
-        else:
-            trend_score = 0.0
-        
-        is_trending = trend_score > 0.1  # 10% 이상 증가
-        
-        return KeywordTrend(keyword, recent_history, trend_score, is_trending)
+        return self.trend_store.trend(keyword, days)
+
+    def top_trending(self, n: int = 10, days: float = 1) -> List[KeywordTrend]:
+        """최근 days 일 동안 점수가 가장 많이 오른 키워드 n 개"""
+        return self.trend_store.top_trending(n, days)
+
+    def save_trend_store(self, path: Optional[Union[str, Path]] = None) -> None:
+        """트렌드 시계열 저장 (기본: 생성 시 지정한 trend_store_path)"""
+        target = Path(path) if path else self.trend_store_path
+        if target is None:
+            raise ValueError("No trend_store_path configured")
+        self.trend_store.save(target)
 
     def get_stats(self, text: str) -> Dict[str, Union[str, int, float]]:
         """상세한 텍스트 분석 통계"""
@@ -897,23 +1897,28 @@ class KeywordExtractor:
             raise TypeError("Input text must be a string")
         
         lang = self._detect_lang(text)
-        clean = self._clean_text(text)
-        tokens = self._tokenize(clean, lang)
-        
-        korean_chars = len(re.findall(r"[가-힣]", text))
-        english_chars = len(re.findall(r"[a-zA-Z]", text))
-        number_chars = len(re.findall(r"[0-9]", text))
-        total_chars = len(re.sub(r"\s+", "", text))
+        words, tokens = self._token_pass(text, lang)
+        return self._compute_stats(text, lang, words, tokens)
+
+    def _compute_stats(self, text: str, lang: str, words: List[str],
+                       tokens: List[str]) -> Dict[str, Union[str, int, float]]:
+        """정제 단어/토큰이 준비된 상태에서 통계 계산"""
+        korean_chars = _count_matches(_HANGUL_RE, text)
+        english_chars = _count_matches(_LATIN_RE, text)
+        number_chars = _count_matches(_DIGIT_RE, text)
+        total_chars = len(_SPACE_RE.sub("", text))
+        # len(" ".join(words)) 를 문자열을 만들지 않고 계산
+        cleaned_length = sum(map(len, words)) + len(words) - 1 if words else 0
         
         # 문장 복잡도 분석
-        sentences = re.split(r'[.!?]+', text)
+        sentences = _SENTENCE_RE.split(text)
         sentences = [s.strip() for s in sentences if s.strip()]
         avg_sentence_length = sum(len(s.split()) for s in sentences) / len(sentences) if sentences else 0
         
         return {
             "detected_language": lang,
             "original_length": len(text),
-            "cleaned_length": len(clean),
+            "cleaned_length": cleaned_length,
             "token_count": len(tokens),
             "unique_tokens": len(set(tokens)),
             "korean_char_ratio": round(korean_chars / total_chars if total_chars > 0 else 0, 3),
@@ -926,14 +1931,44 @@ class KeywordExtractor:
             "lexical_diversity": round(len(set(tokens)) / len(tokens) if tokens else 0, 3)
         }
 
+    def _add_to_df_index(self, text: str, terms) -> None:
+        """DF 색인에 문서 추가 (새 문서가 df_autosave_every 개 쌓이면 저장)"""
+        if self.df_index.add(text, set(terms)) and self.df_index_path:
+            self._df_unsaved += 1
+            if self._df_unsaved >= self.df_autosave_every:
+                self.save_df_index()
+
+    def save_df_index(self, path: Optional[Union[str, Path]] = None) -> None:
+        """DF 색인 저장 (기본: 생성 시 지정한 df_index_path)"""
+        target = Path(path) if path else self.df_index_path
+        if target is None:
+            raise ValueError("No df_index_path configured")
+        self.df_index.save(target)
+        self._df_unsaved = 0
+
     def clear_corpus(self) -> None:
         """TF-IDF용 문서 corpus 초기화"""
-        self.document_corpus.clear()
+        self.df_index.clear()
+        self._df_unsaved = 0
         self.logger.info("Document corpus cleared")
 
+    def _release_memory(self) -> None:
+        """메모리 한도 초과 시에만 캐시를 비우고 전체 GC 실행 (평상시 경로에서는 GC 를 강제하지 않음)"""
+        self.memory_manager.clear()
+        if self.semantic_analyzer:
+            self.semantic_analyzer.similarity_cache.clear()
+        gc.collect()
+
+    def get_cache_stats(self) -> Dict[str, Dict[str, Union[int, float]]]:
+        """캐시 적중/실패/퇴출 통계"""
+        stats = {"memory": self.memory_manager.stats()}
+        if self.semantic_analyzer:
+            stats["similarity"] = self.semantic_analyzer.similarity_cache.stats()
+        return stats
+
     def clear_history(self) -> None:
         """키워드 히스토리 초기화"""
-        self.keyword_history.clear()
+        self.trend_store.clear()
         self.logger.info("Keyword history cleared")
     
     def filter_keywords(self, 
@@ -952,15 +1987,14 @@ class KeywordExtractor:
         if min_score > 0:
             filtered = [(kw, score) for kw, score in filtered if float(score) >= min_score]
         
-        # 제외 패턴 필터링
-        if exclude_patterns:
-            for pattern in exclude_patterns:
-                filtered = [(kw, score) for kw, score in filtered if not re.search(pattern, kw, re.IGNORECASE)]
-        
-        # 포함 패턴 필터링
-        if include_patterns:
-            for pattern in include_patterns:
-                filtered = [(kw, score) for kw, score in filtered if re.search(pattern, kw, re.IGNORECASE)]
+        # 제외/포함 패턴 필터링 (패턴 목록을 하나로 컴파일해 키워드 목록을 한 번만 순회)
+        if exclude_patterns or include_patterns:
+            excluded = _compile_pattern_set(tuple(exclude_patterns), False) if exclude_patterns else None
+            included = _compile_pattern_set(tuple(include_patterns), True) if include_patterns else None
+            filtered = [
+                (kw, score) for kw, score in filtered
+                if not (excluded and excluded(kw)) and (included is None or included(kw))
+            ]
         
         # 최대 키워드 수 제한
         if max_keywords and len(filtered) > max_keywords:
@@ -980,18 +2014,15 @@ class KeywordExtractor:
         all_keywords = self.extract_keywords(text, method="frequency", top_k=50)
         candidate_keywords = [kw for kw, _ in all_keywords.keywords if kw not in current_keywords]
         
-        suggestions = []
-        for candidate in candidate_keywords:
-            # 현재 키워드들과의 평균 유사도 계산
-            similarities = []
-            for current_kw in current_keywords:
-                sim = self.semantic_analyzer.calculate_similarity(candidate, current_kw)
-                similarities.append(sim)
-            
-            if similarities:
-                avg_similarity = sum(similarities) / len(similarities)
-                if avg_similarity > 0.3:  # 임계값
-                    suggestions.append((candidate, avg_similarity))
+        if not candidate_keywords or not current_keywords:
+            return []
+        
+        # 후보 × 현재 키워드 유사도 행렬 1회 계산 후 행 평균
+        avg_similarity = self.semantic_analyzer.cross_similarity(candidate_keywords, current_keywords).mean(axis=1)
+        suggestions = [
+            (candidate, float(sim)) for candidate, sim in zip(candidate_keywords, avg_similarity)
+            if sim > 0.3  # 임계값
+        ]
         
         # 유사도 순으로 정렬하여 상위 제안 반환
         suggestions.sort(key=lambda x: x[1], reverse=True)
@@ -1044,6 +2075,41 @@ class KeywordExtractor:
         }
 
 
+# ───────── 배치 워커 ─────────
+_BATCH_WORKER: Dict[str, "KeywordExtractor"] = {}
+
+
+def _init_batch_worker(settings: Dict[str, Any]) -> None:
+    """워커 프로세스 초기화: 부모와 같은 설정의 추출기를 프로세스당 1회 생성"""
+    extractor = KeywordExtractor(
+        lang=settings["lang"],
+        to_lower=settings["to_lower"],
+        enable_semantic_analysis=False,
+        max_text_length=settings["max_text_length"],
+    )
+    extractor.stopwords = settings["stopwords"]
+    extractor._initialize_rake()
+    _BATCH_WORKER["extractor"] = extractor
+
+
+def _analyze_chunk(chunk: List[Tuple[int, str]], options: Tuple,
+                   extractor: Optional["KeywordExtractor"] = None) -> List[Tuple[int, Any, Optional[str], float]]:
+    """문서 청크 분석. (인덱스, 분석 결과, 오류 메시지, 소요 시간) 목록 반환"""
+    extractor = extractor or _BATCH_WORKER["extractor"]
+    method, n_gram, top_k, min_length, max_length, include_stats = options
+    out = []
+    for index, text in chunk:
+        start = time.time()
+        try:
+            if not isinstance(text, str):
+                raise TypeError("Input text must be a string")
+            analysis = extractor._analyze_text(text, method, n_gram, top_k, min_length, max_length, include_stats)
+            out.append((index, analysis, None, time.time() - start))
+        except Exception as e:
+            out.append((index, None, str(e), time.time() - start))
+    return out
+
+
 # ───────── 실행 예시 ─────────
 if __name__ == "__main__":
     # 테스트용 텍스트
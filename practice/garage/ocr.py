@@ -1,38 +1,46 @@
 import argparse
 import pytesseract
 from pdf2image import convert_from_path
-from PIL import Image, ImageEnhance, ImageFilter
+from PIL import Image
 import json
-from typing import List, Dict
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 from pathlib import Path
 import multiprocessing as mp
 from functools import partial
 import logging
 from tqdm import tqdm
 import gc
+import math
+import time
+from collections import deque
+
+from config import load_config
+from ocr_cache import get_page_cache
+from preprocess import denoise_gray, denoise_page, preprocess_batch, to_gray, to_image
+from rasterize import chunk_page_ranges, get_page_count, iter_page_arrays
+
+TESSERACT_CONFIG = '--oem 3 --psm 6'
+
+# 워커 프로세스 전역 캐시 설정 (Pool initializer 로 주입)
+_cache_settings = None
+
+
+def _init_worker(cache_settings=None):
+    global _cache_settings
+    _cache_settings = cache_settings
 
 def pdf_to_images(pdf_path: str, dpi: int = 300, first_page: int = None, last_page: int = None) -> List[Image.Image]:
     return convert_from_path(pdf_path, dpi=dpi, first_page=first_page, last_page=last_page)
 
-def preprocess_image(image: Image.Image) -> Image.Image:
-    if image.mode != 'RGB':
-        image = image.convert('RGB')
-    
-    gray = image.convert('L')
-    
-    enhancer = ImageEnhance.Contrast(gray)
-    enhanced = enhancer.enhance(1.5)
-    
-    filtered = enhanced.filter(ImageFilter.MedianFilter(size=3))
-    
-    return filtered
+def preprocess_image(image) -> Image.Image:
+    # grayscale → 대비 1.5배 → 3x3 메디안 (NumPy 엔진, PIL 필터 체인과 픽셀 동일)
+    return to_image(denoise_page(image, factor=1.5))
 
 def extract_text_from_image(image: Image.Image, conf_threshold: int = 50, preprocess: bool = True) -> List[Dict]:
     if preprocess:
         image = preprocess_image(image)
     
-    config = '--oem 3 --psm 6'
-    data = pytesseract.image_to_data(image, output_type=pytesseract.Output.DICT, lang="eng", config=config)
+    data = pytesseract.image_to_data(image, output_type=pytesseract.Output.DICT, lang="eng", config=TESSERACT_CONFIG)
     results = []
 
     for i in range(len(data['text'])):
@@ -49,10 +57,36 @@ def extract_text_from_image(image: Image.Image, conf_threshold: int = 50, prepro
             })
     return results
 
+def _cache_lookup(image, conf_threshold: int, preprocess: bool) -> Tuple[Optional[str], Optional[List[Dict]]]:
+    """원본 래스터 기준 캐시 조회 → (키, 캐시된 단어 목록 또는 None), 캐시 비활성 시 (None, None)"""
+    cache = get_page_cache(_cache_settings)
+    if cache is None:
+        return None, None
+    options = {"pipeline": "ocr.py", "preprocess": preprocess, "config": TESSERACT_CONFIG}
+    key = cache.make_key(image, 0, "eng", conf_threshold, options)
+    hit = cache.get(key, require_pdf=False, require_words=True)
+    return key, (hit["words"] if hit is not None else None)
+
+def _cache_store(key: Optional[str], results: List[Dict]):
+    if key is None:
+        return
+    try:
+        get_page_cache(_cache_settings).put(key, "eng", words=results)
+    except OSError as e:
+        logging.warning(f"OCR cache write failed: {e}")
+
+def extract_text_cached(image: Image.Image, conf_threshold: int = 50, preprocess: bool = True) -> List[Dict]:
+    key, words = _cache_lookup(image, conf_threshold, preprocess)
+    if words is not None:
+        return words
+    results = extract_text_from_image(image, conf_threshold=conf_threshold, preprocess=preprocess)
+    _cache_store(key, results)
+    return results
+
 def process_single_page(args_tuple) -> Dict:
     page_idx, image, conf_threshold, preprocess = args_tuple
     try:
-        text_blocks = extract_text_from_image(image, conf_threshold=conf_threshold, preprocess=preprocess)
+        text_blocks = extract_text_cached(image, conf_threshold=conf_threshold, preprocess=preprocess)
         return {
             "page": page_idx + 1,
             "results": text_blocks
@@ -68,37 +102,194 @@ def process_single_page(args_tuple) -> Dict:
         del image
         gc.collect()
 
-def process_pdf(pdf_path: str, dpi: int, conf_threshold: int, workers: int = None, preprocess: bool = True, batch_size: int = None) -> Dict:
+def _ocr_prepared_page(page_no: int, image: Image.Image, key: Optional[str], conf_threshold: int) -> Dict:
+    """전처리까지 끝난 페이지 OCR 후 원본 래스터 키로 캐시에 기록"""
+    try:
+        text_blocks = extract_text_from_image(image, conf_threshold=conf_threshold, preprocess=False)
+        _cache_store(key, text_blocks)
+        return {"page": page_no, "results": text_blocks}
+    except Exception as e:
+        logging.error(f"Error processing page {page_no}: {e}")
+        return {"page": page_no, "results": [], "error": str(e)}
+
+def process_page_range(args_tuple) -> List[Dict]:
+    """
+    워커가 직접 [first_page, last_page] 구간을 래스터화하고 구간 단위로 전처리한 뒤 한 장씩 OCR
+    - 부모는 (경로, 구간) 만 넘기므로 페이지 이미지가 피클링되지 않음
+    - 래스터 배열은 캐시 조회 직후 그레이스케일로 줄여 보관하고, 캐시 미스 페이지만
+      (N, H, W) 묶음으로 한 번에 전처리 (워커 메모리는 구간의 그레이스케일 페이지 수만큼)
+    """
+    pdf_path, first_page, last_page, dpi, conf_threshold, preprocess = args_tuple
+    results, pending = [], []
+    try:
+        for page_no, arr in iter_page_arrays(pdf_path, first_page, last_page, dpi):
+            key, words = _cache_lookup(arr, conf_threshold, preprocess)
+            if words is not None:
+                results.append({"page": page_no, "results": words})
+            else:
+                pending.append((page_no, key, to_gray(arr) if preprocess else arr))
+            del arr
+    except Exception as e:
+        logging.error(f"Error rasterizing pages {first_page}-{last_page}: {e}")
+        done = {r["page"] for r in results} | {p[0] for p in pending}
+        results.extend({"page": p, "results": [], "error": f"rasterize failed: {e}"}
+                       for p in range(first_page, last_page + 1) if p not in done)
+
+    if preprocess and pending:
+        try:
+            pages = [to_image(a) for a in preprocess_batch([p[2] for p in pending], denoise_gray, factor=1.5)]
+        except Exception as e:
+            logging.error(f"Error preprocessing pages {first_page}-{last_page}: {e}")
+            results.extend({"page": p[0], "results": [], "error": f"preprocess failed: {e}"} for p in pending)
+            pending, pages = [], []
+    else:
+        pages = [Image.fromarray(p[2]) for p in pending]
+
+    for (page_no, key, _), image in zip(pending, pages):
+        results.append(_ocr_prepared_page(page_no, image, key, conf_threshold))
+    return sorted(results, key=lambda r: r["page"])
+
+def make_page_ranges(pdf_path: str, first_page: int, last_page: int, dpi: int, conf_threshold: int, preprocess: bool,
+                     workers: int, chunk_size: int) -> List[tuple]:
+    """구간 작업 인자 목록 (워커 수보다 구간이 적지 않도록 구간 크기 조정)"""
+    count = last_page - first_page + 1
+    chunk = max(1, min(chunk_size, math.ceil(count / max(workers, 1))))
+    return [(pdf_path, first, last, dpi, conf_threshold, preprocess)
+            for first, last in chunk_page_ranges(list(range(first_page, last_page + 1)), chunk)]
+
+def _warm_up_tesseract():
+    """워커 시작 시 tesseract 실행 파일/언어 데이터를 한 번 로드해 첫 페이지 지연을 없앰"""
+    try:
+        pytesseract.image_to_string(Image.new("L", (64, 32), 255), lang="eng", config=TESSERACT_CONFIG)
+    except Exception:
+        pass
+
+def _init_pool_worker(cache_settings=None, warm_up: bool = True):
+    _init_worker(cache_settings)
+    if warm_up:
+        _warm_up_tesseract()
+
+def _timed_page_range(args_tuple) -> Tuple[List[Dict], float]:
+    start = time.perf_counter()
+    results = process_page_range(args_tuple)
+    return results, time.perf_counter() - start
+
+
+class OCRWorkerPool:
+    """
+    배치/문서 간에 재사용하는 상주 OCR 워커 풀
+
+    - 워커는 시작 시 한 번만 생성/임포트/tesseract 워밍업
+    - 구간 작업을 max_in_flight 개까지 앞서 제출하는 파이프라인: 한 워커가 배치 N 을 OCR 하는 동안
+      다른 워커는 이미 배치 N+1 구간을 래스터화 (배치 경계에서 풀이 비지 않음)
+    - 워커 가동률 = 워커 busy 시간 합 / (워커 수 × 실행 시간)
+    """
+
+    def __init__(self, workers: int = None, cache_settings=None, max_in_flight: int = None, warm_up: bool = True):
+        self.workers = workers or min(mp.cpu_count(), 4)
+        self.max_in_flight = max_in_flight or self.workers * 2
+        self._pool = mp.Pool(processes=self.workers, initializer=_init_pool_worker,
+                             initargs=(cache_settings, warm_up))
+        self._busy_seconds = 0.0
+        self._wall_seconds = 0.0
+        self._tasks = 0
+        self._pages = 0
+
+    def run(self, args_iter: Iterable[tuple], on_result: Callable[[List[Dict]], None] = None) -> List[Dict]:
+        """구간 작업을 제출 순서대로 처리해 페이지 결과를 이어붙여 반환"""
+        all_results = []
+        pending = deque()
+        start = time.perf_counter()
+
+        def collect():
+            results, busy = pending.popleft().get()
+            self._busy_seconds += busy
+            self._tasks += 1
+            self._pages += len(results)
+            all_results.extend(results)
+            if on_result is not None:
+                on_result(results)
+
+        try:
+            for args in args_iter:
+                pending.append(self._pool.apply_async(_timed_page_range, (args,)))
+                if len(pending) >= self.max_in_flight:
+                    collect()
+            while pending:
+                collect()
+        finally:
+            self._wall_seconds += time.perf_counter() - start
+        return all_results
+
+    def stats(self) -> Dict:
+        """누적 처리량/가동률"""
+        capacity = self.workers * self._wall_seconds
+        return {
+            "workers": self.workers,
+            "tasks": self._tasks,
+            "pages": self._pages,
+            "busy_seconds": round(self._busy_seconds, 3),
+            "wall_seconds": round(self._wall_seconds, 3),
+            "utilization": round(self._busy_seconds / capacity, 3) if capacity > 0 else 0.0,
+        }
+
+    def close(self):
+        self._pool.close()
+        self._pool.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self._pool.terminate()
+            self._pool.join()
+        else:
+            self.close()
+
+
+def run_page_ranges(args_list: List[tuple], workers: int, cache_settings=None, desc: str = "Processing pages",
+                    pool: Optional[OCRWorkerPool] = None) -> List[Dict]:
+    total = sum(a[2] - a[1] + 1 for a in args_list)
+    with tqdm(total=total, desc=desc) as bar:
+        if pool is None and (workers == 1 or len(args_list) == 1):
+            all_results = []
+            for args in args_list:
+                chunk_results = process_page_range(args)
+                all_results.extend(chunk_results)
+                bar.update(len(chunk_results))
+            return all_results
+
+        own_pool = pool is None
+        if own_pool:
+            pool = OCRWorkerPool(min(workers, len(args_list)), cache_settings)
+        try:
+            all_results = pool.run(args_list, on_result=lambda r: bar.update(len(r)))
+        finally:
+            if own_pool:
+                pool.close()
+        logging.info(f"Worker utilization: {pool.stats()['utilization']:.0%} ({pool.stats()})")
+        return all_results
+
+def process_pdf(pdf_path: str, dpi: int, conf_threshold: int, workers: int = None, preprocess: bool = True, batch_size: int = None,
+                cache_settings=None, chunk_size: int = 4, pool: Optional[OCRWorkerPool] = None) -> Dict:
     if workers is None:
-        workers = min(mp.cpu_count(), 4)
+        workers = pool.workers if pool is not None else min(mp.cpu_count(), 4)
+    _init_worker(cache_settings)
     
     logging.info(f"Processing PDF: {pdf_path}")
     logging.info(f"Using {workers} workers, DPI: {dpi}, Confidence threshold: {conf_threshold}")
     
     if batch_size:
-        return process_pdf_in_batches(pdf_path, dpi, conf_threshold, workers, preprocess, batch_size)
+        return process_pdf_in_batches(pdf_path, dpi, conf_threshold, workers, preprocess, batch_size, cache_settings,
+                                      pool=pool)
     
-    pages = pdf_to_images(pdf_path, dpi=dpi)
-    total_pages = len(pages)
+    total_pages = get_page_count(pdf_path)
     logging.info(f"Total pages to process: {total_pages}")
     
-    if total_pages == 1 or workers == 1:
-        all_results = []
-        for idx, image in enumerate(tqdm(pages, desc="Processing pages")):
-            result = process_single_page((idx, image, conf_threshold, preprocess))
-            all_results.append(result)
-    else:
-        args_list = [(idx, image, conf_threshold, preprocess) for idx, image in enumerate(pages)]
-        
-        with mp.Pool(processes=workers) as pool:
-            all_results = list(tqdm(
-                pool.imap(process_single_page, args_list),
-                total=total_pages,
-                desc="Processing pages"
-            ))
-    
-    del pages
-    gc.collect()
+    # 부모는 페이지를 래스터화하지 않고 구간만 분배 (피크 메모리 ∝ 워커 수)
+    args_list = make_page_ranges(pdf_path, 1, total_pages, dpi, conf_threshold, preprocess, workers, chunk_size)
+    all_results = run_page_ranges(args_list, workers, cache_settings, pool=pool)
     
     return {
         "type": "pdf",
@@ -107,47 +298,19 @@ def process_pdf(pdf_path: str, dpi: int, conf_threshold: int, workers: int = Non
         "pages": all_results
     }
 
-def process_pdf_in_batches(pdf_path: str, dpi: int, conf_threshold: int, workers: int, preprocess: bool, batch_size: int) -> Dict:
-    try:
-        import fitz  # PyMuPDF
-        doc = fitz.open(pdf_path)
-        total_pages = doc.page_count
-        doc.close()
-    except ImportError:
-        try:
-            import PyPDF2
-            with open(pdf_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                total_pages = len(pdf_reader.pages)
-        except ImportError:
-            pages = pdf_to_images(pdf_path, dpi=dpi, first_page=1, last_page=1)
-            total_pages = len(convert_from_path(pdf_path, dpi=100))
-            del pages
-            gc.collect()
+def process_pdf_in_batches(pdf_path: str, dpi: int, conf_threshold: int, workers: int, preprocess: bool, batch_size: int,
+                           cache_settings=None, pool: Optional[OCRWorkerPool] = None) -> Dict:
+    total_pages = get_page_count(pdf_path)
     
     logging.info(f"Processing {total_pages} pages in batches of {batch_size}")
     
-    all_results = []
-    
-    for start_page in tqdm(range(1, total_pages + 1, batch_size), desc="Processing batches"):
+    # 배치마다 풀을 새로 만들지 않고 하나의 풀에 배치 구간을 연달아 흘려보냄
+    args_list = []
+    for start_page in range(1, total_pages + 1, batch_size):
         end_page = min(start_page + batch_size - 1, total_pages)
-        
-        batch_pages = pdf_to_images(pdf_path, dpi=dpi, first_page=start_page, last_page=end_page)
-        
-        if len(batch_pages) == 1 or workers == 1:
-            for idx, image in enumerate(batch_pages):
-                result = process_single_page((start_page + idx - 1, image, conf_threshold, preprocess))
-                all_results.append(result)
-        else:
-            args_list = [(start_page + idx - 1, image, conf_threshold, preprocess) 
-                        for idx, image in enumerate(batch_pages)]
-            
-            with mp.Pool(processes=min(workers, len(batch_pages))) as pool:
-                batch_results = pool.map(process_single_page, args_list)
-                all_results.extend(batch_results)
-        
-        del batch_pages
-        gc.collect()
+        args_list.extend(make_page_ranges(pdf_path, start_page, end_page, dpi, conf_threshold, preprocess,
+                                          workers, batch_size))
+    all_results = run_page_ranges(args_list, workers, cache_settings, desc="Processing batches", pool=pool)
     
     return {
         "type": "pdf",
@@ -158,12 +321,15 @@ def process_pdf_in_batches(pdf_path: str, dpi: int, conf_threshold: int, workers
 
 def main():
     parser = argparse.ArgumentParser(description="PDF OCR with performance optimizations")
-    parser.add_argument("pdf", type=str, help="PDF 파일 경로")
+    parser.add_argument("pdf", type=str, nargs="+", help="PDF 파일 경로 (여러 개면 워커 풀을 공유해 순서대로 처리)")
     parser.add_argument("--dpi", type=int, default=300, help="이미지 변환 시 DPI 값 (기본값: 300)")
     parser.add_argument("--conf", type=int, default=50, help="텍스트 신뢰도 필터 기준 (기본값: 50)")
     parser.add_argument("--workers", type=int, default=None, help="병렬 처리 워커 수 (기본값: CPU 코어 수, 최대 4)")
     parser.add_argument("--no-preprocess", action="store_true", help="이미지 전처리 비활성화")
     parser.add_argument("--batch-size", type=int, default=None, help="대용량 PDF를 위한 배치 크기")
+    parser.add_argument("--chunk-size", type=int, default=4, help="워커가 한 번에 래스터화할 연속 페이지 수")
+    parser.add_argument("--config", type=str, default=None, help="설정 파일 경로 (cache 섹션 사용)")
+    parser.add_argument("--no-cache", action="store_true", help="OCR 결과 캐시 비활성화")
     parser.add_argument("--verbose", "-v", action="store_true", help="상세 로그 출력")
     args = parser.parse_args()
 
@@ -175,16 +341,29 @@ def main():
     )
 
     preprocess = not args.no_preprocess
+
+    cache_settings = load_config(Path(args.config) if args.config else None).cache
+    if args.no_cache:
+        cache_settings.enabled = False
     
-    result = process_pdf(
-        args.pdf, 
-        dpi=args.dpi, 
-        conf_threshold=args.conf,
-        workers=args.workers,
-        preprocess=preprocess,
-        batch_size=args.batch_size
-    )
-    print(json.dumps(result, indent=2, ensure_ascii=False))
+    workers = args.workers or min(mp.cpu_count(), 4)
+    with OCRWorkerPool(workers, cache_settings) as pool:
+        results = [
+            process_pdf(
+                pdf_path,
+                dpi=args.dpi,
+                conf_threshold=args.conf,
+                workers=workers,
+                preprocess=preprocess,
+                batch_size=args.batch_size,
+                cache_settings=cache_settings,
+                chunk_size=args.chunk_size,
+                pool=pool
+            )
+            for pdf_path in args.pdf
+        ]
+        logging.info(f"Worker pool stats: {pool.stats()}")
+    print(json.dumps(results[0] if len(results) == 1 else results, indent=2, ensure_ascii=False))
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,261 @@
+"""
+OCR Page Result Cache
+페이지 단위 OCR 결과 디스크 캐시 (내용 주소 기반)
+"""
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+from PIL import Image
+
+
+class OCRPageCache:
+    """페이지 래스터 해시를 키로 하는 OCR 결과 캐시
+
+    엔트리 구조 (키 앞 2자리로 샤딩):
+        <cache_dir>/ocr/<ab>/<key>.pdf   페이지 searchable PDF
+        <cache_dir>/ocr/<ab>/<key>.json  메타데이터 + 단어 목록
+
+    - TTL: 메타데이터의 created_at 기준으로 만료
+    - LRU: 조회 시 .json 의 mtime 을 갱신하고, 용량 초과 시 mtime 오래된 순으로 삭제
+    """
+
+    def __init__(self, cache_dir: Path, ttl_seconds: int = 86400, max_size_mb: int = 512):
+        self.root = Path(cache_dir) / "ocr"
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self.max_size_bytes = max_size_mb * 1024 * 1024
+        self._size_bytes: Optional[int] = None  # 첫 put 시점에 디스크 스캔으로 초기화
+
+    @classmethod
+    def from_settings(cls, settings) -> Optional["OCRPageCache"]:
+        """CacheSettings 에서 캐시 생성 (비활성화 시 None)"""
+        if settings is None or not settings.enabled:
+            return None
+        return cls(settings.get_cache_path(), settings.ttl_seconds, settings.max_size_mb)
+
+    # ───────── 키 ─────────
+    @staticmethod
+    def make_key(img: Union[Image.Image, np.ndarray], dpi: int, lang: str, conf: int, options: Dict[str, Any]) -> str:
+        """
+        래스터 바이트 + OCR 파라미터로 캐시 키 생성
+        (H, W, 3)/(H, W) uint8 배열은 같은 픽셀의 "RGB"/"L" 이미지와 같은 키 (버퍼를 복사 없이 해시)
+        """
+        h = hashlib.sha256()
+        if isinstance(img, np.ndarray):
+            mode = "RGB" if img.ndim == 3 else "L"
+            h.update(f"{mode}|{img.shape[1]}x{img.shape[0]}|".encode("utf-8"))
+            h.update(np.ascontiguousarray(img).data)
+        else:
+            h.update(f"{img.mode}|{img.size[0]}x{img.size[1]}|".encode("utf-8"))
+            h.update(img.tobytes())
+        params = {"dpi": dpi, "lang": lang, "conf": conf, "options": options}
+        h.update(json.dumps(params, sort_keys=True, ensure_ascii=False).encode("utf-8"))
+        return h.hexdigest()
+
+    def _paths(self, key: str) -> Tuple[Path, Path]:
+        shard = self.root / key[:2]
+        return shard / f"{key}.json", shard / f"{key}.pdf"
+
+    # ───────── 조회/저장 ─────────
+    def get(self, key: str, require_pdf: bool = True, require_words: bool = False) -> Optional[Dict[str, Any]]:
+        """캐시 조회. 적중 시 {"lang", "words", "pdf", "extra"} 반환"""
+        meta_path, pdf_path = self._paths(key)
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+        if time.time() - meta.get("created_at", 0) > self.ttl_seconds:
+            self._remove(meta_path, pdf_path)
+            return None
+        if require_words and meta.get("words") is None:
+            return None
+
+        pdf = None
+        if meta.get("has_pdf"):
+            try:
+                pdf = pdf_path.read_bytes()
+            except OSError:
+                return None
+        if require_pdf and pdf is None:
+            return None
+
+        # LRU: 마지막 접근 시각 갱신
+        try:
+            os.utime(meta_path)
+        except OSError:
+            pass
+
+        return {"lang": meta.get("lang"), "words": meta.get("words"), "pdf": pdf, "extra": meta.get("extra")}
+
+    def put(self, key: str, lang: Optional[str], pdf: Optional[bytes] = None, words: Optional[List[Dict]] = None,
+            extra: Optional[Dict[str, Any]] = None) -> None:
+        """결과 저장 (임시 파일 후 교체로 원자적 기록, extra 는 메타데이터에 그대로 보관)"""
+        meta_path, pdf_path = self._paths(key)
+        meta_path.parent.mkdir(parents=True, exist_ok=True)
+
+        written = 0
+        if pdf is not None:
+            written += self._atomic_write(pdf_path, pdf)
+        meta = {
+            "created_at": time.time(),
+            "lang": lang,
+            "has_pdf": pdf is not None,
+            "words": words,
+        }
+        if extra is not None:
+            meta["extra"] = extra
+        # 메타데이터를 마지막에 써야 PDF 가 완전히 기록된 엔트리만 조회됨
+        written += self._atomic_write(meta_path, json.dumps(meta, ensure_ascii=False).encode("utf-8"))
+
+        if self._size_bytes is None:
+            self._size_bytes = self._scan_size()
+        else:
+            self._size_bytes += written
+        if self._size_bytes > self.max_size_bytes:
+            self.evict()
+
+    @staticmethod
+    def _atomic_write(path: Path, data: bytes) -> int:
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+        return len(data)
+
+    @staticmethod
+    def _remove(*paths: Path) -> None:
+        for p in paths:
+            try:
+                p.unlink()
+            except OSError:
+                pass
+
+    # ───────── 정리 ─────────
+    def _entries(self) -> List[Tuple[float, int, Path, Path]]:
+        """(마지막 접근, 크기, 메타 경로, PDF 경로) 목록"""
+        entries = []
+        for meta_path in self.root.glob("*/*.json"):
+            pdf_path = meta_path.with_suffix(".pdf")
+            try:
+                st = meta_path.stat()
+            except OSError:
+                continue
+            size = st.st_size
+            try:
+                size += pdf_path.stat().st_size
+            except OSError:
+                pass
+            entries.append((st.st_mtime, size, meta_path, pdf_path))
+        return entries
+
+    def _scan_size(self) -> int:
+        return sum(size for _, size, _, _ in self._entries())
+
+    def evict(self) -> int:
+        """만료 엔트리 제거 후, 용량 초과분을 LRU 순으로 제거. 삭제된 엔트리 수 반환"""
+        now = time.time()
+        entries = sorted(self._entries(), key=lambda e: e[0])
+        total = sum(size for _, size, _, _ in entries)
+        # 경계에서 매번 정리하지 않도록 90% 까지 비움
+        target = int(self.max_size_bytes * 0.9)
+        removed = 0
+
+        for atime, size, meta_path, pdf_path in entries:
+            expired = False
+            try:
+                meta = json.loads(meta_path.read_text(encoding="utf-8"))
+                expired = now - meta.get("created_at", 0) > self.ttl_seconds
+            except (OSError, ValueError):
+                expired = True
+            if expired or total > target:
+                self._remove(meta_path, pdf_path)
+                total -= size
+                removed += 1
+
+        self._size_bytes = total
+        return removed
+
+    def clear(self) -> None:
+        """캐시 전체 삭제"""
+        for _, _, meta_path, pdf_path in self._entries():
+            self._remove(meta_path, pdf_path)
+        self._size_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """캐시 통계"""
+        entries = self._entries()
+        return {
+            "entries": len(entries),
+            "size_mb": round(sum(size for _, size, _, _ in entries) / (1024 * 1024), 2),
+            "max_size_mb": self.max_size_bytes / (1024 * 1024),
+            "ttl_seconds": self.ttl_seconds,
+        }
+
+
+# ───────────── 문서별 DPI 선택 기록 ─────────────
+def file_fingerprint(path: Path, sample_bytes: int = 1024 * 1024) -> str:
+    """파일 크기 + 앞/뒤 샘플 바이트 해시 (대용량 PDF 전체를 읽지 않는 문서 식별자)"""
+    path = Path(path)
+    size = path.stat().st_size
+    h = hashlib.sha256(f"{size}|".encode("utf-8"))
+    with open(path, "rb") as f:
+        h.update(f.read(sample_bytes))
+        if size > sample_bytes:
+            f.seek(max(sample_bytes, size - sample_bytes))
+            h.update(f.read(sample_bytes))
+    return h.hexdigest()
+
+
+class DpiChoiceStore:
+    """문서 지문 + 프로브 파라미터별 자동 DPI 선택 결과 저장소
+
+    선택 결과는 페이지 캐시에 PDF 없는 엔트리({"extra": {"dpi", "scores"}})로 기록되므로
+    페이지 결과와 같은 TTL/용량(LRU) 정책으로 만료·정리된다.
+    """
+
+    def __init__(self, cache: OCRPageCache):
+        self.cache = cache
+
+    @classmethod
+    def from_settings(cls, settings) -> Optional["DpiChoiceStore"]:
+        cache = get_page_cache(settings)
+        return cls(cache) if cache is not None else None
+
+    @staticmethod
+    def make_key(fingerprint: str, candidates: List[int], lang: str, conf: int) -> str:
+        params = {"kind": "dpi", "candidates": sorted(candidates), "lang": lang, "conf": conf}
+        return hashlib.sha256(
+            (fingerprint + json.dumps(params, sort_keys=True)).encode("utf-8")
+        ).hexdigest()
+
+    def get(self, key: str) -> Optional[int]:
+        hit = self.cache.get(key, require_pdf=False)
+        try:
+            return int(hit["extra"]["dpi"])
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    def put(self, key: str, dpi: int, scores: Optional[Dict[int, int]] = None) -> None:
+        self.cache.put(key, None, extra={"dpi": dpi, "scores": scores or {}})
+
+
+# 워커 프로세스별 캐시 인스턴스 (설정 객체만 피클링해서 전달)
+_worker_caches: Dict[Tuple[str, int, int], OCRPageCache] = {}
+
+
+def get_page_cache(settings) -> Optional[OCRPageCache]:
+    """프로세스 내에서 설정별 캐시 인스턴스를 재사용"""
+    if settings is None or not settings.enabled:
+        return None
+    key = (str(settings.get_cache_path()), settings.ttl_seconds, settings.max_size_mb)
+    cache = _worker_caches.get(key)
+    if cache is None:
+        cache = OCRPageCache.from_settings(settings)
+        _worker_caches[key] = cache
+    return cache
@@ -0,0 +1,166 @@
+"""
+Streaming PDF Merge
+페이지 PDF 들을 한 장씩 읽어 바로 출력 파일에 기록하는 스트리밍 병합기
+"""
+
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterable, List, Optional, Tuple, Union
+
+from pypdf import PdfReader
+from pypdf.generic import (
+    ArrayObject,
+    DictionaryObject,
+    IndirectObject,
+    NameObject,
+    NumberObject,
+    PdfObject,
+    StreamObject,
+)
+
+# 부모 /Pages 노드에서 상속될 수 있는 페이지 속성
+INHERITABLE_PAGE_KEYS = ("/Resources", "/MediaBox", "/CropBox", "/Rotate")
+
+
+class StreamingPdfWriter:
+    """
+    페이지 단위로 객체를 재번호화해 즉시 파일에 쓰는 최소 PDF 작성기.
+
+    PdfWriter 는 모든 페이지(와 원본 리더)를 메모리에 쥐고 있다가 마지막에 직렬화하지만,
+    이 작성기는 한 페이지의 객체 그래프만 메모리에 두고 바로 기록한다.
+    끝까지 유지되는 상태는 xref 오프셋과 /Kids 참조 번호(페이지당 정수 몇 개)뿐이다.
+    """
+
+    def __init__(self, stream: BinaryIO):
+        self.stream = stream
+        self._offsets: List[Optional[int]] = [None]  # 객체 번호 → 파일 오프셋 (0번은 free)
+        self._kids: List[int] = []
+        self.stream.write(b"%PDF-1.7\n%\xe2\xe3\xcf\xd3\n")
+        self.catalog_id = self._reserve()
+        self.pages_id = self._reserve()
+
+    @property
+    def page_count(self) -> int:
+        return len(self._kids)
+
+    def _reserve(self) -> int:
+        self._offsets.append(None)
+        return len(self._offsets) - 1
+
+    def _write_object(self, num: int, obj: PdfObject) -> None:
+        self._offsets[num] = self.stream.tell()
+        self.stream.write(f"{num} 0 obj\n".encode("ascii"))
+        obj.write_to_stream(self.stream)
+        self.stream.write(b"\nendobj\n")
+
+    def add_page(self, page: DictionaryObject) -> None:
+        """원본 리더의 페이지 객체와 그 하위 객체들을 복사해 기록"""
+        page_num = self._reserve()
+        mapping: Dict[Tuple[int, int], int] = {}
+        pending: List[Tuple[int, IndirectObject]] = []
+
+        # 페이지 자신과 원본 페이지 트리 노드는 새 번호로 고정 (/P, /Parent 역참조가 원본 트리를 끌고 오지 않도록)
+        if page.indirect_reference is not None:
+            ref = page.indirect_reference
+            mapping[(ref.idnum, ref.generation)] = page_num
+        parent = page.get("/Parent")
+        while parent is not None:
+            ref = parent.indirect_reference
+            if ref is None or (ref.idnum, ref.generation) in mapping:
+                break
+            mapping[(ref.idnum, ref.generation)] = self.pages_id
+            parent = parent.get_object().get("/Parent")
+
+        def remap(obj):
+            if isinstance(obj, IndirectObject):
+                key = (obj.idnum, obj.generation)
+                if key not in mapping:
+                    mapping[key] = self._reserve()
+                    pending.append((mapping[key], obj))
+                return IndirectObject(mapping[key], 0, None)
+            if isinstance(obj, StreamObject):
+                new = obj.__class__()
+                new._data = obj._data  # 인코딩된 원본 바이트 그대로 복사 (재압축 없음)
+                for k, v in dict.items(obj):
+                    if k != "/Length":
+                        new[NameObject(k)] = remap(v)
+                return new
+            if isinstance(obj, DictionaryObject):
+                new = DictionaryObject()
+                for k, v in dict.items(obj):
+                    new[NameObject(k)] = remap(v)
+                return new
+            if isinstance(obj, ArrayObject):
+                return ArrayObject(remap(v) for v in list.__iter__(obj))
+            return obj
+
+        new_page = DictionaryObject()
+        for k, v in dict.items(page):
+            if k != "/Parent":
+                new_page[NameObject(k)] = remap(v)
+        for key in INHERITABLE_PAGE_KEYS:
+            if key not in new_page:
+                inherited = self._inherited(page, key)
+                if inherited is not None:
+                    new_page[NameObject(key)] = remap(inherited)
+        new_page[NameObject("/Parent")] = IndirectObject(self.pages_id, 0, None)
+        self._write_object(page_num, new_page)
+
+        while pending:
+            num, ref = pending.pop()
+            self._write_object(num, remap(ref.get_object()))
+
+        self._kids.append(page_num)
+
+    @staticmethod
+    def _inherited(page: DictionaryObject, key: str):
+        node = page.get("/Parent")
+        while node is not None:
+            node = node.get_object()
+            if key in node:
+                return dict.__getitem__(node, key)
+            node = node.get("/Parent")
+        return None
+
+    def close(self) -> None:
+        """페이지 트리, 카탈로그, xref, 트레일러 기록"""
+        pages = DictionaryObject({
+            NameObject("/Type"): NameObject("/Pages"),
+            NameObject("/Kids"): ArrayObject(IndirectObject(n, 0, None) for n in self._kids),
+            NameObject("/Count"): NumberObject(len(self._kids)),
+        })
+        self._write_object(self.pages_id, pages)
+        catalog = DictionaryObject({
+            NameObject("/Type"): NameObject("/Catalog"),
+            NameObject("/Pages"): IndirectObject(self.pages_id, 0, None),
+        })
+        self._write_object(self.catalog_id, catalog)
+
+        xref_offset = self.stream.tell()
+        self.stream.write(f"xref\n0 {len(self._offsets)}\n".encode("ascii"))
+        self.stream.write(b"0000000000 65535 f \n")
+        for offset in self._offsets[1:]:
+            # 예약 후 기록되지 않은 번호는 free 로 표시
+            if offset is None:
+                self.stream.write(b"0000000000 00000 f \n")
+            else:
+                self.stream.write(f"{offset:010d} 00000 n \n".encode("ascii"))
+        self.stream.write(
+            f"trailer\n<< /Size {len(self._offsets)} /Root {self.catalog_id} 0 R >>\n"
+            f"startxref\n{xref_offset}\n%%EOF\n".encode("ascii")
+        )
+
+
+def stream_merge_pdfs(inputs: Iterable[Union[str, Path]], out_path: Union[str, Path]) -> int:
+    """입력 PDF 들의 모든 페이지를 순서대로 out_path 에 스트리밍 병합. 병합된 페이지 수 반환"""
+    out_path = Path(out_path)
+    tmp_path = out_path.with_name(out_path.name + ".part")
+    with open(tmp_path, "wb") as fh:
+        writer = StreamingPdfWriter(fh)
+        for path in inputs:
+            reader = PdfReader(str(path))
+            for page in reader.pages:
+                writer.add_page(page)
+            del reader
+        writer.close()
+    tmp_path.replace(out_path)
+    return writer.page_count
@@ -0,0 +1,292 @@
+"""
+Vectorized Page Preprocessing
+NumPy 배열 기반 페이지 전처리 엔진 (그레이스케일/대비/이진화/메디안 필터)
+
+모든 연산은 (..., H, W) uint8 배열을 받으므로 같은 크기 페이지를 (N, H, W) 로 쌓아
+한 번에 처리할 수 있고, 결과는 기존 PIL 파이프라인과 픽셀 단위로 동일하다.
+"""
+
+from typing import List, Sequence, Union
+
+import numpy as np
+from PIL import Image, ImageEnhance, ImageFilter, ImageOps
+
+ArrayOrImage = Union[np.ndarray, Image.Image]
+
+# 이진화 임계값 선택 방식 (fixed=고정 임계값, otsu=페이지별 Otsu, adaptive=지역 평균)
+BINARIZE_MODES = ("fixed", "otsu", "adaptive")
+ADAPTIVE_BLOCK_SIZE = 31
+ADAPTIVE_OFFSET = 10
+
+
+# ───────────── 변환 ─────────────
+def as_array(img: ArrayOrImage) -> np.ndarray:
+    """PIL 이미지/배열 → uint8 배열 ("L"/"RGB" 이미지는 변환 없이 그대로)"""
+    if isinstance(img, np.ndarray):
+        return img
+    if img.mode not in ("L", "RGB"):
+        img = img.convert("RGB")
+    return np.asarray(img)
+
+
+def to_gray(img: ArrayOrImage) -> np.ndarray:
+    """
+    RGB → L (ITU-R 601-2, PIL 과 같은 16비트 고정소수점 반올림)
+    연속 메모리 배열은 Image.frombuffer 로 복사 없이 감싸 PIL 의 C 변환 루틴을 그대로 사용
+    """
+    if isinstance(img, Image.Image):
+        return np.asarray(_gray_image(img))
+    arr = img
+    if arr.ndim < 3 or arr.shape[-1] != 3:
+        return arr
+    if arr.dtype == np.uint8 and arr.flags.c_contiguous:
+        rows = int(np.prod(arr.shape[:-2]))
+        flat = Image.frombuffer("RGB", (arr.shape[-2], rows), arr, "raw", "RGB", 0, 1)
+        return np.asarray(flat.convert("L")).reshape(arr.shape[:-1])
+    # L = (R*19595 + G*38470 + B*7471 + 0x8000) >> 16
+    r = arr[..., 0].astype(np.uint32)
+    r *= 19595
+    r += arr[..., 1].astype(np.uint32) * 38470
+    r += arr[..., 2].astype(np.uint32) * 7471
+    r += 0x8000
+    r >>= 16
+    return r.astype(np.uint8)
+
+
+def _gray_image(img: Image.Image) -> Image.Image:
+    if img.mode == "L":
+        return img
+    if img.mode in ("RGB", "RGBA"):
+        return img.convert("L")
+    return img.convert("RGB").convert("L")
+
+
+def to_image(arr: np.ndarray, binary: bool = False) -> Image.Image:
+    """배열 → PIL 이미지 (binary=True 면 "1" 모드)"""
+    if binary:
+        return Image.fromarray(arr > 0)
+    return Image.fromarray(arr, "L")
+
+
+# ───────────── 대비 ─────────────
+def _lut_page(page: np.ndarray, lut: np.ndarray) -> np.ndarray:
+    """단일 페이지 LUT 적용 (PIL 의 C point 루틴 사용, 입력 버퍼는 복사 없이 공유)"""
+    page = np.ascontiguousarray(page)
+    h, w = page.shape
+    view = Image.frombuffer("L", (w, h), page, "raw", "L", 0, 1)
+    return np.asarray(view.point(lut.tolist()))
+
+
+def _apply_lut(gray: np.ndarray, luts: np.ndarray) -> np.ndarray:
+    """페이지별 LUT 적용 (luts: (N, 256) 또는 (256,))"""
+    if luts.ndim == 1:
+        if gray.ndim == 2:
+            return _lut_page(gray, luts)
+        return luts[gray]
+    out = np.empty_like(gray)
+    for i in range(gray.shape[0]):
+        out[i] = _lut_page(gray[i], luts[i])
+    return out
+
+
+def _pages(gray: np.ndarray) -> np.ndarray:
+    """(H, W) 또는 (N, H, W) → (N, H*W)"""
+    return gray.reshape(-1, gray.shape[-2] * gray.shape[-1])
+
+
+def stretch_lut(lo: int, hi: int) -> np.ndarray:
+    """ImageOps.autocontrast (cutoff=0) 와 동일한 최소/최대 스트레칭 LUT"""
+    ix = np.arange(256, dtype=np.float64)
+    if hi <= lo:
+        lut = ix
+    else:
+        scale = 255.0 / (hi - lo)
+        lut = ix * scale - lo * scale
+    return np.clip(lut.astype(np.int64), 0, 255).astype(np.uint8)
+
+
+def autocontrast_lut(page: np.ndarray) -> np.ndarray:
+    """단일 페이지 autocontrast LUT"""
+    return stretch_lut(int(page.min()), int(page.max()))
+
+
+def enhance_contrast(gray: np.ndarray, factor: float = 1.5) -> np.ndarray:
+    """ImageEnhance.Contrast 와 동일: 페이지 평균(반올림) 기준 float32 블렌드 후 절삭"""
+    alpha = np.float32(factor)
+    luts = []
+    for page in _pages(gray):
+        hist = np.bincount(page, minlength=256)
+        mean = np.float32(int((hist * np.arange(256)).sum() / page.size + 0.5))
+        ix = np.arange(256, dtype=np.float32)
+        lut = mean + alpha * (ix - mean)
+        luts.append(np.clip(lut, 0, 255).astype(np.uint8))
+    return _apply_lut(gray, luts[0] if gray.ndim == 2 else np.stack(luts))
+
+
+# ───────────── 이진화 ─────────────
+def threshold_lut(threshold: int) -> np.ndarray:
+    return np.where(np.arange(256) < threshold, 0, 255).astype(np.uint8)
+
+
+def _otsu_from_hist(hist: np.ndarray) -> int:
+    """히스토그램 기준 Otsu 임계값 (클래스 간 분산 최대화)"""
+    hist = hist.astype(np.float64)
+    omega = np.cumsum(hist) / hist.sum()
+    mu = np.cumsum(hist * np.arange(256)) / hist.sum()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sigma_b = (mu[-1] * omega - mu) ** 2 / (omega * (1.0 - omega))
+    sigma_b = np.nan_to_num(sigma_b, nan=0.0, posinf=0.0)
+    # 값 <= k 가 어두운 클래스 → threshold_lut 의 "< threshold" 에 맞춰 +1
+    return int(np.argmax(sigma_b)) + 1
+
+
+def otsu_threshold(gray: np.ndarray) -> int:
+    """단일 페이지 Otsu 임계값"""
+    return _otsu_from_hist(np.bincount(gray.ravel(), minlength=256))
+
+
+def adaptive_threshold(gray: np.ndarray,
+                       block_size: int = ADAPTIVE_BLOCK_SIZE,
+                       offset: int = ADAPTIVE_OFFSET) -> np.ndarray:
+    """
+    지역 평균 적응형 이진화: 픽셀 < (block_size 창 평균 - offset) 이면 0
+    적분 영상으로 창 크기와 무관하게 O(HW), 가장자리는 창을 이미지 안으로 잘라 평균
+    (N, H, W) 입력은 페이지별로 처리해 적분 영상 버퍼를 한 페이지 크기로 유지
+    """
+    if gray.ndim == 3:
+        out = np.empty_like(gray)
+        for i in range(gray.shape[0]):
+            out[i] = adaptive_threshold(gray[i], block_size, offset)
+        return out
+
+    h, w = gray.shape
+    r = block_size // 2
+    integral = np.zeros((h + 1, w + 1), dtype=np.int64)
+    np.cumsum(np.cumsum(gray, axis=0, dtype=np.int64), axis=1, out=integral[1:, 1:])
+
+    y0 = np.clip(np.arange(h) - r, 0, h)
+    y1 = np.clip(np.arange(h) + r + 1, 0, h)
+    x0 = np.clip(np.arange(w) - r, 0, w)
+    x1 = np.clip(np.arange(w) + r + 1, 0, w)
+    sums = (integral[y1[:, None], x1[None, :]] - integral[y0[:, None], x1[None, :]]
+            - integral[y1[:, None], x0[None, :]] + integral[y0[:, None], x0[None, :]])
+    area = (y1 - y0)[:, None] * (x1 - x0)[None, :]
+    return np.where(gray.astype(np.int64) * area < sums - offset * area, np.uint8(0), np.uint8(255))
+
+
+# ───────────── 필터 ─────────────
+def median3(gray: np.ndarray) -> np.ndarray:
+    """
+    3x3 메디안 필터 (ImageFilter.MedianFilter(3) 와 동일, 가장자리 복제)
+    열마다 세로 3개를 정렬한 뒤 median = med(max(열 최소), med(열 중앙), min(열 최대))
+    """
+    pad = [(0, 0)] * (gray.ndim - 2) + [(1, 1), (1, 1)]
+    p = np.pad(gray, pad, mode="edge")
+    a, b, c = p[..., :-2, :], p[..., 1:-1, :], p[..., 2:, :]
+    lo, hi = np.minimum(a, b), np.maximum(a, b)
+    mid = np.minimum(hi, c)
+    hi = np.maximum(hi, c)
+    mid = np.maximum(lo, mid)
+    lo = np.minimum(lo, c)
+
+    def cols(x):
+        return x[..., :-2], x[..., 1:-1], x[..., 2:]
+
+    l0, l1, l2 = cols(lo)
+    m0, m1, m2 = cols(mid)
+    h0, h1, h2 = cols(hi)
+    max_lo = np.maximum(np.maximum(l0, l1), l2)
+    min_hi = np.minimum(np.minimum(h0, h1), h2)
+    med_mid = np.maximum(np.minimum(m0, m1), np.minimum(np.maximum(m0, m1), m2))
+    return _med3(max_lo, med_mid, min_hi)
+
+
+def _med3(a: np.ndarray, b: np.ndarray, c: np.ndarray) -> np.ndarray:
+    return np.maximum(np.minimum(a, b), np.minimum(np.maximum(a, b), c))
+
+
+# ───────────── 파이프라인 ─────────────
+def binarize_gray(gray: np.ndarray, threshold: int = 140, mode: str = "fixed") -> np.ndarray:
+    """
+    그레이스케일 (H, W) / (N, H, W) → autocontrast → 이진화 (0/255)
+    fixed/otsu 는 대비 스트레칭과 임계값을 페이지별 LUT 하나로 합쳐 픽셀을 한 번만 훑음
+    """
+    if mode not in BINARIZE_MODES:
+        raise ValueError(f"unknown binarize mode: {mode!r} (choose from {', '.join(BINARIZE_MODES)})")
+    stretch = [autocontrast_lut(page) for page in _pages(gray)]
+    if mode == "adaptive":
+        stretched = _apply_lut(gray, stretch[0] if gray.ndim == 2 else np.stack(stretch))
+        return adaptive_threshold(stretched)
+
+    luts = []
+    for page, lut in zip(_pages(gray), stretch):
+        t = threshold
+        if mode == "otsu":
+            # 스트레칭 후 히스토그램을 원본 히스토그램에서 바로 계산 (픽셀 재순회 없음)
+            hist = np.bincount(lut, weights=np.bincount(page, minlength=256), minlength=256)
+            t = _otsu_from_hist(hist)
+        luts.append(threshold_lut(t)[lut])
+    return _apply_lut(gray, luts[0] if gray.ndim == 2 else np.stack(luts))
+
+
+def binarize_page(img: ArrayOrImage, threshold: int = 140, mode: str = "fixed") -> np.ndarray:
+    """search_pdf 파이프라인: grayscale → autocontrast → 이진화 (mode: fixed/otsu/adaptive)"""
+    if isinstance(img, Image.Image) and mode == "fixed":
+        return np.asarray(binarize_image(img, threshold).convert("L"))
+    return binarize_gray(to_gray(img), threshold, mode)
+
+
+def binarize_image(img: Image.Image, threshold: int = 140) -> Image.Image:
+    """binarize_page 의 단일 PIL 페이지 버전: autocontrast+임계값을 LUT 1회로 적용해 "1" 모드 반환"""
+    gray = _gray_image(img)
+    lut = threshold_lut(threshold)[stretch_lut(*gray.getextrema())]
+    return gray.point(lut.tolist(), "1")
+
+
+def denoise_gray(gray: np.ndarray, factor: float = 1.5) -> np.ndarray:
+    """그레이스케일 (H, W) / (N, H, W) → 대비 강화 → 3x3 메디안"""
+    return median3(enhance_contrast(gray, factor))
+
+
+def denoise_page(img: ArrayOrImage, factor: float = 1.5) -> np.ndarray:
+    """ocr.py 파이프라인: grayscale → 대비 강화 → 3x3 메디안"""
+    return denoise_gray(to_gray(img), factor)
+
+
+def preprocess_batch(pages: Sequence[ArrayOrImage], pipeline=binarize_gray, **kwargs) -> List[np.ndarray]:
+    """
+    페이지 묶음 전처리: 같은 크기 페이지끼리 (N, H, W) 그레이스케일 버퍼 하나에 모아
+    pipeline(binarize_gray/denoise_gray) 을 묶음 단위로 한 번 실행
+    반환: 입력 순서대로 페이지별 (H, W) 배열 (결과 묶음 버퍼의 뷰)
+    """
+    out: List[np.ndarray] = [None] * len(pages)
+    groups = {}
+    for i, page in enumerate(pages):
+        arr = as_array(page)
+        groups.setdefault(arr.shape[:2], []).append((i, arr))
+    for (h, w), members in groups.items():
+        block = np.empty((len(members), h, w), dtype=np.uint8)
+        for n, (_, arr) in enumerate(members):
+            block[n] = to_gray(arr)
+        block = pipeline(block, **kwargs)
+        for n, (i, _) in enumerate(members):
+            out[i] = block[n]
+    return out
+
+
+# ───────────── 기준 구현 (PIL) ─────────────
+def reference_binarize_pil(img: Image.Image, threshold: int = 140) -> Image.Image:
+    """기존 search_pdf.preprocess 와 동일한 PIL 구현 (동등성 테스트/벤치마크 기준)"""
+    img = ImageOps.grayscale(img)
+    img = ImageOps.autocontrast(img)
+    return img.point(lambda x: 0 if x < threshold else 255, "1")
+
+
+def reference_denoise_pil(img: Image.Image, factor: float = 1.5) -> Image.Image:
+    """기존 ocr.preprocess_image 와 동일한 PIL 구현 (동등성 테스트/벤치마크 기준)"""
+    if img.mode != "RGB":
+        img = img.convert("RGB")
+    gray = img.convert("L")
+    enhanced = ImageEnhance.Contrast(gray).enhance(factor)
+    return enhanced.filter(ImageFilter.MedianFilter(size=3))
+
@@ -0,0 +1,159 @@
+"""
+Task Progress Hub
+OCR 태스크 진행률 pub/sub (SSE/WebSocket 구독, 워커 프로세스 → 웹 프로세스 중계)
+"""
+
+import asyncio
+import logging
+import multiprocessing as mp
+import threading
+from typing import AsyncIterator, Callable, Dict, Optional
+
+TERMINAL_STATUSES = {"completed", "failed", "cancelled"}
+
+
+class _Topic:
+    """태스크 하나의 최신 진행 상태 (구독자들이 공유)"""
+
+    __slots__ = ("event", "version", "closed", "subscribers", "changed")
+
+    def __init__(self):
+        self.event: Optional[Dict] = None
+        self.version = 0
+        self.closed = False
+        self.subscribers = 0
+        self.changed = asyncio.Event()
+
+
+class ProgressHub:
+    """
+    태스크별 진행률 pub/sub
+
+    - 발행 시 구독자마다 큐에 복사하지 않고 태스크별 최신 이벤트 하나만 교체한 뒤 공유 Event 로 깨운다.
+      구독자 수와 무관하게 발행 비용이 O(1) 이고, 느린 구독자는 중간 이벤트를 건너뛰고 최신 상태를 받는다
+    - 새 구독자는 현재 상태를 즉시 받는다
+    - 종료 상태(completed/failed/cancelled) 이벤트 뒤에는 스트림이 끝나고, 구독자가 없으면 토픽을 지운다
+    - 이벤트 루프 스레드에서만 사용 (다른 스레드는 loop.call_soon_threadsafe 로 publish)
+    """
+
+    def __init__(self):
+        self._topics: Dict[str, _Topic] = {}
+
+    def __len__(self) -> int:
+        return len(self._topics)
+
+    def publish(self, task_id: str, event: Dict) -> None:
+        topic = self._topics.get(task_id)
+        if topic is None:
+            topic = self._topics[task_id] = _Topic()
+        topic.event = event
+        topic.version += 1
+        topic.closed = event.get("status") in TERMINAL_STATUSES
+        changed, topic.changed = topic.changed, asyncio.Event()
+        changed.set()
+        if topic.closed and topic.subscribers == 0:
+            del self._topics[task_id]
+
+    def latest(self, task_id: str) -> Optional[Dict]:
+        topic = self._topics.get(task_id)
+        return topic.event if topic else None
+
+    def subscriber_count(self, task_id: Optional[str] = None) -> int:
+        if task_id is not None:
+            topic = self._topics.get(task_id)
+            return topic.subscribers if topic else 0
+        return sum(t.subscribers for t in self._topics.values())
+
+    async def subscribe(self, task_id: str, initial: Optional[Dict] = None,
+                        heartbeat: Optional[float] = None) -> AsyncIterator[Optional[Dict]]:
+        """진행 이벤트를 생성 (heartbeat 초 동안 변화가 없으면 None 을 생성)
+
+        initial 은 아직 발행된 이벤트가 없을 때 먼저 보낼 현재 상태 (예: 저장소의 태스크 상태)
+        """
+        topic = self._topics.get(task_id)
+        if topic is None:
+            if initial is not None and initial.get("status") in TERMINAL_STATUSES:
+                yield initial
+                return
+            topic = self._topics[task_id] = _Topic()
+        topic.subscribers += 1
+        seen = 0
+        try:
+            if topic.event is None and initial is not None:
+                yield initial
+            while True:
+                if topic.version != seen:
+                    seen = topic.version
+                    yield topic.event
+                    if topic.closed:
+                        return
+                    continue
+                try:
+                    await asyncio.wait_for(topic.changed.wait(), heartbeat)
+                except asyncio.TimeoutError:
+                    yield None
+        finally:
+            topic.subscribers -= 1
+            if topic.subscribers == 0 and (topic.closed or topic.event is None):
+                if self._topics.get(task_id) is topic:
+                    del self._topics[task_id]
+
+
+# ───────── 워커 프로세스 → 웹 프로세스 중계 ─────────
+
+_WORKER_QUEUE = None
+
+
+def init_progress_worker(queue) -> None:
+    """워커 프로세스 초기화 함수 (ProcessPoolExecutor initializer)"""
+    global _WORKER_QUEUE
+    _WORKER_QUEUE = queue
+
+
+def progress_reporter(task_id: str) -> Callable[[Dict], None]:
+    """워커 안에서 쓰는 진행 콜백 (중계 큐가 없으면 아무것도 하지 않음)"""
+    def report(event: Dict) -> None:
+        if _WORKER_QUEUE is not None:
+            try:
+                _WORKER_QUEUE.put((task_id, event))
+            except Exception as e:
+                logging.debug(f"진행 이벤트 전송 실패 {task_id}: {e}")
+    return report
+
+
+class ProgressRelay:
+    """
+    워커 프로세스들이 공유하는 큐를 읽어 이벤트 루프의 핸들러로 넘기는 중계기
+
+    큐는 워커 풀 생성 시 initializer 인자로 넘긴다 (init_progress_worker).
+    """
+
+    _STOP = None
+
+    def __init__(self, handler: Callable[[str, Dict], None]):
+        self.handler = handler
+        self.queue = mp.get_context().SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def start(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._loop = loop
+        self._thread = threading.Thread(target=self._run, name="progress-relay", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            item = self.queue.get()
+            if item is self._STOP:
+                return
+            task_id, event = item
+            try:
+                self._loop.call_soon_threadsafe(self.handler, task_id, event)
+            except RuntimeError:
+                return  # 루프 종료됨
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self.queue.put(self._STOP)
+            self._thread.join(timeout=5)
+            self._thread = None
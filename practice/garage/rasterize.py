@@ -0,0 +1,95 @@
+"""
+Streaming PDF Rasterization
+문서를 한 번만 열고 페이지 이미지를 하나씩 내보내는 래스터화 단계
+"""
+
+import os
+import tempfile
+from pathlib import Path
+from typing import Iterator, List, Tuple, Union
+
+import numpy as np
+from PIL import Image
+from pdf2image import convert_from_path
+from pypdf import PdfReader
+
+try:
+    import pymupdf as fitz  # PyMuPDF (선택 의존성)
+except ImportError:
+    try:
+        import fitz
+    except ImportError:
+        fitz = None
+
+
+def get_page_count(pdf_path: Union[str, Path]) -> int:
+    """PDF 페이지 수 (렌더링 없이 구조만 읽음)"""
+    if fitz is not None:
+        with fitz.open(str(pdf_path)) as doc:
+            return doc.page_count
+    return len(PdfReader(str(pdf_path)).pages)
+
+
+def iter_page_images(pdf_path: Union[str, Path],
+                     first_page: int,
+                     last_page: int,
+                     dpi: int) -> Iterator[Tuple[int, Image.Image]]:
+    """
+    [first_page, last_page] 범위(1-based)를 순서대로 (페이지번호, 이미지) 로 내보냄.
+
+    - PyMuPDF 가 있으면 문서를 한 번 열고 페이지마다 픽스맵을 렌더링
+    - 없으면 pdftoppm 을 범위 전체에 대해 한 번만 실행해 임시 폴더에 쓰고,
+      파일을 하나씩 열어 넘긴 뒤 바로 삭제 (메모리에는 항상 한 페이지만 유지)
+    """
+    if fitz is not None:
+        with fitz.open(str(pdf_path)) as doc:
+            for page_no in range(first_page, last_page + 1):
+                pix = doc[page_no - 1].get_pixmap(dpi=dpi)
+                img = Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
+                del pix
+                yield page_no, img
+        return
+
+    with tempfile.TemporaryDirectory(prefix="raster_") as tmp:
+        paths = convert_from_path(str(pdf_path), dpi=dpi, first_page=first_page, last_page=last_page,
+                                  output_folder=tmp, paths_only=True)
+        for offset, path in enumerate(sorted(paths)):
+            with Image.open(path) as im:
+                im.load()
+                img = im.copy()
+            os.unlink(path)
+            yield first_page + offset, img
+
+
+def iter_page_arrays(pdf_path: Union[str, Path],
+                     first_page: int,
+                     last_page: int,
+                     dpi: int) -> Iterator[Tuple[int, np.ndarray]]:
+    """
+    iter_page_images 의 배열 버전: (페이지번호, (H, W, 3) uint8 배열)
+    PyMuPDF 픽스맵 샘플 버퍼를 그대로 배열로 감싸 중간 PIL 이미지를 만들지 않음 (전처리 엔진 입력용)
+    """
+    if fitz is not None:
+        with fitz.open(str(pdf_path)) as doc:
+            for page_no in range(first_page, last_page + 1):
+                pix = doc[page_no - 1].get_pixmap(dpi=dpi, alpha=False)
+                arr = np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.height, pix.width, pix.n)
+                del pix
+                yield page_no, arr
+        return
+
+    for page_no, img in iter_page_images(pdf_path, first_page, last_page, dpi):
+        yield page_no, np.asarray(img.convert("RGB"))
+
+
+def chunk_page_ranges(pages: List[int], chunk_size: int) -> List[Tuple[int, int]]:
+    """정렬된 페이지 목록을 최대 chunk_size 의 연속 구간 (first, last) 으로 분할"""
+    ranges: List[Tuple[int, int]] = []
+    for page in sorted(pages):
+        if ranges:
+            first, last = ranges[-1]
+            if page == last + 1 and last - first + 1 < chunk_size:
+                ranges[-1] = (first, page)
+                continue
+        ranges.append((page, page))
+    return ranges
@@ -0,0 +1,251 @@
+"""
+Rate Limiting
+토큰 버킷 요청 제한 (순수 ASGI 미들웨어, 메모리 LRU / SQLite 공유 백엔드)
+"""
+
+import asyncio
+import hashlib
+import hmac
+import json
+import math
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Tuple, Union
+
+
+def client_key_from_scope(scope, api_key: Optional[str] = None) -> str:
+    """
+    제한/스케줄링 단위: 설정된 API 키와 일치하는 Bearer 토큰이면 키 해시, 아니면 클라이언트 IP
+
+    검증되지 않은 토큰으로 키를 나누면 요청마다 토큰을 바꿔 새 버킷을 받을 수 있으므로
+    api_key 가 없거나 토큰이 다르면 항상 IP 로 묶는다.
+    """
+    if api_key:
+        for name, value in scope.get("headers", ()):
+            if name == b"authorization":
+                authorization = value.decode("latin-1")
+                token = authorization[7:] if authorization.lower().startswith("bearer ") else ""
+                if hmac.compare_digest(token.encode("latin-1"), api_key.encode("latin-1", "replace")):
+                    return "key:" + hashlib.sha256(token.encode("latin-1")).hexdigest()[:16]
+                break
+    client = scope.get("client")
+    return "ip:" + (client[0] if client else "unknown")
+
+
+class TokenBucketLimiter:
+    """
+    클라이언트별 토큰 버킷 (프로세스 메모리)
+
+    버킷은 (남은 토큰, 마지막 갱신 시각) 두 값뿐이고 요청마다 경과 시간만큼 채운 뒤 1개를 쓰므로 O(1).
+    버킷은 LRU 로 max_clients 개까지만 유지한다. 밀려난 클라이언트는 다음 요청 때 가득 찬 버킷으로
+    다시 시작하는데, 오래 쉰 클라이언트의 버킷은 어차피 가득 차 있으므로 결과가 같다.
+    """
+
+    blocking = False
+
+    def __init__(self, requests_per_minute: int = 60, burst: Optional[int] = None, max_clients: int = 10000):
+        self.rate = requests_per_minute / 60.0  # 초당 충전 토큰
+        self.capacity = float(burst or requests_per_minute)
+        self.max_clients = max_clients
+        self._buckets: "OrderedDict[str, list]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def acquire(self, key: str, now: Optional[float] = None) -> Tuple[bool, float]:
+        """토큰 1개 사용 시도 → (허용 여부, 다음 토큰까지 남은 초)"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = [self.capacity, now]
+                if len(self._buckets) > self.max_clients:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+                bucket[0] = min(self.capacity, bucket[0] + (now - bucket[1]) * self.rate)
+                bucket[1] = now
+            if bucket[0] >= 1.0:
+                bucket[0] -= 1.0
+                return True, 0.0
+            return False, (1.0 - bucket[0]) / self.rate
+
+
+class SQLiteTokenBucketLimiter:
+    """
+    SQLite 공유 토큰 버킷 (같은 호스트의 여러 uvicorn 워커가 한 제한을 공유)
+
+    버킷 갱신은 BEGIN IMMEDIATE 트랜잭션 하나로 읽기/쓰기 하므로 워커 간 경합에도 일관된다.
+    완전히 다시 찬 버킷은 prune_every 번 요청마다 삭제해 테이블 크기를 제한한다.
+    시각은 프로세스 간에 공유되어야 하므로 time.time() 을 쓴다.
+    """
+
+    blocking = True  # 미들웨어가 스레드에서 호출
+
+    def __init__(self, path: Union[str, Path], requests_per_minute: int = 60,
+                 burst: Optional[int] = None, prune_every: int = 1000):
+        self.rate = requests_per_minute / 60.0
+        self.capacity = float(burst or requests_per_minute)
+        self.prune_every = prune_every
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None, timeout=5)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS buckets (key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+        )
+        self._lock = threading.Lock()
+        self._calls = 0
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM buckets").fetchone()[0]
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM buckets")
+
+    def acquire(self, key: str, now: Optional[float] = None) -> Tuple[bool, float]:
+        now = time.time() if now is None else now
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute("SELECT tokens, updated FROM buckets WHERE key = ?", (key,)).fetchone()
+                tokens = self.capacity if row is None else min(self.capacity, row[0] + max(0.0, now - row[1]) * self.rate)
+                allowed = tokens >= 1.0
+                if allowed:
+                    tokens -= 1.0
+                self._conn.execute(
+                    "INSERT INTO buckets (key, tokens, updated) VALUES (?, ?, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET tokens = excluded.tokens, updated = excluded.updated",
+                    (key, tokens, now),
+                )
+                self._calls += 1
+                if self._calls % self.prune_every == 0:
+                    self._conn.execute("DELETE FROM buckets WHERE updated < ?", (now - self.capacity / self.rate,))
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return (True, 0.0) if allowed else (False, (1.0 - tokens) / self.rate)
+
+
+def create_limiter(requests_per_minute: int = 60, burst: Optional[int] = None, backend: str = "memory",
+                   db_path: Optional[Union[str, Path]] = None, max_clients: int = 10000):
+    """설정값으로 제한기 생성 (backend: "memory" | "sqlite"), 잘못된 값이면 ValueError"""
+    if not isinstance(requests_per_minute, int) or requests_per_minute <= 0:
+        raise ValueError(f"requests_per_minute must be a positive integer: {requests_per_minute!r}")
+    if burst is not None and (not isinstance(burst, int) or burst <= 0):
+        raise ValueError(f"rate limit burst must be a positive integer: {burst!r}")
+    if backend == "memory":
+        return TokenBucketLimiter(requests_per_minute, burst, max_clients)
+    if backend == "sqlite":
+        if db_path is None:
+            raise ValueError("sqlite rate limit backend requires a db_path")
+        return SQLiteTokenBucketLimiter(db_path, requests_per_minute, burst)
+    raise ValueError(f"unknown rate limit backend: {backend}")
+
+
+class RateLimiter:
+    """
+    요청 제한 정책 (켜짐 여부 + 토큰 버킷 백엔드 + 클라이언트 키)
+
+    미들웨어는 앱을 만들 때 등록되지만 설정은 앱 시작(lifespan) 때 로드되므로,
+    같은 RateLimiter 를 미들웨어에 넘겨 두고 시작 시 configure_from_settings 로 교체한다.
+    """
+
+    def __init__(self, requests_per_minute: int = 60, burst: Optional[int] = None, max_clients: int = 10000,
+                 backend: str = "memory", db_path: Optional[Union[str, Path]] = None,
+                 enabled: bool = True, api_key: Optional[str] = None):
+        self.buckets = None
+        self.configure(requests_per_minute, burst, max_clients, backend, db_path, enabled, api_key)
+
+    def configure(self, requests_per_minute: int = 60, burst: Optional[int] = None, max_clients: int = 10000,
+                  backend: str = "memory", db_path: Optional[Union[str, Path]] = None,
+                  enabled: bool = True, api_key: Optional[str] = None) -> None:
+        """제한기 교체 (새 설정이 잘못되면 ValueError, 기존 제한기는 그대로 유지)"""
+        buckets = create_limiter(requests_per_minute, burst, backend, db_path, max_clients)
+        self.close()
+        self.buckets = buckets
+        self.enabled = enabled
+        self.api_key = api_key
+        self._params = (requests_per_minute, burst, max_clients, backend, db_path, enabled, api_key)
+
+    def configure_from_settings(self, settings) -> None:
+        """APISettings 의 rate_limit_* / requests_per_minute / api_key 로 구성"""
+        self.configure(
+            settings.requests_per_minute,
+            settings.rate_limit_burst or None,
+            settings.rate_limit_max_clients,
+            settings.rate_limit_backend,
+            settings.rate_limit_db_path,
+            settings.rate_limit_enabled,
+            settings.api_key,
+        )
+
+    def reset(self) -> None:
+        """같은 설정으로 버킷 상태 초기화 (테스트용, SQLite 백엔드는 공유 테이블을 비움)"""
+        if isinstance(self.buckets, SQLiteTokenBucketLimiter):
+            self.buckets.clear()
+        else:
+            self.configure(*self._params)
+
+    def close(self) -> None:
+        if isinstance(self.buckets, SQLiteTokenBucketLimiter):
+            self.buckets.close()
+
+    async def check(self, scope) -> Tuple[bool, float]:
+        """요청 1건 허용 여부 → (허용 여부, 다음 토큰까지 남은 초)"""
+        if not self.enabled:
+            return True, 0.0
+        buckets = self.buckets
+        key = client_key_from_scope(scope, self.api_key)
+        if buckets.blocking:
+            return await asyncio.to_thread(buckets.acquire, key)
+        return buckets.acquire(key)
+
+
+class RateLimitMiddleware:
+    """
+    요청 제한 ASGI 미들웨어
+
+    BaseHTTPMiddleware 를 거치지 않고 scope/receive/send 를 그대로 넘기므로 요청당 추가 비용은
+    키 계산과 버킷 갱신뿐이다. 제한을 넘으면 429 + Retry-After.
+
+    limiter 를 주면 그 RateLimiter 를 공유하고(앱 시작 후 재구성 가능),
+    없으면 나머지 인자로 전용 RateLimiter 를 만든다.
+    """
+
+    def __init__(self, app, requests_per_minute: int = 60, burst: Optional[int] = None,
+                 max_clients: int = 10000, backend: str = "memory", db_path: Optional[Union[str, Path]] = None,
+                 api_key: Optional[str] = None, limiter: Optional[RateLimiter] = None):
+        self.app = app
+        self.limiter = limiter or RateLimiter(requests_per_minute, burst, max_clients, backend, db_path,
+                                              api_key=api_key)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        allowed, retry_after = await self.limiter.check(scope)
+        if allowed:
+            await self.app(scope, receive, send)
+            return
+
+        body = json.dumps({"detail": "Rate limit exceeded. Try again later."}).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [(b"content-type", b"application/json"),
+                        (b"content-length", str(len(body)).encode()),
+                        (b"retry-after", str(max(1, math.ceil(retry_after))).encode())],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -1,12 +1,11 @@
 import argparse, os, json, logging, math
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple
+from typing import Callable, List, Dict, Optional, Tuple
 from io import BytesIO
 from concurrent.futures import ProcessPoolExecutor, as_completed
 
 import pytesseract
-from PIL import Image, ImageOps
-from pdf2image import convert_from_path
+from PIL import Image
 from pypdf import PdfReader, PdfWriter
 from tqdm import tqdm
 
@@ -18,6 +17,15 @@ try:
 except Exception:
     lang_detect = None
 
+from config import load_config
+from ocr_cache import DpiChoiceStore, file_fingerprint, get_page_cache
+from pdf_merge import stream_merge_pdfs
+from preprocess import BINARIZE_MODES, binarize_gray, binarize_image, binarize_page, preprocess_batch, to_gray, to_image
+from rasterize import chunk_page_ranges, get_page_count, iter_page_arrays, iter_page_images
+
+# 캐시 키에 포함되는 전처리 파이프라인 식별자 (preprocess 변경 시 함께 갱신)
+PREPROCESS_SIGNATURE = {"pipeline": "grayscale+autocontrast+binarize", "threshold": 140}
+
 
 # ───────────── 로깅 ─────────────
 def setup_logger(outdir: Path):
@@ -33,22 +41,54 @@ def setup_logger(outdir: Path):
 
 
 # ───────────── 전처리 ─────────────
-def preprocess(img: Image.Image) -> Image.Image:
-    img = ImageOps.grayscale(img)
-    img = ImageOps.autocontrast(img)
-    # 단순 이진화(문서에 따라 130~170 사이 조정해도 좋음)
-    img = img.point(lambda x: 0 if x < 140 else 255, "1")
-    return img
+def preprocess_signature(binarize_mode: str = "fixed") -> Dict:
+    """캐시 키용 전처리 식별자 (fixed 는 기존 키 유지)"""
+    if binarize_mode == "fixed":
+        return PREPROCESS_SIGNATURE
+    return {**PREPROCESS_SIGNATURE, "mode": binarize_mode}
+
+
+def preprocess(img: Image.Image, binarize_mode: str = "fixed") -> Image.Image:
+    # grayscale → autocontrast → 이진화 (fixed: 고정 임계값, 문서에 따라 130~170 사이 조정해도 좋음 /
+    # otsu: 페이지별 자동 임계값 / adaptive: 조명이 고르지 않은 스캔용 지역 평균)
+    # fixed 는 대비 스트레칭과 임계값을 LUT 한 번으로 합쳐 적용 (기존 단계별 결과와 픽셀 동일)
+    if binarize_mode == "fixed":
+        return binarize_image(img, threshold=PREPROCESS_SIGNATURE["threshold"])
+    return to_image(binarize_page(img, PREPROCESS_SIGNATURE["threshold"], binarize_mode), binary=True)
+
+
+def preprocess_pages(pages: List, binarize_mode: str = "fixed") -> List[Image.Image]:
+    """래스터 배열 묶음을 (N, H, W) 단위로 한 번에 이진화 (preprocess 와 픽셀 동일)"""
+    batch = preprocess_batch(pages, binarize_gray, threshold=PREPROCESS_SIGNATURE["threshold"], mode=binarize_mode)
+    return [to_image(page, binary=True) for page in batch]
 
 
 # ───────────── 언어자동감지(옵션) ─────────────
+# langdetect 코드 → Tesseract 언어 코드
+LANGDETECT_TO_TESSERACT = {
+    "en": "eng", "ko": "kor", "ja": "jpn", "zh-cn": "chi_sim", "zh-tw": "chi_tra",
+    "de": "deu", "fr": "fra", "es": "spa", "it": "ita", "pt": "por", "ru": "rus",
+}
+
+# 언어 감지는 글자 모양만 알아보면 되므로 축소본으로 OCR (긴 변 기준 픽셀)
+LANG_PROBE_MAX_SIDE = 1600
+
+
+def make_lang_probe_image(img: Image.Image, max_side: int = LANG_PROBE_MAX_SIDE) -> Image.Image:
+    if max(img.size) <= max_side:
+        return img
+    probe = img.convert("L") if img.mode == "1" else img.copy()
+    probe.thumbnail((max_side, max_side), Image.LANCZOS)
+    return probe
+
+
 def detect_language_from_image(img: Image.Image, fallback: str = "eng") -> str:
     if lang_detect is None:
         return fallback
     try:
-        temp = pytesseract.image_to_string(img, lang=fallback)
+        temp = pytesseract.image_to_string(make_lang_probe_image(img), lang=fallback)
         if temp.strip():
-            return lang_detect(temp)
+            return LANGDETECT_TO_TESSERACT.get(lang_detect(temp), fallback)
         return fallback
     except Exception:
         return fallback
@@ -58,10 +98,9 @@ def detect_language_from_image(img: Image.Image, fallback: str = "eng") -> str:
 def image_to_pdf_bytes(img: Image.Image, lang: str) -> bytes:
     return pytesseract.image_to_pdf_or_hocr(img, lang=lang, extension="pdf")
 
-def image_to_words(img: Image.Image, lang: str, conf_threshold: int) -> List[Dict]:
-    data = pytesseract.image_to_data(img, lang=lang, output_type=pytesseract.Output.DICT)
+def data_to_words(data: Dict, conf_threshold: int) -> List[Dict]:
     out = []
-    n = len(data["text"])
+    n = len(data["text"]) if data else 0
     for i in range(n):
         word = (data["text"][i] or "").strip()
         try:
@@ -81,33 +120,156 @@ def image_to_words(img: Image.Image, lang: str, conf_threshold: int) -> List[Dic
             })
     return out
 
+def image_to_words(img: Image.Image, lang: str, conf_threshold: int) -> List[Dict]:
+    data = pytesseract.image_to_data(img, lang=lang, output_type=pytesseract.Output.DICT)
+    return data_to_words(data, conf_threshold)
+
+def image_to_pdf_and_words(img: Image.Image, lang: str, conf_threshold: int) -> Tuple[bytes, List[Dict]]:
+    """tesseract 1회 실행으로 PDF 레이어와 TSV(단어/신뢰도/좌표)를 함께 생성"""
+    pdf_bytes, tsv = pytesseract.run_and_get_multiple_output(img, extensions=["pdf", "tsv"], lang=lang)
+    data = pytesseract.pytesseract.file_to_dict(tsv, "\t", -1)
+    return pdf_bytes, data_to_words(data, conf_threshold)
+
+
+# ───────────── 캐시를 거치는 페이지 OCR ─────────────
+def lookup_page_cache(cache, img, dpi: int, lang_opt: str, conf: int, need_words: bool,
+                      binarize_mode: str = "fixed") -> Tuple[Optional[str], Optional[Dict]]:
+    """원본 래스터(이미지 또는 배열) 기준 캐시 조회 → (키, 적중 엔트리 또는 None), 캐시 비활성 시 (None, None)"""
+    if cache is None:
+        return None, None
+    key = cache.make_key(img, dpi, lang_opt, conf, preprocess_signature(binarize_mode))
+    return key, cache.get(key, require_pdf=True, require_words=need_words)
+
+
+def ocr_preprocessed(pre: Image.Image,
+                     lang_opt: str,
+                     conf: int,
+                     need_words: bool,
+                     cache=None,
+                     key: Optional[str] = None) -> Tuple[bytes, str, Optional[List[Dict]]]:
+    """
+    전처리된 페이지 OCR (필요 시 언어 감지) 후 원본 래스터 키로 캐시에 기록
+    반환: (페이지 PDF 바이트, 사용 언어, 단어 목록 또는 None)
+    """
+    lang = lang_opt
+    if lang_opt == "auto":
+        lang = detect_language_from_image(pre, fallback="eng")
+
+    if need_words:
+        page_pdf, words = image_to_pdf_and_words(pre, lang=lang, conf_threshold=conf)
+    else:
+        page_pdf, words = image_to_pdf_bytes(pre, lang=lang), None
+
+    if cache is not None and key is not None:
+        try:
+            cache.put(key, lang, pdf=page_pdf, words=words)
+        except OSError as e:
+            logging.warning(f"OCR cache write failed: {e}")
+
+    return page_pdf, lang, words
+
+
+def ocr_image_cached(img: Image.Image,
+                     dpi: int,
+                     lang_opt: str,
+                     conf: int,
+                     need_words: bool,
+                     cache_settings=None,
+                     binarize_mode: str = "fixed") -> Tuple[bytes, str, Optional[List[Dict]]]:
+    """
+    원본 래스터 기준 캐시 조회 → 미스일 때만 전처리/OCR 수행
+    반환: (페이지 PDF 바이트, 사용 언어, 단어 목록 또는 None)
+    """
+    cache = get_page_cache(cache_settings)
+    key, hit = lookup_page_cache(cache, img, dpi, lang_opt, conf, need_words, binarize_mode)
+    if hit is not None:
+        return hit["pdf"], hit["lang"], hit["words"]
+    return ocr_preprocessed(preprocess(img, binarize_mode), lang_opt, conf, need_words, cache, key)
+
 
 # ───────────── DPI 자동 선택(샘플 페이지 텍스트량 기준) ─────────────
-def pick_best_dpi(pdf_path: Path, candidates: List[int], lang: str, conf: int, sample_pages: int = 2) -> int:
+# 다음 DPI 의 단어 수 증가율이 이 값보다 작으면 더 높은 DPI 는 보지 않음
+DPI_MIN_GAIN = 0.03
+
+
+def sample_page_numbers(total_pages: int, sample_pages: int) -> List[int]:
+    """문서 전체에 고르게 퍼진 샘플 페이지 번호 (1-based, 각 구간의 가운데)"""
+    n = max(1, min(sample_pages, total_pages))
+    return sorted({int((k + 0.5) * total_pages / n) + 1 for k in range(n)})
+
+
+def probe_dpi_worker(pdf_path: str, page: int, dpi: int, lang_opt: str, conf: int, cache_settings=None,
+                     binarize_mode: str = "fixed") -> int:
+    """
+    샘플 페이지 1장을 해당 DPI 로 OCR 해 단어 수 반환
+    (본 처리와 같은 키로 캐시에 기록되므로 선택된 DPI 의 샘플 페이지는 재OCR 하지 않음)
+    """
+    try:
+        for _, img in iter_page_images(pdf_path, page, page, dpi):
+            _, _, words = ocr_image_cached(img, dpi, lang_opt, conf, True, cache_settings, binarize_mode)
+            return len(words or [])
+    except Exception:
+        pass
+    return 0
+
+
+def pick_best_dpi(pdf_path: Path,
+                  candidates: List[int],
+                  lang: str,
+                  conf: int,
+                  sample_pages: int = 3,
+                  workers: Optional[int] = None,
+                  total_pages: Optional[int] = None,
+                  cache_settings=None,
+                  min_gain: float = DPI_MIN_GAIN,
+                  binarize_mode: str = "fixed") -> int:
+    """
+    후보 DPI × 샘플 페이지를 프로세스 풀에서 병렬로 프로브하고,
+    낮은 DPI 부터 점수를 확인하다 단어 수 증가가 min_gain 미만이면 조기 종료 (남은 작업 취소).
+    결과는 문서 지문별로 저장해 다음 실행에서는 프로브를 건너뜀.
+    """
+    candidates = sorted(set(candidates))
+    store = DpiChoiceStore.from_settings(cache_settings)
+    key = None
+    if store is not None:
+        key = store.make_key(file_fingerprint(pdf_path), candidates, lang, conf)
+        cached = store.get(key)
+        if cached is not None:
+            logging.info(f"Auto-DPI reused for this document: {cached}")
+            return cached
+
+    if total_pages is None:
+        total_pages = get_pdf_num_pages(pdf_path)
+    pages = sample_page_numbers(total_pages, sample_pages)
+
     best, best_score = candidates[0], -1
-    # 앞쪽 몇 페이지만 샘플링
-    with tqdm(total=min(sample_pages, get_pdf_num_pages(pdf_path)), desc="🔎 Auto-DPI probe", unit="page") as bar:
-        page_idx = 1
-        for _ in range(min(sample_pages, get_pdf_num_pages(pdf_path))):
+    scores: Dict[int, int] = {}
+    ex = ProcessPoolExecutor(max_workers=min(workers or os.cpu_count() or 4, len(candidates) * len(pages)))
+    try:
+        # 낮은 DPI 작업부터 제출 → 조기 종료 시 높은 DPI 작업은 시작 전에 취소됨
+        futures = {
+            dpi: [ex.submit(probe_dpi_worker, str(pdf_path), page, dpi, lang, conf, cache_settings, binarize_mode)
+                  for page in pages]
+            for dpi in candidates
+        }
+        with tqdm(total=len(candidates), desc="🔎 Auto-DPI probe", unit="dpi") as bar:
             for dpi in candidates:
-                try:
-                    imgs = convert_from_path(str(pdf_path), dpi=dpi, first_page=page_idx, last_page=page_idx)
-                    if not imgs:
-                        continue
-                    pre = preprocess(imgs[0])
-                    words = image_to_words(pre, lang=lang, conf_threshold=conf)
-                    score = len(words)
-                    if score > best_score:
-                        best_score, best = score, dpi
-                except Exception:
-                    pass
-            page_idx += 1
-            bar.update(1)
+                score = sum(f.result() for f in futures[dpi])
+                scores[dpi] = score
+                bar.update(1)
+                if best_score >= 0 and score <= best_score * (1 + min_gain):
+                    break
+                best, best_score = dpi, score
+    finally:
+        ex.shutdown(wait=True, cancel_futures=True)
+
+    logging.info(f"Auto-DPI probe pages={pages} scores={scores}")
+    if store is not None:
+        store.put(key, best, scores)
     return best
 
 def get_pdf_num_pages(pdf_path: Path) -> int:
-    r = PdfReader(str(pdf_path))
-    return len(r.pages)
+    return get_page_count(pdf_path)
 
 
 # ───────────── 체크포인트 매니페스트 ─────────────
@@ -125,74 +287,239 @@ def load_or_init_manifest(ckpt_dir: Path, pdf_path: Path, dpi: int, lang_opt: st
         "total_pages": total_pages,
         "completed_pages": []  # 1-based indices
     }
-    manifest_path.write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8")
+    save_manifest(ckpt_dir, manifest)
     return manifest
 
-def save_manifest(ckpt_dir: Path, manifest: Dict):
-    (ckpt_dir / "manifest.json").write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8")
+def save_manifest(ckpt_dir: Path, manifest: Dict, durable: bool = False):
+    """임시 파일에 쓴 뒤 교체 (쓰기 도중 중단돼도 이전 매니페스트 유지)"""
+    manifest_path = ckpt_dir / "manifest.json"
+    tmp = manifest_path.with_name("manifest.json.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+        if durable:
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(tmp, manifest_path)
+
+
+class ProgressJournal:
+    """
+    페이지 완료 기록용 append-only 저널 (JSON Lines, 한 줄 = 완료된 페이지 1개)
+
+    - 기록: 한 줄 추가 + flush → 페이지 수와 무관하게 O(1)
+    - 복구: 줄 단위로 읽고, 충돌로 잘린 마지막 줄은 버린 뒤 파일 끝을 줄 경계로 되돌림
+    - 압축: 저널 내용을 매니페스트의 completed_pages 로 합치고 저널 삭제
+    """
+
+    FILENAME = "progress.jsonl"
+
+    def __init__(self, ckpt_dir: Path):
+        self.path = ckpt_dir / self.FILENAME
+        self._fh = None
+
+    def load(self) -> set:
+        """저널에 기록된 완료 페이지 집합 (손상된 꼬리는 잘라냄)"""
+        pages = set()
+        if not self.path.exists():
+            return pages
+        data = self.path.read_bytes()
+        valid_end = data.rfind(b"\n") + 1
+        for line in data[:valid_end].splitlines():
+            try:
+                pages.add(int(json.loads(line)["page"]))
+            except (ValueError, KeyError, TypeError):
+                continue
+        if valid_end < len(data):
+            with open(self.path, "r+b") as f:
+                f.truncate(valid_end)
+        return pages
+
+    def record(self, page: int):
+        if self._fh is None:
+            self._fh = open(self.path, "a", encoding="utf-8")
+        self._fh.write(json.dumps({"page": page}) + "\n")
+        self._fh.flush()
+
+    def close(self):
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+    def compact(self, ckpt_dir: Path, manifest: Dict, completed: set):
+        """저널을 매니페스트로 합치고 비움"""
+        self.close()
+        manifest["completed_pages"] = sorted(completed)
+        save_manifest(ckpt_dir, manifest, durable=True)
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+# ───────────── 페이지 처리(작업자) ─────────────
+def write_page_checkpoint(page_index_1based: int,
+                          page_pdf: bytes,
+                          lang: str,
+                          words: Optional[List[Dict]],
+                          save_json: bool,
+                          ckpt_dir: str):
+    """OCR 결과 한 페이지를 체크포인트 파일(PDF, 옵션 JSON)로 기록"""
+    # OCR PDF 저장(체크포인트)
+    page_pdf_path = Path(ckpt_dir) / f"page_{page_index_1based:05d}.pdf"
+    page_pdf_path.write_bytes(page_pdf)
+
+    # 사이드카 JSON (옵션)
+    if save_json:
+        page_json = {
+            "page": page_index_1based,
+            "lang": lang,
+            "words": words
+        }
+        page_json_path = Path(ckpt_dir) / f"page_{page_index_1based:05d}.json"
+        page_json_path.write_text(json.dumps(page_json, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+def ocr_pdf_chunk_worker(pdf_path: str,
+                         first_page: int,
+                         last_page: int,
+                         dpi: int,
+                         lang_opt: str,
+                         conf: int,
+                         save_json: bool,
+                         ckpt_dir: str,
+                         cache_settings=None,
+                         binarize_mode: str = "fixed") -> List[Tuple[int, bool, Optional[str]]]:
+    """
+    연속 페이지 구간을 문서 1회 오픈으로 래스터화하고, 캐시 미스 페이지를 (N, H, W) 묶음으로
+    한 번에 전처리한 뒤 한 장씩 OCR
+    (래스터 배열은 캐시 조회 직후 그레이스케일로 줄여 보관 → 워커 메모리는 구간의 그레이스케일 페이지 수만큼)
+    반환: [(페이지번호, 성공여부, 오류메시지), ...] 페이지 순
+    """
+    cache = get_page_cache(cache_settings)
+    results, pending = [], []
+    try:
+        for page_idx, arr in iter_page_arrays(pdf_path, first_page, last_page, dpi):
+            try:
+                key, hit = lookup_page_cache(cache, arr, dpi, lang_opt, conf, save_json, binarize_mode)
+                if hit is not None:
+                    write_page_checkpoint(page_idx, hit["pdf"], hit["lang"], hit["words"], save_json, ckpt_dir)
+                    results.append((page_idx, True, None))
+                else:
+                    pending.append((page_idx, key, to_gray(arr)))
+            except Exception as e:
+                results.append((page_idx, False, str(e)))
+            del arr
+    except Exception as e:
+        done = {r[0] for r in results} | {p[0] for p in pending}
+        results.extend((i, False, f"rasterize failed: {e}")
+                       for i in range(first_page, last_page + 1) if i not in done)
+
+    try:
+        pages = preprocess_pages([p[2] for p in pending], binarize_mode)
+    except Exception as e:
+        results.extend((p[0], False, f"preprocess failed: {e}") for p in pending)
+        pending, pages = [], []
+
+    for (page_idx, key, _), pre in zip(pending, pages):
+        try:
+            page_pdf, lang, words = ocr_preprocessed(pre, lang_opt, conf, save_json, cache, key)
+            write_page_checkpoint(page_idx, page_pdf, lang, words, save_json, ckpt_dir)
+            results.append((page_idx, True, None))
+        except Exception as e:
+            results.append((page_idx, False, str(e)))
+    return sorted(results)
 
 
-# ───────────── 단일 페이지 처리(작업자) ─────────────
 def ocr_pdf_page_worker(pdf_path: str,
                         page_index_1based: int,
                         dpi: int,
                         lang_opt: str,
                         conf: int,
                         save_json: bool,
-                        ckpt_dir: str) -> Tuple[int, bool, Optional[str]]:
+                        ckpt_dir: str,
+                        cache_settings=None,
+                        binarize_mode: str = "fixed") -> Tuple[int, bool, Optional[str]]:
     """
+    단일 페이지 처리 (호환용, 1페이지 구간으로 처리)
     반환: (페이지번호, 성공여부, 오류메시지)
     """
-    try:
-        imgs = convert_from_path(pdf_path, dpi=dpi, first_page=page_index_1based, last_page=page_index_1based)
-        if not imgs:
-            return page_index_1based, False, "pdf2image returned no image"
-        pre = preprocess(imgs[0])
-
-        lang = lang_opt
-        if lang_opt == "auto":
-            lang = detect_language_from_image(pre, fallback="eng")
-
-        # OCR PDF 저장(체크포인트)
-        page_pdf = image_to_pdf_bytes(pre, lang=lang)
-        page_pdf_path = Path(ckpt_dir) / f"page_{page_index_1based:05d}.pdf"
-        page_pdf_path.write_bytes(page_pdf)
-
-        # 사이드카 JSON (옵션)
-        if save_json:
-            words = image_to_words(pre, lang=lang, conf_threshold=conf)
-            page_json = {
-                "page": page_index_1based,
-                "lang": lang,
-                "words": words
-            }
-            page_json_path = Path(ckpt_dir) / f"page_{page_index_1based:05d}.json"
-            page_json_path.write_text(json.dumps(page_json, ensure_ascii=False, indent=2), encoding="utf-8")
-
-        return page_index_1based, True, None
-    except Exception as e:
-        return page_index_1based, False, str(e)
+    results = ocr_pdf_chunk_worker(pdf_path, page_index_1based, page_index_1based, dpi, lang_opt,
+                                   conf, save_json, ckpt_dir, cache_settings, binarize_mode)
+    if not results:
+        return page_index_1based, False, "rasterizer returned no image"
+    return results[0]
 
 
 # ───────────── 최종 병합 ─────────────
-def finalize_merge(pdf_path: Path, ckpt_dir: Path, out_pdf: Path, save_json: bool):
-    writer = PdfWriter()
-    pages = sorted(ckpt_dir.glob("page_*.pdf"))
+def checkpoint_page_files(ckpt_dir: Path, suffix: str, total_pages: Optional[int] = None) -> List[Path]:
+    """체크포인트 페이지 파일 목록 (total_pages 를 알면 디렉토리 스캔 없이 이름으로 나열)"""
+    if total_pages is None:
+        return sorted(ckpt_dir.glob(f"page_*{suffix}"))
+    return [ckpt_dir / f"page_{i:05d}{suffix}" for i in range(1, total_pages + 1)]
+
+
+def _json_at(value, level: int) -> str:
+    """indent=2 직렬화 결과를 level 칸 들여쓴 위치에 끼워 넣을 수 있도록 변환"""
+    return json.dumps(value, ensure_ascii=False, indent=2).replace("\n", "\n" + " " * level)
+
+
+def write_json_sidecar_stream(out_json: Path, header: Dict, page_files: List[Path]):
+    """
+    사이드카 JSON 을 페이지 레코드 단위로 스트리밍 기록.
+    메모리에는 한 페이지 레코드만 유지하며 .part 파일에 쓴 뒤 원자적으로 교체.
+    결과는 memory 병합의 json.dumps({**header, "pages": [...]}, indent=2) 와 바이트 단위로 같다.
+    """
+    tmp = out_json.with_name(out_json.name + ".part")
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write("{\n")
+        for key, value in header.items():
+            if key != "pages":
+                f.write(f"  {_json_at(key, 2)}: {_json_at(value, 2)},\n")
+        f.write('  "pages": [')
+        for n, j in enumerate(page_files):
+            f.write(",\n    " if n else "\n    ")
+            f.write(_json_at(json.loads(j.read_text(encoding="utf-8")), 4))
+        f.write("\n  ]\n}" if page_files else "]\n}")
+    os.replace(tmp, out_json)
+
+
+def finalize_merge(pdf_path: Path, ckpt_dir: Path, out_pdf: Path, save_json: bool,
+                   total_pages: Optional[int] = None, merge_mode: str = "stream"):
+    """
+    체크포인트 페이지를 최종 PDF(+JSON) 로 병합.
+    - stream: 페이지를 하나씩 읽어 바로 파일에 기록 (피크 메모리 ≈ 한 페이지)
+    - memory: 기존 방식, PdfWriter 에 모든 페이지를 모은 뒤 한 번에 직렬화
+    """
+    pages = checkpoint_page_files(ckpt_dir, ".pdf", total_pages)
     if not pages:
         raise RuntimeError("No checkpointed pages to merge.")
-    for p in pages:
-        reader = PdfReader(str(p))
-        for pg in reader.pages:
-            writer.add_page(pg)
-    out_pdf.write_bytes(write_pdf_to_bytes(writer))
+    missing = [p.name for p in pages if not p.exists()]
+    if missing:
+        raise RuntimeError(f"Missing checkpointed pages: {', '.join(missing[:5])}")
+
+    if merge_mode == "stream":
+        stream_merge_pdfs(pages, out_pdf)
+    else:
+        writer = PdfWriter()
+        for p in pages:
+            reader = PdfReader(str(p))
+            for pg in reader.pages:
+                writer.add_page(pg)
+        out_pdf.write_bytes(write_pdf_to_bytes(writer))
 
     # JSON 병합
     if save_json:
-        merged = {"type": "pdf", "file": pdf_path.name, "pages": []}
-        for j in sorted(ckpt_dir.glob("page_*.json")):
-            merged["pages"].append(json.loads(j.read_text(encoding="utf-8")))
         out_json = out_pdf.with_suffix(".json")
-        out_json.write_text(json.dumps(merged, ensure_ascii=False, indent=2), encoding="utf-8")
+        json_pages = checkpoint_page_files(ckpt_dir, ".json", total_pages)
+        if merge_mode == "stream":
+            write_json_sidecar_stream(out_json, {"type": "pdf", "file": pdf_path.name},
+                                      [j for j in json_pages if j.exists()])
+        else:
+            merged = {"type": "pdf", "file": pdf_path.name, "pages": []}
+            for j in json_pages:
+                if j.exists():
+                    merged["pages"].append(json.loads(j.read_text(encoding="utf-8")))
+            out_json.write_text(json.dumps(merged, ensure_ascii=False, indent=2), encoding="utf-8")
 
 def write_pdf_to_bytes(writer: PdfWriter) -> bytes:
     bio = BytesIO()
@@ -210,7 +537,29 @@ def process_pdf_with_checkpoint(pdf_path: Path,
                                 save_json: bool,
                                 workers: int,
                                 resume: bool,
-                                keep_ckpt: bool):
+                                keep_ckpt: bool,
+                                cache_settings=None,
+                                chunk_size: int = 8,
+                                merge_mode: str = "stream",
+                                dpi_candidates: Optional[List[int]] = None,
+                                progress_callback: Optional[Callable[[Dict], None]] = None,
+                                binarize_mode: str = "fixed"):
+    """PDF 하나를 체크포인트 기반으로 OCR
+
+    progress_callback 을 주면 단계/페이지마다 다음 형태의 dict 로 호출한다
+    (콜백 예외는 로그만 남기고 처리를 계속함):
+        {"stage": "ocr" | "merge" | "done", "processed_pages": n, "total_pages": N,
+         "page": i, "ok": bool}   # page/ok 는 페이지 완료 이벤트에만
+    """
+    def emit(stage: str, **extra):
+        if progress_callback is None:
+            return
+        try:
+            progress_callback({"stage": stage, "processed_pages": len(completed),
+                               "total_pages": total_pages, **extra})
+        except Exception as e:
+            logging.warning(f"progress_callback failed: {e}")
+
     outdir.mkdir(parents=True, exist_ok=True)
     out_pdf = outdir / f"{pdf_path.stem}_searchable.pdf"
 
@@ -224,8 +573,9 @@ def process_pdf_with_checkpoint(pdf_path: Path,
 
     # DPI 자동 선택 (매니페스트 초기화 직후에만)
     if auto_dpi and not manifest.get("dpi_finalized"):
-        probe_lang = "eng" if lang_opt == "auto" else lang_opt
-        chosen = pick_best_dpi(pdf_path, [200, 300, 400], probe_lang, conf)
+        chosen = pick_best_dpi(pdf_path, dpi_candidates or [200, 300, 400], lang_opt, conf,
+                               workers=workers, total_pages=manifest["total_pages"],
+                               cache_settings=cache_settings, binarize_mode=binarize_mode)
         manifest["dpi"] = chosen
         manifest["dpi_finalized"] = True
         save_manifest(ckpt_dir, manifest)
@@ -233,28 +583,26 @@ def process_pdf_with_checkpoint(pdf_path: Path,
 
     dpi = manifest["dpi"]
     total_pages = manifest["total_pages"]
-    completed = set(manifest.get("completed_pages", []))
+
+    # 매니페스트(압축된 완료 목록) + 저널(마지막 압축 이후 완료분)
+    journal = ProgressJournal(ckpt_dir)
+    completed = set(manifest.get("completed_pages", [])) | journal.load()
 
     # 이미 최종 산출물이 있으면 바로 리턴(Resume)
     if resume and out_pdf.exists() and len(completed) == total_pages:
         logging.info(f"[RESUME] Already completed: {pdf_path.name}")
+        emit("done")
         return
 
-    # 이미 존재하는 페이지 조각 스캔 (파일 기준으로도 복구)
-    for p in ckpt_dir.glob("page_*.pdf"):
-        try:
-            idx = int(p.stem.split("_")[1])
-            completed.add(idx)
-        except Exception:
-            pass
-    manifest["completed_pages"] = sorted(list(completed))
-    save_manifest(ckpt_dir, manifest)
+    if journal.path.exists():
+        journal.compact(ckpt_dir, manifest, completed)
 
     # 처리할 페이지 인덱스
     todo = [i for i in range(1, total_pages + 1) if i not in completed]
     if not todo:
         logging.info("No remaining pages. Merging…")
-        finalize_merge(pdf_path, ckpt_dir, out_pdf, save_json)
+        emit("merge")
+        finalize_merge(pdf_path, ckpt_dir, out_pdf, save_json, total_pages, merge_mode)
         if not keep_ckpt:
             for f in ckpt_dir.glob("*"):
                 try:
@@ -266,37 +614,54 @@ def process_pdf_with_checkpoint(pdf_path: Path,
             except Exception:
                 pass
         logging.info(f"✅ Done: {out_pdf}")
+        emit("done")
         return
 
     logging.info(f"Start OCR: {pdf_path.name} | pages: {total_pages}, todo: {len(todo)}, dpi={dpi}, lang={lang_opt}")
+    emit("ocr")
+
+    # 워커마다 연속 구간을 맡아 문서를 한 번만 열고 래스터화 (워커 수보다 구간이 적지 않도록 조정)
+    chunk = max(1, min(chunk_size, math.ceil(len(todo) / max(workers, 1))))
+    ranges = chunk_page_ranges(todo, chunk)
 
     # 병렬 처리
-    with ProcessPoolExecutor(max_workers=workers) as ex:
-        futures = [
-            ex.submit(
-                ocr_pdf_page_worker,
-                str(pdf_path),
-                idx,
-                dpi,
-                lang_opt,
-                conf,
-                save_json,
-                str(ckpt_dir)
-            ) for idx in todo
-        ]
-        for fut in tqdm(as_completed(futures), total=len(futures), desc=f"📕 {pdf_path.name}", unit="page"):
-            page_idx, ok, err = fut.result()
-            if ok:
-                completed.add(page_idx)
-                manifest["completed_pages"] = sorted(list(completed))
-                save_manifest(ckpt_dir, manifest)
-            else:
-                logging.error(f"Page {page_idx} failed: {err}")
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            futures = [
+                ex.submit(
+                    ocr_pdf_chunk_worker,
+                    str(pdf_path),
+                    first,
+                    last,
+                    dpi,
+                    lang_opt,
+                    conf,
+                    save_json,
+                    str(ckpt_dir),
+                    cache_settings,
+                    binarize_mode
+                ) for first, last in ranges
+            ]
+            with tqdm(total=len(todo), desc=f"📕 {pdf_path.name}", unit="page") as bar:
+                for fut in as_completed(futures):
+                    for page_idx, ok, err in fut.result():
+                        if ok:
+                            completed.add(page_idx)
+                            journal.record(page_idx)
+                        else:
+                            logging.error(f"Page {page_idx} failed: {err}")
+                        bar.update(1)
+                        emit("ocr", page=page_idx, ok=ok)
+    finally:
+        journal.close()
+
+    journal.compact(ckpt_dir, manifest, completed)
 
     # 완료 여부 확인 후 병합
     if len(completed) == total_pages:
         logging.info("Merging all pages…")
-        finalize_merge(pdf_path, ckpt_dir, out_pdf, save_json)
+        emit("merge")
+        finalize_merge(pdf_path, ckpt_dir, out_pdf, save_json, total_pages, merge_mode)
         if not keep_ckpt:
             for f in ckpt_dir.glob("*"):
                 try:
@@ -308,25 +673,22 @@ def process_pdf_with_checkpoint(pdf_path: Path,
             except Exception:
                 pass
         logging.info(f"✅ Done: {out_pdf}")
+        emit("done")
     else:
         logging.info(f"Partial complete. Resume later with --resume (done {len(completed)}/{total_pages}).")
 
 
 # ───────────── 이미지 파일도 지원(간단) ─────────────
-def process_image_simple(img_path: Path, outdir: Path, lang_opt: str, conf: int, save_json: bool):
+def process_image_simple(img_path: Path, outdir: Path, lang_opt: str, conf: int, save_json: bool,
+                         cache_settings=None, binarize_mode: str = "fixed"):
     out_pdf = outdir / f"{img_path.stem}_searchable.pdf"
     img = Image.open(img_path)
-    pre = preprocess(img)
-
-    lang = lang_opt
-    if lang_opt == "auto":
-        lang = detect_language_from_image(pre, fallback="eng")
 
-    pdf_b = image_to_pdf_bytes(pre, lang=lang)
+    # 이미지 파일은 DPI 를 알 수 없으므로 0 으로 키 구성
+    pdf_b, lang, words = ocr_image_cached(img, 0, lang_opt, conf, save_json, cache_settings, binarize_mode)
     out_pdf.write_bytes(pdf_b)
 
     if save_json:
-        words = image_to_words(pre, lang=lang, conf_threshold=conf)
         out_json = out_pdf.with_suffix(".json")
         data = {"type": "image", "file": img_path.name, "pages": [{"page": 1, "lang": lang, "words": words}]}
         out_json.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
@@ -341,12 +703,21 @@ def main():
     ap.add_argument("--outdir", default="./output", help="출력 폴더 (기본 ./output)")
     ap.add_argument("--lang", default="auto", help="Tesseract 언어 (예: eng, kor, eng+kor, auto=자동)")
     ap.add_argument("--dpi", type=int, default=300, help="PDF→이미지 변환 DPI(기본 300)")
-    ap.add_argument("--auto-dpi", action="store_true", help="200/300/400 중 자동 선택")
+    ap.add_argument("--auto-dpi", action="store_true", help="후보 DPI 중 자동 선택")
+    ap.add_argument("--dpi-candidates", default="200,300,400", help="자동 DPI 후보 (쉼표 구분, 기본 200,300,400)")
     ap.add_argument("--conf", type=int, default=50, help="단어 confidence 임계값(기본 50)")
+    ap.add_argument("--binarize", choices=BINARIZE_MODES, default="fixed",
+                    help="이진화 임계값 방식 (fixed=고정 140, otsu=페이지별 자동, adaptive=지역 평균)")
     ap.add_argument("--save-json", action="store_true", help="페이지 단어/좌표 JSON 사이드카 저장")
     ap.add_argument("--workers", type=int, default=os.cpu_count() or 4, help="병렬 프로세스 수")
     ap.add_argument("--resume", action="store_true", help="체크포인트 기반 재개")
     ap.add_argument("--keep-ckpt", action="store_true", help="최종 병합 후 체크포인트 보존")
+    ap.add_argument("--chunk-size", type=int, default=8, help="워커당 한 번에 래스터화할 연속 페이지 수")
+    ap.add_argument("--merge-mode", choices=["stream", "memory"], default="stream",
+                    help="최종 병합 방식 (stream=페이지 단위 스트리밍, memory=기존 일괄 병합)")
+    ap.add_argument("--config", default=None, help="설정 파일 경로 (cache 섹션 사용)")
+    ap.add_argument("--cache-dir", default=None, help="OCR 결과 캐시 폴더 (설정값 오버라이드)")
+    ap.add_argument("--no-cache", action="store_true", help="OCR 결과 캐시 비활성화")
 
     args = ap.parse_args()
 
@@ -354,6 +725,12 @@ def main():
     log_file = setup_logger(outdir)
     logging.info(f"Args: {vars(args)}")
 
+    cache_settings = load_config(Path(args.config) if args.config else None).cache
+    if args.cache_dir:
+        cache_settings.cache_directory = args.cache_dir
+    if args.no_cache:
+        cache_settings.enabled = False
+
     in_path = Path(args.input)
     if not in_path.exists():
         logging.error(f"Input path not found: {in_path}")
@@ -375,10 +752,16 @@ def main():
                     dpi=args.dpi, auto_dpi=args.auto_dpi,
                     lang_opt=args.lang, conf=args.conf,
                     save_json=args.save_json, workers=args.workers,
-                    resume=args.resume, keep_ckpt=args.keep_ckpt
+                    resume=args.resume, keep_ckpt=args.keep_ckpt,
+                    cache_settings=cache_settings,
+                    chunk_size=args.chunk_size,
+                    merge_mode=args.merge_mode,
+                    dpi_candidates=[int(d) for d in args.dpi_candidates.split(",") if d.strip()],
+                    binarize_mode=args.binarize
                 )
             else:
-                process_image_simple(p, outdir, args.lang, args.conf, args.save_json)
+                process_image_simple(p, outdir, args.lang, args.conf, args.save_json, cache_settings,
+                                     args.binarize)
         except Exception as e:
             logging.exception(f"Failed: {p.name} ({e})")
 
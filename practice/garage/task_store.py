@@ -0,0 +1,370 @@
+"""
+Task Store
+API 태스크 저장소 (메모리 / SQLite 백엔드)
+"""
+
+import base64
+import bisect
+import pickle
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+
+def status_key(status: Any) -> str:
+    """인덱스용 상태 문자열 (Enum 이면 value)"""
+    return str(getattr(status, "value", status))
+
+
+def encode_cursor(created_at: float, task_id: str) -> str:
+    return base64.urlsafe_b64encode(f"{created_at!r}|{task_id}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[float, str]:
+    """커서 → (created_at, task_id), 형식이 잘못되면 ValueError"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, task_id = raw.split("|", 1)
+        return float(created_at), task_id
+    except Exception as e:
+        raise ValueError(f"invalid cursor: {cursor}") from e
+
+
+class TaskStore(ABC):
+    """
+    태스크 저장소 인터페이스 (백엔드는 추상 메서드를 모두 구현해야 생성 가능)
+
+    태스크는 dict (created_at/status/sha256 는 인덱스 대상), 결과는 별도 객체로 저장한다.
+    active_statuses 에 속한 태스크 수는 상태가 바뀔 때마다 갱신하므로 조회는 O(1).
+    목록은 (created_at, task_id) 내림차순이고 커서는 마지막으로 돌려준 항목의 위치다.
+    """
+
+    def __init__(self, active_statuses: Iterable[Any] = ()):
+        self.active_statuses = {status_key(s) for s in active_statuses}
+        self._active = 0
+        self._lock = threading.RLock()
+
+    def _track(self, old_status: Optional[Any], new_status: Optional[Any]) -> None:
+        was = old_status is not None and status_key(old_status) in self.active_statuses
+        now = new_status is not None and status_key(new_status) in self.active_statuses
+        self._active += now - was
+
+    def count_active(self) -> int:
+        return self._active
+
+    @abstractmethod
+    def add(self, task_id: str, task: Dict) -> None:
+        ...
+
+    @abstractmethod
+    def get(self, task_id: str) -> Optional[Dict]:
+        ...
+
+    @abstractmethod
+    def update(self, task_id: str, **fields) -> Optional[Dict]:
+        ...
+
+    @abstractmethod
+    def delete(self, task_id: str) -> Optional[Dict]:
+        ...
+
+    @abstractmethod
+    def set_result(self, task_id: str, result: Any) -> None:
+        ...
+
+    @abstractmethod
+    def get_result(self, task_id: str) -> Optional[Any]:
+        ...
+
+    @abstractmethod
+    def find_by_fingerprint(self, sha256: str) -> Optional[str]:
+        ...
+
+    @abstractmethod
+    def ids_with_status(self, statuses: Iterable[Any]) -> List[str]:
+        ...
+
+    @abstractmethod
+    def page(self, limit: int, cursor: Optional[str] = None,
+             status: Optional[Any] = None) -> Tuple[List[Tuple[str, Dict]], Optional[str]]:
+        """최신순 한 페이지 ([(task_id, task)], 다음 커서 또는 None)"""
+
+    @abstractmethod
+    def expire(self, cutoff: float) -> List[str]:
+        """created_at < cutoff 인 태스크 삭제, 삭제된 ID 반환"""
+
+    @abstractmethod
+    def __len__(self) -> int:
+        ...
+
+    def close(self) -> None:
+        pass
+
+
+class MemoryTaskStore(TaskStore):
+    """프로세스 메모리 백엔드 (재시작 시 사라짐)"""
+
+    def __init__(self, active_statuses: Iterable[Any] = ()):
+        super().__init__(active_statuses)
+        self._tasks: Dict[str, Dict] = {}
+        self._results: Dict[str, Any] = {}
+        self._order: List[Tuple[float, str]] = []  # (created_at, task_id) 오름차순
+        self._by_status: Dict[str, List[Tuple[float, str]]] = {}  # 상태별 (created_at, task_id) 오름차순
+        self._fingerprints: Dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    @staticmethod
+    def _insert(entries: List[Tuple[float, str]], entry: Tuple[float, str]) -> None:
+        if not entries or entries[-1] <= entry:
+            entries.append(entry)  # 보통은 시간순으로 들어오므로 append
+        else:
+            bisect.insort(entries, entry)
+
+    @staticmethod
+    def _remove(entries: List[Tuple[float, str]], entry: Tuple[float, str]) -> None:
+        i = bisect.bisect_left(entries, entry)
+        if i < len(entries) and entries[i] == entry:
+            del entries[i]
+
+    def _index_status(self, task_id: str, created_at: float, old: Optional[Any], new: Optional[Any]) -> None:
+        entry = (created_at, task_id)
+        if old is not None:
+            members = self._by_status.get(status_key(old))
+            if members is not None:
+                self._remove(members, entry)
+        if new is not None:
+            self._insert(self._by_status.setdefault(status_key(new), []), entry)
+        self._track(old, new)
+
+    def add(self, task_id: str, task: Dict) -> None:
+        with self._lock:
+            self.delete(task_id)
+            self._tasks[task_id] = task
+            self._insert(self._order, (task["created_at"], task_id))
+            self._index_status(task_id, task["created_at"], None, task.get("status"))
+            if task.get("sha256"):
+                self._fingerprints[task["sha256"]] = task_id
+
+    def get(self, task_id: str) -> Optional[Dict]:
+        return self._tasks.get(task_id)
+
+    def update(self, task_id: str, **fields) -> Optional[Dict]:
+        with self._lock:
+            task = self._tasks.get(task_id)
+            if task is None:
+                return None
+            if "status" in fields:
+                self._index_status(task_id, task["created_at"], task.get("status"), fields["status"])
+            task.update(fields)
+            return task
+
+    def delete(self, task_id: str) -> Optional[Dict]:
+        with self._lock:
+            task = self._tasks.pop(task_id, None)
+            if task is None:
+                return None
+            self._remove(self._order, (task["created_at"], task_id))
+            self._unindex(task_id, task)
+            return task
+
+    def _unindex(self, task_id: str, task: Dict) -> None:
+        self._index_status(task_id, task["created_at"], task.get("status"), None)
+        self._forget(task_id, task)
+
+    def _forget(self, task_id: str, task: Dict) -> None:
+        self._results.pop(task_id, None)
+        if task.get("sha256") and self._fingerprints.get(task["sha256"]) == task_id:
+            del self._fingerprints[task["sha256"]]
+
+    def set_result(self, task_id: str, result: Any) -> None:
+        if task_id in self._tasks:
+            self._results[task_id] = result
+
+    def get_result(self, task_id: str) -> Optional[Any]:
+        return self._results.get(task_id)
+
+    def find_by_fingerprint(self, sha256: str) -> Optional[str]:
+        return self._fingerprints.get(sha256)
+
+    def ids_with_status(self, statuses: Iterable[Any]) -> List[str]:
+        return [task_id for s in statuses for _, task_id in self._by_status.get(status_key(s), ())]
+
+    def page(self, limit: int, cursor: Optional[str] = None,
+             status: Optional[Any] = None) -> Tuple[List[Tuple[str, Dict]], Optional[str]]:
+        with self._lock:
+            # 상태 필터가 있으면 그 상태의 정렬 인덱스에서 바로 잘라냄 (다른 상태 태스크는 보지 않음)
+            entries = self._order if status is None else self._by_status.get(status_key(status), [])
+            end = len(entries)
+            if cursor:
+                end = bisect.bisect_left(entries, decode_cursor(cursor))
+            # 다음 페이지 유무 확인용으로 limit + 1 개
+            window = entries[max(0, end - limit - 1):end]
+            items = [(task_id, self._tasks[task_id]) for _, task_id in reversed(window)]
+            next_cursor = None
+            if len(items) > limit:
+                items = items[:limit]
+                next_cursor = encode_cursor(items[-1][1]["created_at"], items[-1][0])
+            return items, next_cursor
+
+    def expire(self, cutoff: float) -> List[str]:
+        with self._lock:
+            # 오래된 순으로 정렬되어 있으므로 앞부분을 한 번에 잘라낸다
+            cut = bisect.bisect_left(self._order, (cutoff, ""))
+            expired = [task_id for _, task_id in self._order[:cut]]
+            del self._order[:cut]
+            for members in self._by_status.values():
+                del members[:bisect.bisect_left(members, (cutoff, ""))]
+            for task_id in expired:
+                task = self._tasks.pop(task_id)
+                self._track(task.get("status"), None)
+                self._forget(task_id, task)
+            return expired
+
+
+class SQLiteTaskStore(TaskStore):
+    """
+    SQLite 백엔드 (재시작 후에도 유지)
+
+    status/created_at/sha256 는 인덱스 컬럼, 나머지 필드와 결과 객체는 pickle BLOB 로 저장한다.
+    활성 태스크 수는 열 때 한 번 세고 이후에는 이 프로세스의 상태 변경으로 갱신한다.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS tasks (
+            task_id TEXT PRIMARY KEY,
+            status TEXT NOT NULL,
+            created_at REAL NOT NULL,
+            sha256 TEXT,
+            data BLOB NOT NULL,
+            result BLOB
+        );
+        CREATE INDEX IF NOT EXISTS idx_tasks_created ON tasks (created_at, task_id);
+        CREATE INDEX IF NOT EXISTS idx_tasks_status_created ON tasks (status, created_at, task_id);
+        CREATE INDEX IF NOT EXISTS idx_tasks_sha256 ON tasks (sha256);
+    """
+
+    def __init__(self, path: Union[str, Path], active_statuses: Iterable[Any] = ()):
+        super().__init__(active_statuses)
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self.SCHEMA)
+        if self.active_statuses:
+            marks = ",".join("?" * len(self.active_statuses))
+            self._active = self._conn.execute(
+                f"SELECT COUNT(*) FROM tasks WHERE status IN ({marks})", tuple(self.active_statuses)
+            ).fetchone()[0]
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM tasks").fetchone()[0]
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def add(self, task_id: str, task: Dict) -> None:
+        with self._lock:
+            self.delete(task_id)
+            self._conn.execute(
+                "INSERT INTO tasks (task_id, status, created_at, sha256, data) VALUES (?, ?, ?, ?, ?)",
+                (task_id, status_key(task.get("status")), task["created_at"], task.get("sha256"),
+                 pickle.dumps(task, protocol=pickle.HIGHEST_PROTOCOL)),
+            )
+            self._track(None, task.get("status"))
+
+    def get(self, task_id: str) -> Optional[Dict]:
+        row = self._conn.execute("SELECT data FROM tasks WHERE task_id = ?", (task_id,)).fetchone()
+        return pickle.loads(row[0]) if row else None
+
+    def update(self, task_id: str, **fields) -> Optional[Dict]:
+        with self._lock:
+            task = self.get(task_id)
+            if task is None:
+                return None
+            old_status = task.get("status")
+            task.update(fields)
+            self._conn.execute(
+                "UPDATE tasks SET status = ?, data = ? WHERE task_id = ?",
+                (status_key(task.get("status")), pickle.dumps(task, protocol=pickle.HIGHEST_PROTOCOL), task_id),
+            )
+            if "status" in fields:
+                self._track(old_status, fields["status"])
+            return task
+
+    def delete(self, task_id: str) -> Optional[Dict]:
+        with self._lock:
+            task = self.get(task_id)
+            if task is None:
+                return None
+            self._conn.execute("DELETE FROM tasks WHERE task_id = ?", (task_id,))
+            self._track(task.get("status"), None)
+            return task
+
+    def set_result(self, task_id: str, result: Any) -> None:
+        self._conn.execute("UPDATE tasks SET result = ? WHERE task_id = ?",
+                           (pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL), task_id))
+
+    def get_result(self, task_id: str) -> Optional[Any]:
+        row = self._conn.execute("SELECT result FROM tasks WHERE task_id = ?", (task_id,)).fetchone()
+        return pickle.loads(row[0]) if row and row[0] is not None else None
+
+    def find_by_fingerprint(self, sha256: str) -> Optional[str]:
+        row = self._conn.execute(
+            "SELECT task_id FROM tasks WHERE sha256 = ? ORDER BY created_at DESC LIMIT 1", (sha256,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def ids_with_status(self, statuses: Iterable[Any]) -> List[str]:
+        keys = [status_key(s) for s in statuses]
+        if not keys:
+            return []
+        marks = ",".join("?" * len(keys))
+        return [r[0] for r in self._conn.execute(f"SELECT task_id FROM tasks WHERE status IN ({marks})", keys)]
+
+    def page(self, limit: int, cursor: Optional[str] = None,
+             status: Optional[Any] = None) -> Tuple[List[Tuple[str, Dict]], Optional[str]]:
+        where, params = [], []
+        if status is not None:
+            where.append("status = ?")
+            params.append(status_key(status))
+        if cursor:
+            created_at, task_id = decode_cursor(cursor)
+            where.append("(created_at, task_id) < (?, ?)")
+            params.extend([created_at, task_id])
+        sql = "SELECT task_id, data FROM tasks"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY created_at DESC, task_id DESC LIMIT ?"
+        rows = self._conn.execute(sql, (*params, limit + 1)).fetchall()
+        items = [(task_id, pickle.loads(data)) for task_id, data in rows[:limit]]
+        next_cursor = None
+        if len(rows) > limit:
+            next_cursor = encode_cursor(items[-1][1]["created_at"], items[-1][0])
+        return items, next_cursor
+
+    def expire(self, cutoff: float) -> List[str]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT task_id, status FROM tasks WHERE created_at < ?", (cutoff,)
+            ).fetchall()
+            self._conn.execute("DELETE FROM tasks WHERE created_at < ?", (cutoff,))
+            for _, status in rows:
+                self._track(status, None)
+            return [task_id for task_id, _ in rows]
+
+
+def create_task_store(backend: str = "memory", path: Optional[Union[str, Path]] = None,
+                      active_statuses: Iterable[Any] = ()) -> TaskStore:
+    """설정값으로 저장소 생성 (backend: "memory" | "sqlite")"""
+    if backend == "memory":
+        return MemoryTaskStore(active_statuses)
+    if backend == "sqlite":
+        if path is None:
+            raise ValueError("sqlite task store requires a path")
+        return SQLiteTaskStore(path, active_statuses)
+    raise ValueError(f"unknown task store backend: {backend}")
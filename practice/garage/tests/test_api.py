@@ -11,14 +11,15 @@ from unittest.mock import Mock, patch, AsyncMock
 import pytest
 from fastapi.testclient import TestClient
 
-from garage.api_server import app, TaskManager, ProcessingRequest
+from garage.api_server import app, client_key, rate_limiter, TaskManager, ProcessingRequest
 from garage.config import Config
 from garage.pdf_processor import ProcessingStatus, DocumentResult
 
 
 @pytest.fixture
 def client():
-    """테스트 클라이언트 생성"""
+    """테스트 클라이언트 생성 (테스트 간 요청 제한 상태는 공유하지 않음)"""
+    rate_limiter.reset()
     return TestClient(app)
 
 
@@ -100,17 +101,19 @@ class TestTaskManager:
         file_path = Path("test.pdf")
         config = ProcessingConfig()
         
-        # 태스크 생성
+        # 25시간 전에 생성된 태스크와 방금 생성된 태스크
+        with patch("garage.api_server.time.time", return_value=time.time() - 25 * 3600):
+            old_task_id = task_manager.create_task(file_path, config)
         task_id = task_manager.create_task(file_path, config)
-        
-        # 생성 시간을 과거로 설정
-        task_manager.tasks[task_id]["created_at"] = time.time() - 25 * 3600  # 25시간 전
+        assert task_manager.get_active_task_count() == 2
         
         # 정리 실행
-        task_manager.cleanup_old_tasks(max_age_hours=24)
+        assert task_manager.cleanup_old_tasks(max_age_hours=24) == 1
         
-        # 태스크가 제거되었는지 확인
-        assert task_manager.get_task(task_id) is None
+        # 오래된 태스크만 제거되었는지 확인
+        assert task_manager.get_task(old_task_id) is None
+        assert task_manager.get_task(task_id) is not None
+        assert task_manager.get_active_task_count() == 1
 
 
 class TestProcessingRequest:
@@ -271,40 +274,37 @@ class TestAPIEndpoints:
         assert "태스크를 찾을 수 없습니다" in response.json()["detail"]
     
     @patch('garage.api_server.app_config')
-    @patch('garage.api_server.auth')
-    @patch('garage.api_server.task_manager')
-    def test_tasks_list_endpoint(self, mock_task_manager, mock_auth, mock_config, client):
-        """태스크 목록 조회 엔드포인트 테스트"""
-        # 인증 모킹
-        mock_auth.return_value = True
-        
-        # 태스크 목록 모킹
-        mock_tasks = {
-            "task1": {
-                "status": ProcessingStatus.COMPLETED,
-                "progress": 100.0,
-                "total_pages": 5,
-                "processed_pages": 5,
-                "processing_time": 15.0
-            },
-            "task2": {
-                "status": ProcessingStatus.IN_PROGRESS,
-                "progress": 50.0,
-                "total_pages": 10,
-                "processed_pages": 5,
-                "processing_time": 0.0
-            }
-        }
-        mock_task_manager.tasks = mock_tasks
-        mock_task_manager.get_result.return_value = None
-        
-        response = client.get("/tasks")
+    def test_tasks_list_endpoint(self, mock_config):
+        """태스크 목록: 실제 메모리 저장소 기준 최신순 커서 페이지와 X-Next-Cursor 헤더"""
+        from fastapi import HTTPException, Response
+        from garage.api_server import list_tasks
+        from garage.pdf_processor import ProcessingConfig
         
-        assert response.status_code == 200
-        data = response.json()
-        assert len(data) == 2
-        assert data[0]["task_id"] == "task1"
-        assert data[1]["task_id"] == "task2"
+        manager = TaskManager()
+        task_ids = []
+        for i in range(5):
+            with patch("garage.api_server.time.time", return_value=1000.0 + i):
+                task_ids.append(manager.create_task(Path(f"doc{i}.pdf"), ProcessingConfig()))
+        manager.update_task(task_ids[1], status=ProcessingStatus.COMPLETED)
+        manager.update_task(task_ids[3], status=ProcessingStatus.COMPLETED)
+        
+        async def fetch(**params):
+            # 라우트 대신 핸들러를 직접 호출 (인증 의존성은 검사하지 않음)
+            response = Response()
+            tasks = await list_tasks(response, authenticated=True, **params)
+            return [t.task_id for t in tasks], response.headers.get("X-Next-Cursor")
+        
+        with patch('garage.api_server.task_manager', manager):
+            first, cursor = asyncio.run(fetch(limit=3))
+            rest, last_cursor = asyncio.run(fetch(limit=3, cursor=cursor))
+            completed, _ = asyncio.run(fetch(status_filter="completed"))
+            with pytest.raises(HTTPException) as exc_info:
+                asyncio.run(fetch(cursor="not-a-cursor"))
+        
+        assert first == task_ids[:1:-1]
+        assert rest == task_ids[1::-1] and last_cursor is None
+        assert completed == [task_ids[3], task_ids[1]]
+        assert exc_info.value.status_code == 400
 
 
 class TestRateLimitMiddleware:
@@ -326,18 +326,19 @@ class TestRateLimitMiddleware:
     def test_rate_limit_exceeded(self, mock_config):
         """요청 제한 초과 테스트"""
         from garage.api_server import RateLimitMiddleware
+        from garage.rate_limit import RateLimiter
         from starlette.applications import Starlette
         from starlette.responses import JSONResponse
+        from starlette.routing import Route
         from starlette.testclient import TestClient as StarletteTestClient
         
-        # 간단한 앱 생성
-        app = Starlette()
-        app.add_middleware(RateLimitMiddleware, requests_per_minute=2)
-        
-        @app.route("/")
         async def homepage(request):
             return JSONResponse({"message": "Hello"})
         
+        # 간단한 앱 생성 (분당 2회, 버스트 2)
+        app = Starlette(routes=[Route("/", homepage)])
+        app.add_middleware(RateLimitMiddleware, limiter=RateLimiter(requests_per_minute=2))
+        
         client = StarletteTestClient(app)
         
         # 제한을 초과하는 요청 전송
@@ -349,6 +350,72 @@ class TestRateLimitMiddleware:
         assert "Rate limit exceeded" in response.json()["detail"]
 
 
+class TestRunOCRJob:
+    """워커 작업 테스트 (search_pdf 파이프라인 모킹)"""
+    
+    @staticmethod
+    def fake_pipeline(fail_page=None):
+        def process(pdf_path, outdir, progress_callback=None, **kwargs):
+            progress_callback({"stage": "ocr", "processed_pages": 0, "total_pages": 2})
+            for page in (1, 2):
+                ok = page != fail_page
+                progress_callback({"stage": "ocr", "processed_pages": page - (not ok), "total_pages": 2,
+                                   "page": page, "ok": ok})
+            if fail_page is None:
+                progress_callback({"stage": "done", "processed_pages": 2, "total_pages": 2})
+        return process
+    
+    def test_page_events_are_relayed(self, temp_dir):
+        """페이지 완료마다 진행 이벤트를 중계하고 결과를 만든다"""
+        from garage.api_server import run_ocr_job
+        from garage.pdf_processor import ProcessingConfig
+        
+        events = []
+        with patch('garage.api_server.process_pdf_with_checkpoint', self.fake_pipeline()), \
+             patch('garage.api_server.progress_reporter', return_value=events.append):
+            result = run_ocr_job(temp_dir / "doc.pdf", temp_dir / "out", ProcessingConfig(), "task-1")
+        
+        assert [e.get("page") for e in events] == [None, 1, 2, None]
+        assert events[-1]["stage"] == "done"
+        assert result.status == ProcessingStatus.COMPLETED
+        assert (result.total_pages, result.processed_pages) == (2, 2)
+    
+    def test_partial_failure_raises(self, temp_dir):
+        """일부 페이지가 실패하면 태스크 실패"""
+        from garage.api_server import run_ocr_job
+        from garage.pdf_processor import ProcessingConfig
+        
+        with patch('garage.api_server.process_pdf_with_checkpoint', self.fake_pipeline(fail_page=2)):
+            with pytest.raises(RuntimeError, match="1/2"):
+                run_ocr_job(temp_dir / "doc.pdf", temp_dir / "out", ProcessingConfig())
+
+
+class TestClientKey:
+    """공정 스케줄링 키 테스트"""
+    
+    @staticmethod
+    def make_request(token):
+        from starlette.requests import Request
+        return Request({"type": "http", "client": ("10.0.0.1", 1234),
+                        "headers": [(b"authorization", f"Bearer {token}".encode())]})
+    
+    @patch('garage.api_server.app_config')
+    def test_ip_key_when_auth_disabled(self, mock_config):
+        """인증이 꺼져 있으면 토큰을 바꿔도 같은 IP 키"""
+        mock_config.api.api_key = None
+        
+        assert client_key(self.make_request("a")) == client_key(self.make_request("b")) == "ip:10.0.0.1"
+    
+    @patch('garage.api_server.app_config')
+    def test_token_key_when_auth_enabled(self, mock_config):
+        """인증이 켜져 있으면 검증된 API 키 단위"""
+        mock_config.api.api_key = "secret"
+        
+        key = client_key(self.make_request("secret"))
+        assert key.startswith("key:")
+        assert "secret" not in key
+
+
 class TestAuthenticationFlow:
     """인증 플로우 테스트"""
     
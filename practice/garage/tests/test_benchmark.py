@@ -0,0 +1,29 @@
+"""
+Benchmark suite tests
+벤치마크 스위트 테스트
+"""
+
+from pypdf import PdfReader
+
+from garage.benchmark import compare_results, make_synthetic_pdf
+
+
+class TestSyntheticDocument:
+    """합성 문서 테스트"""
+
+    def test_page_count_and_size(self, temp_dir):
+        path = make_synthetic_pdf(temp_dir / "synthetic.pdf", pages=3, resolution=72)
+        reader = PdfReader(str(path))
+        assert len(reader.pages) == 3
+        assert round(float(reader.pages[0].mediabox.width)) == 612  # Letter 8.5in
+
+
+class TestCompareResults:
+    """결과 비교 테스트"""
+
+    def test_reports_only_drops_beyond_tolerance(self):
+        baseline = {"metrics": {"ocr/a": 100.0, "ocr/b": 100.0, "merge/c": 100.0, "gone/d": 100.0}}
+        current = {"metrics": {"ocr/a": 90.0, "ocr/b": 70.0, "merge/c": 150.0}}
+        regressions = compare_results(current, baseline, tolerance=0.15)
+        assert [r["metric"] for r in regressions] == ["ocr/b"]
+        assert regressions[0]["change"] == -0.3
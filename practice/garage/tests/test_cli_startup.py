@@ -0,0 +1,55 @@
+"""
+CLI startup budget tests
+CLI 시작 시간(import 비용) 예산 테스트
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+CLI = Path(__file__).resolve().parent.parent / "cli.py"
+
+# `-X importtime` 누적 합계 상한 (느린 CI 에서는 환경 변수로 조정)
+STARTUP_BUDGET_MS = float(os.getenv("GARAGE_STARTUP_BUDGET_MS", "300"))
+
+# 짧은 명령어에서는 로드되면 안 되는 무거운 모듈
+HEAVY_MODULES = {
+    "rich.progress", "pdf_processor", "api_server", "uvicorn", "fastapi",
+    "pytesseract", "pdf2image", "PyPDF2", "pypdf", "psutil", "numpy", "PIL", "httpx",
+}
+
+
+def run_importtime(temp_dir, *args):
+    """`python -X importtime cli.py ...` 실행 후 (최상위 import 누적 ms, 로드된 모듈 집합)"""
+    env = {**os.environ, "PDF_PROCESSOR_CONFIG": ""}
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", str(CLI), *args],
+        cwd=temp_dir, env=env, capture_output=True, text=True, timeout=60,
+    )
+    assert proc.returncode == 0, proc.stderr[-2000:]
+
+    total_us = 0
+    modules = set()
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        modules.add(name.strip())
+        if not name[1:].startswith(" "):  # 들여쓰기 없음 = 최상위 import
+            total_us += int(cumulative)
+    return total_us / 1000, modules
+
+
+@pytest.mark.parametrize("args", [("config", "show"), ("config", "validate"), ("--help",)])
+def test_short_commands_skip_heavy_imports(temp_dir, args):
+    _, modules = run_importtime(temp_dir, *args)
+    assert not modules & HEAVY_MODULES
+
+
+def test_config_show_within_budget(temp_dir):
+    # 캐시/디스크 상태에 따른 편차를 줄이기 위해 가장 빠른 실행 기준
+    best = min(run_importtime(temp_dir, "config", "show")[0] for _ in range(3))
+    assert best < STARTUP_BUDGET_MS, f"config show import 시간 {best:.0f}ms > 예산 {STARTUP_BUDGET_MS:.0f}ms"
@@ -0,0 +1,115 @@
+"""
+Job scheduler tests
+OCR 작업 스케줄러 테스트 (공정 분배, 역압, 지표)
+"""
+
+import asyncio
+import operator
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from garage.job_queue import JobScheduler, QueueFull, SchedulerUnavailable
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+async def drain(scheduler, jobs):
+    while any(job.status in ("queued", "running") for job in jobs):
+        await asyncio.sleep(0.01)
+
+
+class TestScheduling:
+    """실행 순서 테스트"""
+
+    def test_round_robin_across_keys_and_priority_within_key(self):
+        async def scenario():
+            gate = threading.Event()
+            order = []
+            scheduler = JobScheduler(workers=1, executor=ThreadPoolExecutor(1))
+            await scheduler.start()
+            # 첫 작업이 워커를 막고 있는 동안 나머지를 큐에 쌓는다
+            blocker = scheduler.submit("block", "a", gate.wait)
+            await asyncio.sleep(0.05)
+            jobs = [blocker]
+            for i in range(4):
+                jobs.append(scheduler.submit(f"a{i}", "a", order.append, f"a{i}", priority=0 if i < 3 else -1))
+            for i in range(2):
+                jobs.append(scheduler.submit(f"b{i}", "b", order.append, f"b{i}"))
+            gate.set()
+            await drain(scheduler, jobs)
+            await scheduler.stop()
+            return order
+
+        assert run(scenario()) == ["a3", "b0", "a0", "b1", "a1", "a2"]
+
+    def test_process_pool_executes_jobs(self):
+        async def scenario():
+            scheduler = JobScheduler(workers=2)
+            await scheduler.start()
+            done = []
+            jobs = [scheduler.submit(str(i), "k", operator.mul, i, i, on_done=done.append) for i in range(5)]
+            await drain(scheduler, jobs)
+            await scheduler.stop()
+            return jobs, done
+
+        jobs, done = run(scenario())
+        assert [j.result for j in jobs] == [0, 1, 4, 9, 16]
+        assert all(j.status == "completed" for j in done) and len(done) == 5
+
+    def test_failure_is_reported(self):
+        async def scenario():
+            scheduler = JobScheduler(workers=1, executor=ThreadPoolExecutor(1))
+            await scheduler.start()
+            job = scheduler.submit("x", "k", operator.truediv, 1, 0)
+            await drain(scheduler, [job])
+            stats = scheduler.stats()
+            await scheduler.stop()
+            return job, stats
+
+        job, stats = run(scenario())
+        assert job.status == "failed"
+        assert isinstance(job.error, ZeroDivisionError)
+        assert stats["failed"] == 1
+
+
+class TestBackpressure:
+    """큐 한도/취소/지표 테스트"""
+
+    def test_limits_cancel_and_stats(self):
+        async def scenario():
+            gate = threading.Event()
+            scheduler = JobScheduler(workers=1, max_queue=3, max_per_key=2, executor=ThreadPoolExecutor(1))
+            with pytest.raises(SchedulerUnavailable):
+                scheduler.submit("early", "a", gate.wait)
+            await scheduler.start()
+            scheduler.submit("run", "a", gate.wait)
+            await asyncio.sleep(0.05)
+
+            scheduler.submit("a1", "a", gate.wait)
+            scheduler.submit("a2", "a", gate.wait)
+            with pytest.raises(QueueFull) as per_key:
+                scheduler.submit("a3", "a", gate.wait)
+            scheduler.submit("b1", "b", gate.wait)
+            with pytest.raises(QueueFull) as global_full:
+                scheduler.submit("c1", "c", gate.wait)
+
+            assert scheduler.cancel("a1")
+            assert not scheduler.cancel("run")  # 실행 중 작업은 취소 불가
+            scheduler.submit("a3", "a", gate.wait)  # 취소로 자리가 생김
+            stats = scheduler.stats()
+            gate.set()
+            await scheduler.stop()
+            return per_key.value, global_full.value, stats
+
+        per_key, global_full, stats = run(scenario())
+        assert per_key.scope == "key" and global_full.scope == "global"
+        assert per_key.retry_after >= 1
+        assert stats["running"] == 1
+        assert stats["queue_depth"] == 3
+        assert stats["queued_keys"] == 2
+        assert stats["rejected"] == 2 and stats["cancelled"] == 1
+        assert stats["oldest_wait_seconds"] >= 0
@@ -0,0 +1,500 @@
+"""
+Keyword extractor tests
+키워드 추출기 테스트
+"""
+
+import asyncio
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pytest
+
+from garage.keyword_extractor import (
+    DocumentFrequencyIndex,
+    HTMLTextExtractor,
+    KeywordExtractor,
+    KeywordMatcher,
+    MemoryManager,
+    SemanticAnalyzer,
+    SpaceSaving,
+    TrendStore,
+    WebScraper,
+)
+
+
+@pytest.fixture
+def extractor():
+    """의미 분석을 끈 기본 추출기"""
+    return KeywordExtractor(enable_semantic_analysis=False)
+
+
+class TestDocumentFrequencyIndex:
+    """증분 DF 색인 테스트"""
+
+    def test_add_counts_each_document_once(self):
+        index = DocumentFrequencyIndex()
+        assert index.add("doc one", {"doc", "one"})
+        assert index.add("doc two", {"doc", "two"})
+        assert not index.add("doc one", {"doc", "one"})
+
+        assert len(index) == 2
+        assert index.doc_freq["doc"] == 2
+        assert index.doc_freq["one"] == 1
+        assert "doc two" in index
+
+    def test_save_and_load(self, temp_dir):
+        index = DocumentFrequencyIndex()
+        index.add("alpha beta", {"alpha", "beta"})
+        path = temp_dir / "df.json"
+        index.save(path)
+
+        loaded = DocumentFrequencyIndex.load(path)
+        assert len(loaded) == 1
+        assert loaded.doc_freq == index.doc_freq
+        assert "alpha beta" in loaded
+        assert "alpha beta" not in json.loads(path.read_text(encoding="utf-8"))["documents"]
+
+    def test_load_missing_file_is_empty(self, temp_dir):
+        assert len(DocumentFrequencyIndex.load(temp_dir / "none.json")) == 0
+
+
+class TestTfidfWithIndex:
+    """색인을 사용하는 TF-IDF 추출 테스트"""
+
+    def test_common_terms_score_lower(self, extractor):
+        extractor.extract_keywords("python language guide", method="tfidf")
+        extractor.extract_keywords("python snake habitat", method="tfidf")
+        result = extractor.extract_keywords("python compiler internals", method="tfidf", include_stats=False)
+
+        scores = dict(result.keywords)
+        assert scores["python"] == 0.0
+        assert scores["compiler"] > 0
+        assert len(extractor.df_index) == 3
+
+    def test_index_survives_restart(self, temp_dir):
+        path = temp_dir / "df.json"
+        first = KeywordExtractor(enable_semantic_analysis=False, df_index_path=path, df_autosave_every=2)
+        first.extract_keywords("apple banana cherry", method="tfidf")
+        first.extract_keywords("banana durian elder", method="tfidf")
+        assert path.exists()
+
+        second = KeywordExtractor(enable_semantic_analysis=False, df_index_path=path)
+        assert len(second.df_index) == 2
+        assert second.df_index.doc_freq["banana"] == 2
+
+    def test_clear_corpus(self, extractor):
+        extractor.extract_keywords("some text here", method="tfidf")
+        extractor.clear_corpus()
+        assert len(extractor.df_index) == 0
+
+
+class TestSinglePassTokenizer:
+    """단일 패스 정제/토큰화 테스트"""
+
+    TEXT = ("Visit https://example.com or mail me@test.org #tag @user (note) "
+            "파이썬 키워드 추출 aaa --- 2024 state-of-the-art Keyword keyword! 한국어 처리.")
+
+    def test_clean_text_matches_joined_words(self, extractor):
+        for aggressive in (False, True):
+            words = extractor._clean_words(self.TEXT, aggressive)
+            assert extractor._clean_text(self.TEXT, aggressive=aggressive) == " ".join(words)
+        assert "https" not in extractor._clean_text(self.TEXT)
+        assert "note" in extractor._clean_text(self.TEXT)
+        assert "note" not in extractor._clean_text(self.TEXT, aggressive=True)
+
+    def test_fused_filters(self, extractor):
+        tokens = extractor._tokenize("aaa --- 2024 a state-of-the-art keyword the", "en")
+        assert tokens == ["state-of-the-art", "keyword"]
+
+    def test_extract_stats_reuse_tokens(self, extractor):
+        result = extractor.extract_keywords(self.TEXT)
+        stats = dict(result.stats)
+        expected = extractor.get_stats(self.TEXT)
+        assert {k: stats[k] for k in expected} == expected
+        assert stats["cleaned_length"] == len(extractor._clean_text(self.TEXT))
+
+
+class TestBatchExtractParallel:
+    """프로세스 풀 배치 추출 테스트"""
+
+    TEXTS = [
+        "python parsing speed python tokens",
+        "한국어 형태소 분석 한국어 검색",
+        "python regex engine internals",
+        "   ",
+        "search index python ranking",
+    ]
+
+    @pytest.mark.parametrize("method", ["frequency", "tfidf"])
+    def test_matches_sequential_extraction(self, method):
+        sequential = KeywordExtractor(enable_semantic_analysis=False)
+        expected = [sequential.extract_keywords(t, method) for t in self.TEXTS]
+
+        batch = KeywordExtractor(enable_semantic_analysis=False)
+        results = batch.batch_extract_parallel(self.TEXTS, method, max_workers=2, chunk_size=2)
+
+        assert [r.keywords for r in results] == [r.keywords for r in expected]
+        assert [r.stats for r in results] == [r.stats for r in expected]
+        assert batch.df_index.doc_freq == sequential.df_index.doc_freq
+        assert set(batch.trend_store.keywords()) == set(sequential.trend_store.keywords())
+
+    def test_bad_document_yields_empty_result(self, extractor):
+        results = extractor.batch_extract_parallel(["valid text here", None], max_workers=1)
+        assert results[0].keywords
+        assert results[1].keywords == []
+
+
+class TestSemanticAnalyzer:
+    """행렬 기반 유사도/클러스터링 테스트"""
+
+    WORDS = ["python", "pythons", "java", "javascript", "한국어", "한국인", "python"]
+
+    def test_matrix_matches_pairwise(self):
+        analyzer = SemanticAnalyzer()
+        matrix = analyzer.similarity_matrix(self.WORDS)
+        assert matrix.shape == (7, 7)
+        assert np.allclose(matrix, matrix.T)
+        for i, a in enumerate(self.WORDS):
+            for j, b in enumerate(self.WORDS):
+                assert matrix[i, j] == pytest.approx(analyzer.calculate_similarity(a, b), abs=1e-5)
+
+    def test_cluster_groups_similar_words(self):
+        clusters = SemanticAnalyzer().cluster_keywords(self.WORDS, threshold=0.85)
+        assert clusters["python"] == ["python", "pythons"]
+        assert sum(len(c) for c in clusters.values()) == 6
+
+    def test_store_and_cache_are_bounded(self):
+        analyzer = SemanticAnalyzer(max_vectors=8, max_cache_size=5)
+        for i in range(50):
+            analyzer.calculate_similarity(f"a{i}", f"b{i}")
+        assert len(analyzer._rows) == 8
+        assert len(analyzer.similarity_cache) == 5
+        assert analyzer.calculate_similarity("same", "same") == pytest.approx(1.0)
+
+    def test_char_bits_follow_stored_words(self):
+        """벡터가 밀려나면 그 단어만 쓰던 문자 비트도 해제되어 비트폭이 저장 단어의 고유 문자 수로 유지"""
+        analyzer = SemanticAnalyzer(max_vectors=4)
+        syllables = [chr(0xAC00 + i) for i in range(400)]
+        for i in range(0, 400, 2):
+            analyzer.word_vectors([syllables[i] + syllables[i + 1]])
+        live = {c for word in analyzer._rows for c in word}
+        # 마지막 조회에서 밀려난 단어의 문자 2개만 다음 조회 때 회수 대기
+        assert live <= set(analyzer._char_bits) and len(analyzer._char_bits) <= len(live) + 2
+        assert max(analyzer._char_bits.values()) < 16
+
+    def test_jaccard_matches_sets_across_evictions(self):
+        """한 번의 호출 안에서 저장소가 넘쳐도 (비트 재사용 없음) 문자 집합 자카드와 동일, 블록 분할 포함"""
+        analyzer = SemanticAnalyzer(max_vectors=5)
+        analyzer.JACCARD_BLOCK_WORDS = 7
+        words_a = ["python", "한국어", "data", "pytorch", "한국인", "science", "zebra"]
+        words_b = ["pythons", "한글", "database", "scientist"]
+        jaccard = analyzer._jaccard(*(analyzer._lookup(words_a, words_b)[i][1] for i in (0, 1)))
+        for i, a in enumerate(words_a):
+            for j, b in enumerate(words_b):
+                sa, sb = set(a), set(b)
+                assert jaccard[i, j] == pytest.approx(len(sa & sb) / len(sa | sb))
+
+    def test_suggestions_use_similarity(self):
+        extractor = KeywordExtractor()
+        text = "python pythonic pythons snake snake java coffee coffee"
+        suggestions = extractor.get_keyword_suggestions(text, ["python"], suggestion_count=2)
+        assert suggestions[0] in ("pythonic", "pythons")
+
+
+class TestMemoryManager:
+    """LRU 캐시 테스트"""
+
+    def test_evicts_least_recently_used(self):
+        cache = MemoryManager(max_cache_size=2)
+        cache.put("a", [1.0] * 4)
+        cache.put("b", [2.0] * 4)
+        assert cache.get("a") is not None  # a 를 최근 사용으로
+        cache.put("c", [3.0] * 4)
+
+        assert "b" not in cache
+        assert "a" in cache and "c" in cache
+        assert cache.stats()["evictions"] == 1
+
+    def test_bounded_by_bytes(self):
+        cache = MemoryManager(max_cache_size=100, max_bytes=3000)
+        for i in range(10):
+            cache.put(i, np.zeros(128, dtype=np.float32))  # 약 624 바이트
+        stats = cache.stats()
+        assert stats["bytes"] <= 3000
+        assert stats["entries"] == 4
+        cache.put("huge", np.zeros(10000))
+        assert "huge" not in cache
+
+    def test_get_or_create_counts_hits_and_misses(self):
+        cache = MemoryManager()
+        calls = []
+        for _ in range(3):
+            cache.get_or_create("k", lambda: calls.append(1) or [0.0])
+        assert len(calls) == 1
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"]) == (2, 1)
+        assert stats["hit_rate"] == pytest.approx(2 / 3, abs=1e-3)
+
+    def test_concurrent_access(self):
+        cache = MemoryManager(max_cache_size=50)
+
+        def worker(offset):
+            for i in range(500):
+                cache.get_or_create((offset + i) % 80, lambda: [i])
+
+        threads = [threading.Thread(target=worker, args=(n * 7,)) for n in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        stats = cache.stats()
+        assert stats["entries"] == 50
+        assert stats["hits"] + stats["misses"] == 2000
+
+
+class TestTrendStore:
+    """시간 버킷 트렌드 저장소 테스트"""
+
+    NOW = datetime(2024, 5, 1, 12, 0)
+
+    def test_rollup_and_window_query(self):
+        store = TrendStore()
+        for minutes, score in [(-90, 1.0), (-30, 2.0), (-29.5, 4.0), (-1, 6.0)]:
+            store.add("ai", score, self.NOW + timedelta(minutes=minutes))
+
+        minute = store.history("ai", days=1 / 24, resolution="minute", now=self.NOW)
+        assert [score for _, score in minute] == [3.0, 6.0]  # 같은 분 버킷은 평균
+        hourly = store.history("ai", days=1, resolution="hour", now=self.NOW)
+        assert len(hourly) == 2
+
+    def test_trend_and_top_trending(self):
+        store = TrendStore()
+        for keyword, first, last in [("rising", 1.0, 5.0), ("flat", 3.0, 3.0), ("falling", 4.0, 1.0)]:
+            store.add(keyword, first, self.NOW - timedelta(hours=3))
+            store.add(keyword, last, self.NOW - timedelta(minutes=5))
+
+        trend = store.trend("rising", days=1, now=self.NOW)
+        assert trend.is_trending
+        assert trend.trend_score == pytest.approx(4.0)
+        top = store.top_trending(n=2, days=1, now=self.NOW)
+        assert [t.keyword for t in top] == ["rising", "flat"]
+
+    def test_retention_prunes_old_buckets(self):
+        retention = {"minute": 3600, "hour": 3600, "day": 3600}
+        store = TrendStore(retention=retention, prune_interval=10 ** 9)
+        store.add("old", 1.0, self.NOW - timedelta(days=3))
+        store.add("new", 1.0, self.NOW)
+        assert store.prune(now=self.NOW) == 3
+        assert "old" not in store
+        assert "new" in store
+
+        # 추가 시 주기적으로 자동 정리
+        store = TrendStore(retention=retention, prune_interval=60)
+        store.add("old", 1.0, self.NOW - timedelta(days=3))
+        store.add("new", 1.0, self.NOW)
+        assert store.keywords() == ["new"]
+
+    def test_save_and_load(self, temp_dir):
+        store = TrendStore()
+        store.add("ai", 2.0, self.NOW - timedelta(hours=2))
+        store.add("ai", 4.0, self.NOW)
+        path = temp_dir / "trends.json"
+        store.save(path)
+
+        loaded = TrendStore.load(path)
+        assert loaded.history("ai", days=1, now=self.NOW) == store.history("ai", days=1, now=self.NOW)
+
+    def test_extractor_records_trends(self, extractor):
+        extractor.extract_keywords("python python rust")
+        assert "python" in extractor.trend_store
+        assert extractor.analyze_trends("python").keyword == "python"
+        extractor.clear_history()
+        assert len(extractor.trend_store) == 0
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """로컬 스텁 서버: 페이지/대용량/느린 응답/404"""
+
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    PAGE = (b"<html><head><title>t</title><style>p{}</style></head><body>"
+            b"<script>var hidden = 1;</script><p>python &amp; asyncio</p><p>python crawler</p></body></html>")
+
+    def do_GET(self):
+        if self.path == "/missing":
+            self.send_error(404)
+            return
+        if self.path.startswith("/slow"):
+            with self.lock:
+                type(self).active += 1
+                type(self).peak = max(type(self).peak, type(self).active)
+            time.sleep(0.05)
+            with self.lock:
+                type(self).active -= 1
+        body = b"<p>" + b"word " * 200_000 + b"</p>" if self.path == "/big" else self.PAGE
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    """스텁 HTTP 서버 base URL"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+class TestWebScraper:
+    """비동기 웹 수집 테스트"""
+
+    def test_incremental_parser_skips_scripts(self):
+        parser = HTMLTextExtractor()
+        for piece in ["<p>hel", "lo</p><scr", "ipt>x=1</script><b>wor", "ld &amp; more</b>"]:
+            parser.feed(piece)
+        parser.close()
+        assert parser.text() == "hello world & more"
+
+    def test_fetch_caps_body_and_reports_errors(self, stub_server):
+        scraper = WebScraper(max_bytes=10_000)
+        results = scraper.scrape_multiple_urls([f"{stub_server}/page", f"{stub_server}/big", f"{stub_server}/missing"])
+
+        assert results[f"{stub_server}/page"] == "t python & asyncio python crawler"
+        assert len(results[f"{stub_server}/big"]) < 10_000
+        assert results[f"{stub_server}/missing"].startswith("Error:")
+
+    def test_per_host_concurrency_limit(self, stub_server):
+        _StubHandler.peak = 0
+        scraper = WebScraper(per_host_limit=2)
+        urls = [f"{stub_server}/slow{i}" for i in range(6)]
+        assert len(scraper.scrape_multiple_urls(urls)) == 6
+        assert _StubHandler.peak <= 2
+
+    def test_max_workers_is_per_call(self, stub_server):
+        _StubHandler.peak = 0
+        scraper = WebScraper(max_connections=20, per_host_limit=4)
+        urls = [f"{stub_server}/slow{i}" for i in range(4)]
+        assert len(scraper.scrape_multiple_urls(urls, max_workers=1)) == 4
+        assert _StubHandler.peak == 1
+        assert scraper.max_connections == 20
+
+    def test_sync_api_inside_event_loop_points_to_async_variant(self, extractor):
+        async def call_sync():
+            with pytest.raises(RuntimeError, match="ascrape_multiple_urls"):
+                WebScraper().scrape_multiple_urls(["http://127.0.0.1:9/"])
+            with pytest.raises(RuntimeError, match="aextract_from_web"):
+                extractor.extract_from_web(["http://127.0.0.1:9/"])
+
+        asyncio.run(call_sync())
+
+    def test_extract_from_web(self, stub_server, extractor):
+        urls = [f"{stub_server}/page", f"{stub_server}/missing"]
+        results = extractor.extract_from_web(urls, top_k=3)
+
+        assert list(results) == urls
+        assert results[urls[0]].keywords[0] == ("python", 2)
+        assert "error" in results[urls[1]].parameters
+
+
+class TestStreamingFileExtraction:
+    """파일 스트리밍 추출 테스트"""
+
+    TEXT = ("Python streaming parser reads python files. Contact me@example.com or visit "
+            "https://example.com/python today.\n한국어 키워드 추출 스트리밍 python parser\n") * 20
+
+    @pytest.mark.parametrize("n_gram", [1, 2, 3])
+    def test_matches_in_memory_extraction(self, extractor, temp_dir, n_gram):
+        path = temp_dir / "doc.txt"
+        path.write_text(self.TEXT, encoding="utf-8")
+
+        expected = extractor.extract_keywords(self.TEXT, n_gram=n_gram, top_k=8)
+        streamed = extractor.extract_keywords_from_file(path, n_gram=n_gram, top_k=8, chunk_chars=13)
+        assert streamed.keywords == expected.keywords
+        assert streamed.stats["total_ngrams"] == expected.stats["total_ngrams"]
+
+    def test_jsonl_records(self, extractor, temp_dir):
+        records = [{"id": i, "text": f"record {i} streaming jsonl keyword"} for i in range(5)]
+        path = temp_dir / "docs.jsonl"
+        path.write_text("\n".join(json.dumps(r) for r in records), encoding="utf-8")
+
+        result = extractor.extract_keywords_from_file(path, top_k=3)
+        assert dict(result.keywords) == {"record": 5, "streaming": 5, "jsonl": 5}
+
+    @pytest.mark.parametrize("data", [
+        {"content": "python python python data data science", "title": "python guide"},
+        {"id": 1, "summary": "streaming json keyword", "note": "json keyword"},
+        ["python data", "python"],
+    ])
+    def test_json_document_matches_load_from_file(self, extractor, temp_dir, data):
+        """.json 은 키/문장부호가 아니라 load_from_file 과 같은 필드만 집계"""
+        path = temp_dir / "doc.json"
+        path.write_text(json.dumps(data), encoding="utf-8")
+
+        expected = extractor.extract_keywords(extractor.load_from_file(path), top_k=5)
+        streamed = extractor.extract_keywords_from_file(path, top_k=5, chunk_chars=7)
+        assert streamed.keywords == expected.keywords
+
+    def test_not_limited_by_max_text_length(self, temp_dir):
+        extractor = KeywordExtractor(enable_semantic_analysis=False, max_text_length=100)
+        path = temp_dir / "long.txt"
+        path.write_text("alpha beta " * 1000, encoding="utf-8")
+        result = extractor.extract_keywords_from_file(path, top_k=2, chunk_chars=64)
+        assert dict(result.keywords) == {"alpha": 1000, "beta": 1000}
+
+    def test_space_saving_keeps_heavy_hitters(self):
+        sketch = SpaceSaving(capacity=20)
+        for i in range(5000):
+            sketch.update(f"rare{i}")
+            if i % 5 == 0:
+                sketch.update("heavy")
+            if i % 10 == 0:
+                sketch.update("medium")
+        assert len(sketch) == 20
+        top = sketch.most_common(2)
+        assert [k for k, _ in top] == ["heavy", "medium"]
+        assert top[0][1] - sketch.errors["heavy"] <= 1000 <= top[0][1]
+
+
+class TestKeywordMatcher:
+    """다중 키워드 매처/필터 테스트"""
+
+    def test_first_positions_match_str_find(self):
+        text = "the big data pipeline: data lake, big datasets and python3 with python"
+        keywords = ["data", "big data", "big", "python", "python3", "lake", "missing", "a"]
+        positions = KeywordMatcher(keywords).first_positions(text)
+        assert positions == {k: text.find(k) for k in keywords if k in text}
+
+    def test_recompile_keeps_results(self):
+        text = "ab " * 2000 + "zz ab cd"
+        matcher = KeywordMatcher(["ab", "cd", "zz", "qq"])
+        matcher.RECOMPILE_AFTER = 4
+        assert matcher.first_positions(text) == {"ab": 0, "zz": 6000, "cd": 6006}
+
+    def test_advanced_scores_use_first_position(self, extractor):
+        text = "Alpha beta gamma. " + "filler " * 50 + "delta"
+        scores = dict(extractor._calculate_advanced_scores([("alpha", 1), ("delta", 1), ("omega", 1)], text))
+        assert scores["alpha"] > scores["delta"]
+        assert scores["omega"] == pytest.approx(1 * (0.7 + 0.2 * 0.5 + 0.1 * 1.2))
+
+    def test_filter_patterns(self, extractor):
+        keywords = [("Python parser", 3), ("data", 2), ("big data", 2), ("rust", 1)]
+        assert extractor.filter_keywords(keywords, exclude_patterns=["data", "^r"]) == [("Python parser", 3)]
+        assert extractor.filter_keywords(keywords, include_patterns=["a", "d"]) == [("data", 2), ("big data", 2)]
+        assert extractor.filter_keywords(keywords, include_patterns=[r"(a)t\1"]) == [("data", 2), ("big data", 2)]
@@ -0,0 +1,80 @@
+"""
+ocr.py page distribution tests
+ocr.py 페이지 분배 테스트
+"""
+
+import pytest
+import pytesseract
+from PIL import Image
+
+from garage import ocr
+
+
+@pytest.fixture
+def sample_pdf(temp_dir):
+    """크기가 서로 다른 5페이지 PDF"""
+    pages = [Image.new("RGB", (100 + i * 10, 150), "white") for i in range(5)]
+    path = temp_dir / "sample.pdf"
+    pages[0].save(path, save_all=True, append_images=pages[1:])
+    return path
+
+
+@pytest.fixture
+def fake_tesseract(monkeypatch):
+    """이미지 크기를 단어로 돌려주는 가짜 OCR"""
+    def image_to_data(image, **kwargs):
+        return {"text": [f"w{image.size[0]}"], "conf": [90], "left": [0], "top": [0], "width": [1], "height": [1]}
+    monkeypatch.setattr(pytesseract, "image_to_data", image_to_data)
+
+
+class TestPageRanges:
+    """구간 분배 테스트"""
+
+    def test_ranges_cover_document_in_order(self):
+        args = ocr.make_page_ranges("a.pdf", 1, 10, 300, 50, True, workers=3, chunk_size=4)
+        assert [(a[1], a[2]) for a in args] == [(1, 4), (5, 8), (9, 10)]
+
+    def test_small_documents_still_use_all_workers(self):
+        args = ocr.make_page_ranges("a.pdf", 1, 4, 300, 50, True, workers=4, chunk_size=8)
+        assert len(args) == 4
+
+
+class TestProcessPageRange:
+    """워커 측 래스터화 + OCR 테스트"""
+
+    def test_worker_rasterizes_its_own_pages(self, sample_pdf, fake_tesseract):
+        results = ocr.process_page_range((str(sample_pdf), 2, 4, 72, 50, False))
+        assert [r["page"] for r in results] == [2, 3, 4]
+        assert [r["results"][0]["text"] for r in results] == ["w110", "w120", "w130"]
+
+    def test_preprocessed_chunk_keeps_page_order_and_size(self, sample_pdf, fake_tesseract, monkeypatch):
+        """구간을 한 번에 전처리 (크기가 다른 페이지도 입력 순서대로 OCR)"""
+        batches = []
+        batch = ocr.preprocess_batch
+        monkeypatch.setattr(ocr, "preprocess_batch",
+                            lambda pages, *a, **kw: batches.append(len(pages)) or batch(pages, *a, **kw))
+        results = ocr.process_page_range((str(sample_pdf), 1, 5, 72, 50, True))
+        assert batches == [5]
+        assert [r["results"][0]["text"] for r in results] == ["w100", "w110", "w120", "w130", "w140"]
+
+    def test_rasterize_failure_marks_pages(self, temp_dir):
+        results = ocr.process_page_range((str(temp_dir / "missing.pdf"), 1, 2, 72, 50, False))
+        assert [r["page"] for r in results] == [1, 2]
+        assert all("error" in r for r in results)
+
+
+class TestOCRWorkerPool:
+    """상주 워커 풀 테스트"""
+
+    def test_pool_is_reused_across_runs(self, temp_dir):
+        missing = str(temp_dir / "missing.pdf")
+        with ocr.OCRWorkerPool(workers=2, warm_up=False, max_in_flight=2) as pool:
+            first = pool.run([(missing, 1, 2, 72, 50, False), (missing, 3, 3, 72, 50, False)])
+            second = pool.run([(missing, 1, 1, 72, 50, False)] * 3)
+            stats = pool.stats()
+
+        assert [r["page"] for r in first] == [1, 2, 3]
+        assert len(second) == 3
+        assert stats["tasks"] == 5
+        assert stats["pages"] == 6
+        assert 0.0 <= stats["utilization"] <= 1.0
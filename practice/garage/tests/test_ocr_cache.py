@@ -0,0 +1,169 @@
+"""
+OCR page cache tests
+OCR 페이지 캐시 테스트
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from garage.config import CacheSettings
+from garage.ocr_cache import DpiChoiceStore, OCRPageCache, file_fingerprint, get_page_cache
+
+
+@pytest.fixture
+def cache(temp_dir):
+    """테스트용 캐시"""
+    return OCRPageCache(temp_dir, ttl_seconds=60, max_size_mb=1)
+
+
+class TestCacheKey:
+    """캐시 키 테스트"""
+
+    def test_same_raster_same_key(self):
+        """동일 래스터/옵션이면 동일 키"""
+        img1 = Image.new('L', (50, 50), color=255)
+        img2 = Image.new('L', (50, 50), color=255)
+        assert OCRPageCache.make_key(img1, 300, "eng", 50, {}) == OCRPageCache.make_key(img2, 300, "eng", 50, {})
+
+    def test_options_change_key(self):
+        """DPI/언어/신뢰도/전처리 옵션이 키에 반영되는지"""
+        img = Image.new('L', (50, 50), color=255)
+        base = OCRPageCache.make_key(img, 300, "eng", 50, {"threshold": 140})
+        assert base != OCRPageCache.make_key(img, 400, "eng", 50, {"threshold": 140})
+        assert base != OCRPageCache.make_key(img, 300, "kor", 50, {"threshold": 140})
+        assert base != OCRPageCache.make_key(img, 300, "eng", 60, {"threshold": 140})
+        assert base != OCRPageCache.make_key(img, 300, "eng", 50, {"threshold": 150})
+
+    def test_pixels_change_key(self):
+        """픽셀이 다르면 다른 키"""
+        img1 = Image.new('L', (50, 50), color=255)
+        img2 = Image.new('L', (50, 50), color=254)
+        assert OCRPageCache.make_key(img1, 300, "eng", 50, {}) != OCRPageCache.make_key(img2, 300, "eng", 50, {})
+
+    def test_array_matches_image_key(self):
+        """래스터 배열과 같은 픽셀의 이미지는 같은 키 (배열 경로와 이미지 경로가 캐시를 공유)"""
+        rgb = np.random.default_rng(1).integers(0, 256, (30, 20, 3), dtype=np.uint8)
+        for arr in (rgb, rgb[..., 0].copy(), np.asfortranarray(rgb)):
+            img = Image.fromarray(np.ascontiguousarray(arr))
+            assert OCRPageCache.make_key(arr, 300, "eng", 50, {}) == OCRPageCache.make_key(img, 300, "eng", 50, {})
+
+
+class TestOCRPageCache:
+    """캐시 동작 테스트"""
+
+    def test_put_get(self, cache):
+        """저장 후 조회"""
+        words = [{"text": "Hello", "confidence": 90}]
+        cache.put("ab" * 32, "eng", pdf=b"%PDF-page", words=words)
+
+        hit = cache.get("ab" * 32, require_words=True)
+        assert hit["pdf"] == b"%PDF-page"
+        assert hit["lang"] == "eng"
+        assert hit["words"] == words
+
+    def test_missing_words_is_miss(self, cache):
+        """단어가 필요한데 저장되지 않았으면 미스"""
+        cache.put("cd" * 32, "eng", pdf=b"%PDF")
+        assert cache.get("cd" * 32) is not None
+        assert cache.get("cd" * 32, require_words=True) is None
+
+    def test_ttl_expiry(self, temp_dir):
+        """TTL 만료 엔트리는 미스 처리 후 삭제"""
+        cache = OCRPageCache(temp_dir, ttl_seconds=0, max_size_mb=1)
+        cache.put("ef" * 32, "eng", pdf=b"%PDF")
+        time.sleep(0.01)
+        assert cache.get("ef" * 32) is None
+        assert cache.stats()["entries"] == 0
+
+    def test_lru_eviction(self, cache):
+        """용량 초과 시 가장 오래 접근하지 않은 엔트리부터 삭제"""
+        payload = b"x" * (300 * 1024)
+        keys = [f"{i:02d}" * 32 for i in range(3)]
+        for i, key in enumerate(keys):
+            cache.put(key, "eng", pdf=payload)
+            meta_path, _ = cache._paths(key)
+            os.utime(meta_path, (1000 + i, 1000 + i))
+
+        # 첫 엔트리를 최근에 접근한 것으로 갱신
+        assert cache.get(keys[0]) is not None
+
+        # 1MB 초과 → 오래된 keys[1] 부터 제거
+        cache.put("99" * 32, "eng", pdf=payload)
+        assert cache.get(keys[1]) is None
+        assert cache.get(keys[0]) is not None
+        assert cache.get("99" * 32) is not None
+
+
+class TestSettingsIntegration:
+    """CacheSettings 연동 테스트"""
+
+    def test_disabled_returns_none(self, temp_dir):
+        """비활성화 시 캐시 없음"""
+        settings = CacheSettings(enabled=False, cache_directory=str(temp_dir))
+        assert OCRPageCache.from_settings(settings) is None
+        assert get_page_cache(settings) is None
+
+    def test_settings_applied(self, temp_dir):
+        """설정값이 캐시에 반영되는지"""
+        settings = CacheSettings(ttl_seconds=10, max_size_mb=2, cache_directory=str(temp_dir))
+        cache = get_page_cache(settings)
+        assert cache.ttl_seconds == 10
+        assert cache.max_size_bytes == 2 * 1024 * 1024
+        assert cache.root == Path(temp_dir) / "ocr"
+        assert get_page_cache(settings) is cache
+
+
+class TestDpiChoiceStore:
+    """문서별 DPI 선택 저장소 테스트"""
+
+    def test_fingerprint_follows_content(self, temp_dir):
+        """같은 내용이면 같은 지문, 내용이 바뀌면 다른 지문"""
+        a, b = temp_dir / "a.pdf", temp_dir / "b.pdf"
+        a.write_bytes(b"%PDF" + os.urandom(3 * 1024 * 1024))
+        b.write_bytes(a.read_bytes())
+        assert file_fingerprint(a) == file_fingerprint(b)
+
+        b.write_bytes(a.read_bytes()[:-1] + b"x")
+        assert file_fingerprint(a) != file_fingerprint(b)
+
+    def test_put_get_by_params(self, temp_dir):
+        """프로브 파라미터가 다르면 저장된 선택을 재사용하지 않음"""
+        store = DpiChoiceStore(OCRPageCache(temp_dir))
+        key = store.make_key("fp", [300, 200, 400], "eng", 50)
+        assert store.get(key) is None
+
+        store.put(key, 300, {200: 10, 300: 40})
+        assert DpiChoiceStore(OCRPageCache(temp_dir)).get(key) == 300
+        assert store.get(store.make_key("fp", [200, 300, 400], "eng", 50)) == 300
+        assert store.get(store.make_key("fp", [200, 300], "eng", 50)) is None
+        assert store.get(store.make_key("fp", [200, 300, 400], "kor", 50)) is None
+
+    def test_choices_follow_cache_ttl_and_eviction(self, temp_dir):
+        """DPI 선택도 페이지 캐시의 TTL/용량 정책을 따름"""
+        cache = OCRPageCache(temp_dir, ttl_seconds=60, max_size_mb=1)
+        store = DpiChoiceStore(cache)
+        key = store.make_key("fp", [200, 300], "eng", 50)
+        store.put(key, 200)
+        assert cache.stats()["entries"] == 1
+
+        meta_path = cache._paths(key)[0]
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        meta["created_at"] -= 120
+        meta_path.write_text(json.dumps(meta), encoding="utf-8")
+        assert store.get(key) is None
+        assert not meta_path.exists()
+
+        cache.max_size_bytes = 0
+        store.put(key, 300)
+        assert cache.stats()["entries"] == 0
+
+    def test_from_settings_shares_page_cache(self, temp_dir):
+        settings = CacheSettings(cache_directory=str(temp_dir))
+        assert DpiChoiceStore.from_settings(settings).cache is get_page_cache(settings)
+        assert DpiChoiceStore.from_settings(CacheSettings(enabled=False)) is None
@@ -0,0 +1,102 @@
+"""
+Preprocessing engine tests
+NumPy 전처리 엔진 테스트 (기존 PIL 파이프라인과 픽셀 동등성)
+"""
+
+import numpy as np
+import pytest
+from PIL import Image, ImageOps
+
+from garage.preprocess import (
+    adaptive_threshold,
+    binarize_gray,
+    binarize_image,
+    binarize_page,
+    denoise_gray,
+    denoise_page,
+    otsu_threshold,
+    preprocess_batch,
+    reference_binarize_pil,
+    reference_denoise_pil,
+    to_gray,
+)
+
+
+@pytest.fixture
+def pages():
+    """크기/밝기 분포가 다른 테스트 페이지들"""
+    rng = np.random.default_rng(42)
+    out = []
+    for h, w in [(37, 53), (64, 64), (120, 90)]:
+        out.append(rng.integers(0, 256, (h, w, 3), dtype=np.uint8))
+        out.append((rng.integers(0, 64, (h, w, 3)) + 100).astype(np.uint8))  # 좁은 대비
+    out.append(np.full((20, 30, 3), 77, dtype=np.uint8))  # 단색 페이지
+    return out
+
+
+class TestPixelEquivalence:
+    """기존 PIL 함수와 픽셀 동등성"""
+
+    def test_grayscale(self, pages):
+        for arr in pages:
+            expected = np.asarray(Image.fromarray(arr).convert("L"))
+            assert np.array_equal(to_gray(arr), expected)
+            assert np.array_equal(to_gray(np.asfortranarray(arr)), expected)
+
+    def test_binarize_matches_search_pdf_preprocess(self, pages):
+        for arr in pages:
+            img = Image.fromarray(arr)
+            expected = reference_binarize_pil(img)
+            actual = binarize_image(img)
+            assert actual.mode == "1"
+            assert actual.tobytes() == expected.tobytes()
+            assert np.array_equal(binarize_page(arr) > 0, np.asarray(expected))
+
+    def test_denoise_matches_ocr_preprocess_image(self, pages):
+        for arr in pages:
+            expected = np.asarray(reference_denoise_pil(Image.fromarray(arr)))
+            assert np.array_equal(denoise_page(arr), expected)
+
+    @pytest.mark.parametrize("mode", ["fixed", "otsu", "adaptive"])
+    def test_batch_matches_single_pages(self, pages, mode):
+        """(N, H, W) 묶음 처리 결과가 페이지별 처리와 동일 (크기가 다른 페이지 혼합)"""
+        batch = preprocess_batch(pages, binarize_gray, mode=mode)
+        assert [b.shape for b in batch] == [p.shape[:2] for p in pages]
+        for arr, out in zip(pages, batch):
+            assert np.array_equal(out, binarize_page(arr, mode=mode))
+            assert np.array_equal(out, binarize_page(Image.fromarray(arr), mode=mode))
+
+    def test_denoise_batch_matches_single_pages(self, pages):
+        gray = [to_gray(p) for p in pages]  # 그레이스케일 입력도 그대로 받음
+        for arr, out in zip(pages, preprocess_batch(gray, denoise_gray)):
+            assert np.array_equal(out, denoise_page(arr))
+
+
+class TestThresholds:
+    """자동 임계값 테스트"""
+
+    def test_otsu_separates_bimodal(self):
+        gray = np.concatenate([np.full(500, 40), np.full(500, 200)]).astype(np.uint8).reshape(20, 50)
+        t = otsu_threshold(gray)
+        assert 40 < t <= 200
+
+    def test_otsu_mode_uses_stretched_histogram(self):
+        """autocontrast 후 Otsu 임계값 = 스트레칭된 페이지에 직접 Otsu 를 적용한 결과"""
+        rng = np.random.default_rng(3)
+        gray = np.concatenate([rng.normal(110, 6, 600), rng.normal(150, 6, 400)]).clip(0, 255)
+        gray = gray.astype(np.uint8).reshape(25, 40)
+        stretched = np.asarray(ImageOps.autocontrast(Image.fromarray(gray)))
+        expected = np.where(stretched < otsu_threshold(stretched), 0, 255)
+        assert np.array_equal(binarize_gray(gray, mode="otsu"), expected)
+
+    def test_adaptive_handles_uneven_lighting(self):
+        # 왼쪽→오른쪽으로 밝아지는 배경 위 어두운 글자 한 줄
+        gray = np.tile(np.linspace(60, 250, 100), (40, 1)).astype(np.uint8)
+        gray[18:22, 10:90] -= 50
+        out = adaptive_threshold(gray, block_size=15, offset=10)
+        assert (out[18:22, 10:90] == 0).all()
+        assert (out[:10] == 255).all()
+
+    def test_unknown_mode_rejected(self):
+        with pytest.raises(ValueError, match="unknown binarize mode"):
+            binarize_gray(np.zeros((4, 4), dtype=np.uint8), mode="sauvola")
@@ -0,0 +1,99 @@
+"""
+Progress hub tests
+진행률 pub/sub 테스트 (구독/합치기/종료, 워커 프로세스 중계)
+"""
+
+import asyncio
+
+from garage.job_queue import JobScheduler
+from garage.progress import ProgressHub, ProgressRelay, init_progress_worker, progress_reporter
+
+
+def report_pages(task_id, pages):
+    """워커 프로세스에서 페이지 진행 이벤트를 보내는 작업"""
+    report = progress_reporter(task_id)
+    for page in range(1, pages + 1):
+        report({"stage": "ocr", "page": page, "processed_pages": page, "total_pages": pages})
+    return pages
+
+
+async def collect(stream, into):
+    async for event in stream:
+        into.append(event)
+
+
+class TestProgressHub:
+    """허브 동작"""
+
+    def test_many_subscribers_share_one_stream(self):
+        async def scenario():
+            hub = ProgressHub()
+            received = [[] for _ in range(200)]
+            watchers = [asyncio.create_task(collect(hub.subscribe("t"), r)) for r in received]
+            await asyncio.sleep(0)
+            assert hub.subscriber_count("t") == 200
+
+            hub.publish("t", {"status": "in_progress", "processed_pages": 1})
+            await asyncio.sleep(0)
+            hub.publish("t", {"status": "completed", "processed_pages": 2})
+            await asyncio.gather(*watchers)
+            return hub, received
+
+        hub, received = asyncio.run(scenario())
+        assert all(r[-1]["status"] == "completed" for r in received)
+        assert all(len(r) <= 2 for r in received)
+        assert len(hub) == 0  # 종료 후 구독자가 모두 떠나면 토픽 삭제
+
+    def test_slow_subscriber_gets_latest_state(self):
+        async def scenario():
+            hub = ProgressHub()
+            stream = hub.subscribe("t", initial={"status": "pending"})
+            first = await stream.__anext__()
+            for page in range(1, 50):
+                hub.publish("t", {"status": "in_progress", "processed_pages": page})
+            second = await stream.__anext__()
+            await stream.aclose()
+            return first, second, hub
+
+        first, second, hub = asyncio.run(scenario())
+        assert first == {"status": "pending"}
+        assert second["processed_pages"] == 49
+        assert hub.subscriber_count() == 0
+
+    def test_heartbeat_and_finished_task(self):
+        async def scenario():
+            hub = ProgressHub()
+            stream = hub.subscribe("t", heartbeat=0.01)
+            beat = await stream.__anext__()
+            await stream.aclose()
+            done = [e async for e in hub.subscribe("x", initial={"status": "failed"})]
+            return beat, done
+
+        beat, done = asyncio.run(scenario())
+        assert beat is None
+        assert done == [{"status": "failed"}]
+
+
+def test_relay_forwards_worker_events():
+    async def scenario():
+        hub = ProgressHub()
+        relay = ProgressRelay(hub.publish)
+        relay.start(asyncio.get_running_loop())
+        scheduler = JobScheduler(workers=1, initializer=init_progress_worker, initargs=(relay.queue,))
+        await scheduler.start()
+
+        received = []
+        watcher = asyncio.create_task(collect(hub.subscribe("job"), received))
+        await asyncio.sleep(0)
+        scheduler.submit("job", "k", report_pages, "job", 3)
+        while not received or received[-1]["processed_pages"] < 3:
+            await asyncio.sleep(0.01)
+        hub.publish("job", {"status": "completed", "processed_pages": 3})
+        await watcher
+        await scheduler.stop()
+        relay.stop()
+        return received
+
+    received = asyncio.run(asyncio.wait_for(scenario(), 30))
+    assert received[-2]["page"] == 3
+    assert received[-1]["status"] == "completed"
@@ -0,0 +1,95 @@
+"""
+Rasterize tests
+래스터화 단계 테스트 (페이지 구간 분할, pdftoppm 대체 경로)
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from garage import rasterize
+from garage.rasterize import chunk_page_ranges, iter_page_arrays, iter_page_images
+
+
+class TestChunkPageRanges:
+    """연속 페이지 구간 분할"""
+
+    def test_single_page(self):
+        assert chunk_page_ranges([1], 8) == [(1, 1)]
+
+    def test_more_workers_than_pages(self):
+        """구간 크기 1 (워커 수 > 페이지 수 일 때 process_pdf_with_checkpoint 가 쓰는 값)"""
+        assert chunk_page_ranges([1, 2, 3], 1) == [(1, 1), (2, 2), (3, 3)]
+
+    def test_partial_last_chunk(self):
+        assert chunk_page_ranges(list(range(1, 11)), 4) == [(1, 4), (5, 8), (9, 10)]
+
+    def test_gaps_split_ranges(self):
+        """이미 완료된 페이지를 건너뛰면 구간이 끊김 (입력 순서와 무관)"""
+        assert chunk_page_ranges([7, 2, 3, 5, 6], 8) == [(2, 3), (5, 7)]
+
+    def test_empty(self):
+        assert chunk_page_ranges([], 4) == []
+
+
+@pytest.fixture
+def fake_pdftoppm(monkeypatch):
+    """PyMuPDF 없이 pdftoppm(convert_from_path) 경로를 타도록 대체"""
+    calls = []
+
+    def convert_from_path(pdf_path, dpi, first_page, last_page, output_folder, paths_only):
+        calls.append((first_page, last_page, dpi))
+        paths = []
+        for page in range(first_page, last_page + 1):
+            path = Path(output_folder) / f"out-{page:03d}.png"
+            Image.new("RGB", (10 * page, 10), "white").save(path)
+            paths.append(str(path))
+        return list(reversed(paths))  # 순서가 보장되지 않아도 정렬해서 내보내는지 확인
+
+    monkeypatch.setattr(rasterize, "fitz", None)
+    monkeypatch.setattr(rasterize, "convert_from_path", convert_from_path)
+    return calls
+
+
+class TestPdftoppmFallback:
+    """pdftoppm 대체 경로"""
+
+    def test_renders_range_once_and_yields_in_order(self, fake_pdftoppm):
+        pages = [(page, img.size) for page, img in iter_page_images("doc.pdf", 3, 5, 150)]
+
+        assert pages == [(3, (30, 10)), (4, (40, 10)), (5, (50, 10))]
+        assert fake_pdftoppm == [(3, 5, 150)]
+
+    def test_files_are_removed_as_consumed(self, fake_pdftoppm, temp_dir, monkeypatch):
+        monkeypatch.setattr(rasterize.tempfile, "tempdir", str(temp_dir))
+        stream = iter_page_images("doc.pdf", 1, 2, 72)
+        next(stream)
+        leftovers = [p.name for d in temp_dir.glob("raster_*") for p in d.iterdir()]
+        assert leftovers == ["out-002.png"]
+        stream.close()
+        assert not list(temp_dir.glob("raster_*"))
+
+    def test_arrays_match_images(self, fake_pdftoppm):
+        arrays = list(iter_page_arrays("doc.pdf", 1, 2, 72))
+        assert [(page, arr.shape) for page, arr in arrays] == [(1, (10, 10, 3)), (2, (10, 20, 3))]
+
+
+class TestPageArrays:
+    """배열 래스터화 (PyMuPDF 픽스맵 버퍼)"""
+
+    @pytest.mark.skipif(rasterize.fitz is None, reason="PyMuPDF not installed")
+    def test_pixmap_arrays_match_images(self, temp_dir):
+        rng = np.random.default_rng(5)
+        pages = [Image.fromarray(rng.integers(0, 256, (40, 30 + 10 * i, 3), dtype=np.uint8)) for i in range(3)]
+        path = temp_dir / "pages.pdf"
+        pages[0].save(path, save_all=True, append_images=pages[1:], resolution=72)
+
+        images = list(iter_page_images(path, 2, 3, 72))
+        arrays = list(iter_page_arrays(path, 2, 3, 72))
+
+        assert [page for page, _ in arrays] == [2, 3]
+        for (_, img), (_, arr) in zip(images, arrays):
+            assert arr.dtype == np.uint8 and arr.shape == (img.height, img.width, 3)
+            assert np.array_equal(arr, np.asarray(img))
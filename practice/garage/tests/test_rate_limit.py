@@ -0,0 +1,125 @@
+"""
+Rate limit tests
+토큰 버킷 요청 제한 테스트 (충전, LRU 상한, SQLite 공유, 미들웨어 429)
+"""
+
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from garage.rate_limit import (
+    RateLimiter,
+    RateLimitMiddleware,
+    SQLiteTokenBucketLimiter,
+    TokenBucketLimiter,
+    client_key_from_scope,
+)
+
+
+class TestTokenBucket:
+    """메모리 토큰 버킷"""
+
+    def test_burst_then_refill(self):
+        limiter = TokenBucketLimiter(requests_per_minute=60, burst=3)
+        assert all(limiter.acquire("a", now=0.0)[0] for _ in range(3))
+
+        allowed, retry_after = limiter.acquire("a", now=0.0)
+        assert not allowed and retry_after == 1.0
+        assert limiter.acquire("b", now=0.0)[0]  # 클라이언트별 버킷
+
+        assert limiter.acquire("a", now=1.0)[0]
+        assert not limiter.acquire("a", now=1.0)[0]
+
+    def test_client_state_is_lru_bounded(self):
+        limiter = TokenBucketLimiter(requests_per_minute=1, max_clients=100)
+        for i in range(1000):
+            limiter.acquire(f"ip:{i}", now=0.0)
+        assert len(limiter) == 100
+
+    def test_client_key_uses_only_verified_tokens(self):
+        def scope(token):
+            return {"headers": [(b"authorization", f"Bearer {token}".encode())], "client": ("1.2.3.4", 1)}
+
+        assert client_key_from_scope(scope("secret"), api_key="secret").startswith("key:")
+        assert "secret" not in client_key_from_scope(scope("secret"), api_key="secret")
+        assert client_key_from_scope(scope("guess"), api_key="secret") == "ip:1.2.3.4"
+        assert client_key_from_scope(scope("secret")) == "ip:1.2.3.4"  # 인증 비활성화
+        assert client_key_from_scope({"headers": [], "client": ("1.2.3.4", 1)}, "secret") == "ip:1.2.3.4"
+
+
+def test_sqlite_buckets_are_shared(temp_dir):
+    path = temp_dir / "ratelimit.db"
+    first = SQLiteTokenBucketLimiter(path, requests_per_minute=60, burst=2)
+    second = SQLiteTokenBucketLimiter(path, requests_per_minute=60, burst=2)
+
+    assert first.acquire("a", now=100.0)[0]
+    assert second.acquire("a", now=100.0)[0]
+    allowed, retry_after = first.acquire("a", now=100.0)
+    assert not allowed and retry_after == 1.0
+    assert second.acquire("a", now=101.0)[0]
+
+    first.clear()
+    assert second.acquire("a", now=101.0)[0]
+    first.close()
+    second.close()
+
+
+def make_client(**middleware_kwargs):
+    app = FastAPI()
+    app.add_middleware(RateLimitMiddleware, **middleware_kwargs)
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    return TestClient(app)
+
+
+def api_settings(**overrides):
+    values = dict(rate_limit_enabled=True, requests_per_minute=1, rate_limit_burst=0, rate_limit_backend="memory",
+                  rate_limit_db_path=None, rate_limit_max_clients=10, api_key=None)
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+class TestMiddleware:
+    """ASGI 미들웨어"""
+
+    def test_rejects_with_retry_after(self):
+        client = make_client(requests_per_minute=2)
+        assert [client.get("/ping").status_code for _ in range(2)] == [200, 200]
+
+        response = client.get("/ping")
+        assert response.status_code == 429
+        assert int(response.headers["retry-after"]) >= 1
+        assert "Rate limit" in response.json()["detail"]
+
+    def test_rotating_tokens_do_not_get_fresh_buckets(self):
+        client = make_client(requests_per_minute=2, api_key="secret")
+        statuses = [client.get("/ping", headers={"Authorization": f"Bearer random-{i}"}).status_code
+                    for i in range(3)]
+        assert statuses == [200, 200, 429]
+        assert client.get("/ping", headers={"Authorization": "Bearer secret"}).status_code == 200
+
+    def test_shared_limiter_is_reconfigured_and_reset(self):
+        limiter = RateLimiter(requests_per_minute=100)
+        client = make_client(limiter=limiter)
+        assert client.get("/ping").status_code == 200
+
+        limiter.configure_from_settings(api_settings())
+        assert [client.get("/ping").status_code for _ in range(2)] == [200, 429]
+        limiter.reset()
+        assert client.get("/ping").status_code == 200
+
+        limiter.configure_from_settings(api_settings(rate_limit_enabled=False))
+        assert all(client.get("/ping").status_code == 200 for _ in range(5))
+
+    @pytest.mark.parametrize("overrides", [{"rate_limit_backend": "redis"}, {"requests_per_minute": 0},
+                                           {"rate_limit_backend": "sqlite"}])
+    def test_invalid_settings_are_rejected(self, overrides):
+        limiter = RateLimiter(requests_per_minute=5)
+        with pytest.raises(ValueError):
+            limiter.configure_from_settings(api_settings(**overrides))
+        assert limiter.enabled and limiter.buckets.capacity == 5  # 기존 설정 유지
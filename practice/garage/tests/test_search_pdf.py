@@ -0,0 +1,348 @@
+"""
+search_pdf checkpoint tests
+search_pdf 체크포인트 테스트
+"""
+
+import json
+
+import numpy as np
+import pytest
+from PIL import Image
+from pypdf import PdfReader
+
+from garage import search_pdf
+from garage.config import CacheSettings
+from garage.search_pdf import (
+    ProgressJournal,
+    finalize_merge,
+    process_pdf_with_checkpoint,
+    sample_page_numbers,
+    save_manifest,
+    write_json_sidecar_stream,
+)
+
+
+@pytest.fixture
+def manifest():
+    """테스트용 매니페스트"""
+    return {"file": "test.pdf", "dpi": 300, "lang_opt": "eng", "conf": 50,
+            "total_pages": 10, "completed_pages": []}
+
+
+class TestProgressJournal:
+    """진행 저널 테스트"""
+
+    def test_record_and_load(self, temp_dir):
+        """기록한 페이지가 다시 로드되는지"""
+        journal = ProgressJournal(temp_dir)
+        for page in (3, 1, 2):
+            journal.record(page)
+        journal.close()
+
+        assert ProgressJournal(temp_dir).load() == {1, 2, 3}
+
+    def test_torn_tail_is_discarded(self, temp_dir):
+        """기록 중 중단으로 잘린 마지막 줄은 무시하고 잘라냄"""
+        journal = ProgressJournal(temp_dir)
+        journal.record(1)
+        journal.record(2)
+        journal.close()
+        with open(journal.path, "a", encoding="utf-8") as f:
+            f.write('{"pa')
+
+        recovered = ProgressJournal(temp_dir)
+        assert recovered.load() == {1, 2}
+
+        # 복구 후 추가 기록이 깨진 줄에 이어붙지 않아야 함
+        recovered.record(3)
+        recovered.close()
+        assert ProgressJournal(temp_dir).load() == {1, 2, 3}
+
+    def test_compact_moves_pages_to_manifest(self, temp_dir, manifest):
+        """압축 시 매니페스트에 합쳐지고 저널은 삭제"""
+        save_manifest(temp_dir, manifest)
+        journal = ProgressJournal(temp_dir)
+        journal.record(5)
+        journal.record(4)
+        journal.compact(temp_dir, manifest, {4, 5})
+
+        saved = json.loads((temp_dir / "manifest.json").read_text(encoding="utf-8"))
+        assert saved["completed_pages"] == [4, 5]
+        assert not journal.path.exists()
+        assert not (temp_dir / "manifest.json.tmp").exists()
+
+
+@pytest.fixture
+def checkpoint_pages(temp_dir):
+    """PIL 로 만든 페이지 PDF + JSON 체크포인트 3장"""
+    ckpt_dir = temp_dir / "ckpt"
+    ckpt_dir.mkdir()
+    for i, size in enumerate([(200, 300), (300, 200), (250, 250)], start=1):
+        Image.new("RGB", size, (i * 60, 255, 255)).save(ckpt_dir / f"page_{i:05d}.pdf")
+        (ckpt_dir / f"page_{i:05d}.json").write_text(
+            json.dumps({"page": i, "lang": "eng", "words": [{"text": f"단어{i}", "conf": 90}]}, ensure_ascii=False),
+            encoding="utf-8")
+    return ckpt_dir
+
+
+class TestFinalizeMerge:
+    """최종 병합 테스트"""
+
+    @pytest.mark.parametrize("merge_mode", ["stream", "memory"])
+    def test_merge_modes_produce_same_pages(self, temp_dir, checkpoint_pages, merge_mode):
+        """두 병합 방식 모두 페이지 순서/크기와 사이드카 내용을 보존"""
+        out_pdf = temp_dir / f"out_{merge_mode}.pdf"
+        finalize_merge(temp_dir / "book.pdf", checkpoint_pages, out_pdf, True,
+                       total_pages=3, merge_mode=merge_mode)
+
+        reader = PdfReader(str(out_pdf))
+        sizes = [(round(float(p.mediabox.width)), round(float(p.mediabox.height))) for p in reader.pages]
+        assert sizes == [(200, 300), (300, 200), (250, 250)]
+        assert all("/XObject" in p["/Resources"] for p in reader.pages)
+
+        sidecar = json.loads(out_pdf.with_suffix(".json").read_text(encoding="utf-8"))
+        assert sidecar["file"] == "book.pdf"
+        assert [p["page"] for p in sidecar["pages"]] == [1, 2, 3]
+        assert sidecar["pages"][0]["words"][0]["text"] == "단어1"
+        assert not list(temp_dir.glob("*.part"))
+
+    def test_stream_sidecar_matches_memory_format(self, temp_dir, checkpoint_pages):
+        """스트리밍 사이드카는 memory 병합과 바이트 단위로 같은 들여쓰기 JSON"""
+        outputs = []
+        for merge_mode in ("stream", "memory"):
+            out_pdf = temp_dir / f"out_{merge_mode}.pdf"
+            finalize_merge(temp_dir / "book.pdf", checkpoint_pages, out_pdf, True,
+                           total_pages=3, merge_mode=merge_mode)
+            outputs.append(out_pdf.with_suffix(".json").read_text(encoding="utf-8"))
+        assert outputs[0] == outputs[1]
+
+    @pytest.mark.parametrize("header, pages", [({}, 2), ({"file": "a.pdf"}, 0), ({}, 0)])
+    def test_stream_sidecar_edge_cases(self, temp_dir, checkpoint_pages, header, pages):
+        """빈 헤더/빈 페이지 목록도 유효한 JSON"""
+        page_files = sorted(checkpoint_pages.glob("page_*.json"))[:pages]
+        out_json = temp_dir / "out.json"
+        write_json_sidecar_stream(out_json, header, page_files)
+
+        expected = {**header, "pages": [json.loads(p.read_text(encoding="utf-8")) for p in page_files]}
+        assert out_json.read_text(encoding="utf-8") == json.dumps(expected, ensure_ascii=False, indent=2)
+
+    def test_missing_page_is_reported(self, temp_dir, checkpoint_pages):
+        """total_pages 기준으로 빠진 페이지가 있으면 병합하지 않음"""
+        (checkpoint_pages / "page_00002.pdf").unlink()
+        out_pdf = temp_dir / "out.pdf"
+        with pytest.raises(RuntimeError, match="page_00002.pdf"):
+            finalize_merge(temp_dir / "book.pdf", checkpoint_pages, out_pdf, False, total_pages=3)
+        assert not out_pdf.exists()
+
+
+class TestProgressCallback:
+    """진행 콜백 테스트"""
+
+    def test_resume_reports_merge_and_done(self, temp_dir, checkpoint_pages, manifest):
+        """모든 페이지가 체크포인트에 있으면 병합/완료 단계만 보고"""
+        ckpt_dir = temp_dir / "out" / ".checkpoints" / "book"
+        ckpt_dir.parent.mkdir(parents=True)
+        checkpoint_pages.rename(ckpt_dir)
+        save_manifest(ckpt_dir, {**manifest, "file": "book.pdf", "total_pages": 3, "completed_pages": [1, 2, 3]})
+
+        events = []
+        process_pdf_with_checkpoint(temp_dir / "book.pdf", temp_dir / "out", dpi=300, auto_dpi=False,
+                                    lang_opt="eng", conf=50, save_json=False, workers=1, resume=True,
+                                    keep_ckpt=False, progress_callback=events.append)
+
+        assert [e["stage"] for e in events] == ["merge", "done"]
+        assert events[-1]["processed_pages"] == events[-1]["total_pages"] == 3
+        assert (temp_dir / "out" / "book_searchable.pdf").exists()
+
+
+TSV_HEADER = "level\tpage_num\tblock_num\tpar_num\tline_num\tword_num\tleft\ttop\twidth\theight\tconf\ttext"
+
+
+class TestTesseractCalls:
+    """tesseract 호출 (pytesseract 모킹)"""
+
+    @pytest.fixture
+    def tesseract(self, monkeypatch):
+        """run_and_get_multiple_output 대체: 호출 기록 + 고정 PDF/TSV 출력"""
+        calls = []
+        tsv = "\n".join([
+            TSV_HEADER,
+            "1\t1\t0\t0\t0\t0\t0\t0\t100\t50\t-1\t",
+            "5\t1\t1\t1\t1\t1\t10\t20\t30\t12\t96.5\t안녕",
+            "5\t1\t1\t1\t1\t2\t45\t20\t25\t12\t31\tnoise",
+            "5\t1\t1\t1\t1\t3\t75\t20\t20\t12\t88\t ",
+            "5\t1\t1\t1\t1\t4\t10\t40\t40\t12\t50\tworld",
+        ])
+
+        def run_and_get_multiple_output(img, extensions, lang=None):
+            calls.append((extensions, lang))
+            return [b"%PDF-1.5", tsv]
+
+        def forbidden(*args, **kwargs):
+            raise AssertionError("separate tesseract run")
+
+        monkeypatch.setattr(search_pdf.pytesseract, "run_and_get_multiple_output", run_and_get_multiple_output)
+        monkeypatch.setattr(search_pdf.pytesseract, "image_to_data", forbidden)
+        monkeypatch.setattr(search_pdf.pytesseract, "image_to_pdf_or_hocr", forbidden)
+        return calls
+
+    def test_pdf_and_words_from_single_run(self, tesseract):
+        pdf, words = search_pdf.image_to_pdf_and_words(Image.new("L", (100, 50)), "kor", 50)
+
+        assert tesseract == [(["pdf", "tsv"], "kor")]
+        assert pdf == b"%PDF-1.5"
+        assert words == [
+            {"text": "안녕", "confidence": 96, "bbox": {"x": 10, "y": 20, "w": 30, "h": 12}},
+            {"text": "world", "confidence": 50, "bbox": {"x": 10, "y": 40, "w": 40, "h": 12}},
+        ]
+
+    def test_confidence_threshold_filters_words(self, tesseract):
+        _, words = search_pdf.image_to_pdf_and_words(Image.new("L", (100, 50)), "eng", 90)
+        assert [w["text"] for w in words] == ["안녕"]
+
+
+class TestLanguageProbe:
+    """언어 자동 감지"""
+
+    def test_probe_is_downscaled(self):
+        big = Image.new("1", (4000, 2000), 1)
+        probe = search_pdf.make_lang_probe_image(big, max_side=1000)
+        assert probe.size == (1000, 500)
+        assert probe.mode == "L"  # 이진 이미지는 축소 품질을 위해 회색조로
+        assert big.size == (4000, 2000)
+
+    def test_small_image_is_not_copied(self):
+        small = Image.new("L", (800, 600))
+        assert search_pdf.make_lang_probe_image(small, max_side=1000) is small
+
+    @pytest.mark.parametrize("detected, expected", [("ko", "kor"), ("zh-cn", "chi_sim"), ("en", "eng"), ("sw", "eng")])
+    def test_langdetect_code_mapping(self, monkeypatch, detected, expected):
+        seen = []
+
+        def image_to_string(img, lang):
+            seen.append(img.size)
+            return "some text"
+
+        monkeypatch.setattr(search_pdf.pytesseract, "image_to_string", image_to_string)
+        monkeypatch.setattr(search_pdf, "lang_detect", lambda text: detected)
+
+        img = Image.new("L", (3200, 1600))
+        assert search_pdf.detect_language_from_image(img) == expected
+        assert seen == [(search_pdf.LANG_PROBE_MAX_SIDE, search_pdf.LANG_PROBE_MAX_SIDE // 2)]
+
+    def test_blank_page_falls_back(self, monkeypatch):
+        monkeypatch.setattr(search_pdf.pytesseract, "image_to_string", lambda img, lang: "  \n")
+        monkeypatch.setattr(search_pdf, "lang_detect", lambda text: "ko")
+        assert search_pdf.detect_language_from_image(Image.new("L", (10, 10)), fallback="deu") == "deu"
+
+
+class TestChunkWorker:
+    """구간 워커의 묶음 전처리와 페이지별 실패 표시"""
+
+    @pytest.fixture
+    def pages(self, monkeypatch):
+        """래스터화/OCR 대체: 페이지마다 작은 배열, OCR 결과는 고정 PDF 바이트"""
+        def fake_pages(pdf_path, first, last, dpi):
+            for page in range(first, last + 1):
+                yield page, np.full((8, 8, 3), 255, dtype=np.uint8)
+
+        def fake_ocr(pre, lang_opt, conf, need_words, cache=None, key=None):
+            return b"%PDF-page", "eng", [] if need_words else None
+
+        monkeypatch.setattr(search_pdf, "iter_page_arrays", fake_pages)
+        monkeypatch.setattr(search_pdf, "ocr_preprocessed", fake_ocr)
+        return fake_pages
+
+    def test_ocr_failure_marks_only_that_page(self, temp_dir, pages, monkeypatch):
+        ocr = search_pdf.ocr_preprocessed
+        calls = iter(range(1, 100))
+
+        def flaky_ocr(*args, **kwargs):
+            if next(calls) == 2:
+                raise RuntimeError("tesseract crashed")
+            return ocr(*args, **kwargs)
+
+        monkeypatch.setattr(search_pdf, "ocr_preprocessed", flaky_ocr)
+        results = search_pdf.ocr_pdf_chunk_worker("doc.pdf", 4, 6, 300, "eng", 50, True, str(temp_dir))
+
+        assert [(page, ok) for page, ok, _ in results] == [(4, True), (5, False), (6, True)]
+        assert "tesseract crashed" in results[1][2]
+        assert sorted(p.name for p in temp_dir.glob("page_*.pdf")) == ["page_00004.pdf", "page_00006.pdf"]
+        assert (temp_dir / "page_00004.json").exists()
+
+    def test_rasterize_failure_marks_remaining_pages(self, temp_dir, pages, monkeypatch):
+        def broken_pages(pdf_path, first, last, dpi):
+            yield from pages(pdf_path, first, first, dpi)
+            raise OSError("corrupt page")
+
+        monkeypatch.setattr(search_pdf, "iter_page_arrays", broken_pages)
+        results = search_pdf.ocr_pdf_chunk_worker("doc.pdf", 1, 3, 300, "eng", 50, False, str(temp_dir))
+
+        assert [(page, ok) for page, ok, _ in results] == [(1, True), (2, False), (3, False)]
+        assert all("rasterize failed: corrupt page" in err for _, _, err in results[1:])
+
+    def test_page_worker_uses_single_page_chunk(self, temp_dir, pages):
+        assert search_pdf.ocr_pdf_page_worker("doc.pdf", 7, 300, "eng", 50, False, str(temp_dir)) == (7, True, None)
+
+    @pytest.mark.parametrize("mode", ["fixed", "otsu", "adaptive"])
+    def test_chunk_is_preprocessed_as_one_batch(self, temp_dir, pages, monkeypatch, mode):
+        """구간의 페이지를 한 번에 전처리하고, 결과는 페이지별 preprocess 와 픽셀 동일"""
+        rng = np.random.default_rng(7)
+        rasters = {page: rng.integers(0, 256, (12, 9, 3), dtype=np.uint8) for page in (1, 2, 3)}
+        monkeypatch.setattr(search_pdf, "iter_page_arrays",
+                            lambda pdf_path, first, last, dpi: iter(sorted(rasters.items())))
+
+        batches, seen = [], {}
+        batch = search_pdf.preprocess_batch
+        monkeypatch.setattr(search_pdf, "preprocess_batch",
+                            lambda arrays, *a, **kw: batches.append(len(arrays)) or batch(arrays, *a, **kw))
+
+        def record_ocr(pre, lang_opt, conf, need_words, cache=None, key=None):
+            seen[len(seen) + 1] = pre
+            return b"%PDF-page", "eng", None
+
+        monkeypatch.setattr(search_pdf, "ocr_preprocessed", record_ocr)
+        results = search_pdf.ocr_pdf_chunk_worker("doc.pdf", 1, 3, 300, "eng", 50, False, str(temp_dir),
+                                                  binarize_mode=mode)
+
+        assert [ok for _, ok, _ in results] == [True] * 3
+        assert batches == [3]
+        for page, raster in rasters.items():
+            expected = search_pdf.preprocess(Image.fromarray(raster), mode)
+            assert seen[page].mode == "1"
+            assert seen[page].tobytes() == expected.tobytes()
+
+    def test_cache_hits_skip_preprocessing(self, temp_dir, pages, monkeypatch):
+        def caching_ocr(pre, lang_opt, conf, need_words, cache=None, key=None):
+            cache.put(key, "eng", pdf=b"%PDF-page", words=[])
+            return b"%PDF-page", "eng", []
+
+        monkeypatch.setattr(search_pdf, "ocr_preprocessed", caching_ocr)
+        settings = CacheSettings(enabled=True, cache_directory=str(temp_dir / "cache"))
+        for name in ("a", "b"):
+            (temp_dir / name).mkdir()
+        search_pdf.ocr_pdf_chunk_worker("doc.pdf", 1, 2, 300, "eng", 50, True, str(temp_dir / "a"), settings)
+
+        def fail(*args, **kwargs):
+            raise AssertionError("cached pages must not be preprocessed or OCRed")
+
+        monkeypatch.setattr(search_pdf, "preprocess_batch", lambda arrays, *a, **kw: [] if not arrays else fail())
+        monkeypatch.setattr(search_pdf, "ocr_preprocessed", fail)
+        results = search_pdf.ocr_pdf_chunk_worker("doc.pdf", 1, 2, 300, "eng", 50, True, str(temp_dir / "b"), settings)
+
+        assert results == [(1, True, None), (2, True, None)]
+        assert json.loads((temp_dir / "b" / "page_00002.json").read_text(encoding="utf-8"))["lang"] == "eng"
+
+
+class TestAutoDpiSampling:
+    """자동 DPI 샘플 페이지 테스트"""
+
+    def test_samples_spread_across_document(self):
+        """앞쪽 페이지만이 아니라 문서 전체에서 고르게 선택"""
+        assert sample_page_numbers(300, 3) == [51, 151, 251]
+        assert sample_page_numbers(10, 3) == [2, 6, 9]
+
+    def test_short_documents(self):
+        """페이지 수가 샘플 수보다 적으면 모든 페이지"""
+        assert sample_page_numbers(1, 3) == [1]
+        assert sample_page_numbers(2, 3) == [1, 2]
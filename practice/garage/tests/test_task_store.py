@@ -0,0 +1,130 @@
+"""
+Task store tests
+태스크 저장소 테스트 (메모리 / SQLite 백엔드 공통 동작)
+"""
+
+from enum import Enum
+from pathlib import Path
+
+import pytest
+
+from garage.task_store import MemoryTaskStore, SQLiteTaskStore, TaskStore, create_task_store
+
+
+class Status(Enum):
+    PENDING = "pending"
+    IN_PROGRESS = "in_progress"
+    COMPLETED = "completed"
+
+
+ACTIVE = (Status.PENDING, Status.IN_PROGRESS)
+
+
+def make_task(created_at, status=Status.PENDING, sha256=None):
+    return {"status": status, "created_at": created_at, "file_path": Path("a.pdf"), "sha256": sha256}
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, temp_dir):
+    store = create_task_store(request.param, temp_dir / "tasks.db", ACTIVE)
+    yield store
+    store.close()
+
+
+class TestTaskStore:
+    """백엔드 공통 동작"""
+
+    def test_crud_result_and_fingerprint(self, store):
+        store.add("t1", make_task(1.0, sha256="abc"))
+        store.update("t1", status=Status.COMPLETED, total_pages=3)
+        store.set_result("t1", {"pages": 3})
+
+        task = store.get("t1")
+        assert task["status"] == Status.COMPLETED and task["total_pages"] == 3
+        assert store.get_result("t1") == {"pages": 3}
+        assert store.find_by_fingerprint("abc") == "t1"
+
+        assert store.delete("t1") is not None
+        assert store.get("t1") is None and store.get_result("t1") is None
+        assert store.find_by_fingerprint("abc") is None
+
+    def test_active_count_follows_status_changes(self, store):
+        for i in range(4):
+            store.add(f"t{i}", make_task(float(i)))
+        store.update("t0", status=Status.IN_PROGRESS)
+        store.update("t1", status=Status.COMPLETED)
+        store.delete("t2")
+        assert store.count_active() == 2
+        assert sorted(store.ids_with_status([Status.PENDING])) == ["t3"]
+
+    def test_cursor_pagination_newest_first(self, store):
+        for i in range(7):
+            store.add(f"t{i}", make_task(float(i), Status.COMPLETED if i % 2 else Status.PENDING))
+
+        seen, cursor = [], None
+        while True:
+            page, cursor = store.page(3, cursor)
+            seen.extend(task_id for task_id, _ in page)
+            if cursor is None:
+                break
+        assert seen == ["t6", "t5", "t4", "t3", "t2", "t1", "t0"]
+
+        page, cursor = store.page(2, status="completed")
+        assert [t for t, _ in page] == ["t5", "t3"]
+        page, cursor = store.page(2, cursor, status="completed")
+        assert [t for t, _ in page] == ["t1"] and cursor is None
+
+        with pytest.raises(ValueError):
+            store.page(2, "not-a-cursor")
+
+    def test_status_pages_follow_updates_and_expiry(self, store):
+        for i in range(6):
+            store.add(f"t{i}", make_task(float(i)))
+        for task_id in ("t4", "t1", "t3"):
+            store.update(task_id, status=Status.COMPLETED)  # 상태 변경 순서와 무관하게 created_at 순
+        store.expire(2.0)
+
+        page, cursor = store.page(1, status=Status.COMPLETED)
+        assert [t for t, _ in page] == ["t4"]
+        page, cursor = store.page(5, cursor, status=Status.COMPLETED)
+        assert [t for t, _ in page] == ["t3"] and cursor is None
+        assert [t for t, _ in store.page(5, status=Status.PENDING)[0]] == ["t5", "t2"]
+        assert store.page(5, status=Status.IN_PROGRESS) == ([], None)
+
+    def test_expire_removes_only_old_tasks(self, store):
+        for i in range(5):
+            store.add(f"t{i}", make_task(float(i), sha256=f"h{i}"))
+        assert sorted(store.expire(3.0)) == ["t0", "t1", "t2"]
+        assert len(store) == 2
+        assert store.count_active() == 2
+        assert store.find_by_fingerprint("h0") is None
+
+
+def test_sqlite_store_survives_reopen(temp_dir):
+    path = temp_dir / "tasks.db"
+    store = SQLiteTaskStore(path, ACTIVE)
+    store.add("t1", make_task(1.0))
+    store.add("t2", make_task(2.0, Status.COMPLETED))
+    store.set_result("t2", [1, 2, 3])
+    store.close()
+
+    reopened = SQLiteTaskStore(path, ACTIVE)
+    assert reopened.count_active() == 1
+    assert reopened.get("t1")["status"] == Status.PENDING
+    assert reopened.get_result("t2") == [1, 2, 3]
+    reopened.close()
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        create_task_store("redis")
+    assert isinstance(create_task_store("memory"), MemoryTaskStore)
+
+
+def test_incomplete_backend_fails_at_construction():
+    class PartialStore(TaskStore):
+        def add(self, task_id, task):
+            pass
+
+    with pytest.raises(TypeError, match="abstract"):
+        PartialStore()
@@ -0,0 +1,90 @@
+"""
+Streaming upload tests
+업로드 스트리밍 저장/크기 제한 테스트
+"""
+
+import asyncio
+import hashlib
+import io
+
+import pytest
+from fastapi import FastAPI, File, UploadFile
+from fastapi.testclient import TestClient
+
+from garage.uploads import UploadSizeLimitMiddleware, UploadTooLarge, stream_to_disk
+
+
+class ChunkSource:
+    """read(n) 호출을 기록하는 비동기 소스"""
+
+    def __init__(self, data: bytes):
+        self.buffer = io.BytesIO(data)
+        self.reads = []
+
+    async def read(self, n: int = -1) -> bytes:
+        self.reads.append(n)
+        return self.buffer.read(n)
+
+
+class TestStreamToDisk:
+    """청크 저장 테스트"""
+
+    def test_writes_in_chunks_and_hashes(self, temp_dir):
+        data = bytes(range(256)) * 1000
+        source = ChunkSource(data)
+        stored = asyncio.run(stream_to_disk(source, temp_dir / "a.pdf", max_bytes=len(data), chunk_size=4096))
+
+        assert stored.size == len(data)
+        assert stored.sha256 == hashlib.sha256(data).hexdigest()
+        assert (temp_dir / "a.pdf").read_bytes() == data
+        assert set(source.reads) == {4096}
+        assert not (temp_dir / "a.pdf.part").exists()
+
+    def test_oversize_stops_early_and_cleans_up(self, temp_dir):
+        source = ChunkSource(b"x" * 100_000)
+        with pytest.raises(UploadTooLarge):
+            asyncio.run(stream_to_disk(source, temp_dir / "big.pdf", max_bytes=10_000, chunk_size=4096))
+
+        assert len(source.reads) == 3  # 제한을 넘는 청크에서 바로 중단
+        assert list(temp_dir.iterdir()) == []
+
+
+@pytest.fixture
+def client(temp_dir):
+    app = FastAPI()
+    seen = []
+
+    @app.post("/upload")
+    async def upload(file: UploadFile = File(...)):
+        stored = await stream_to_disk(file, temp_dir / "upload.bin", max_bytes=50_000)
+        seen.append(stored)
+        return {"size": stored.size}
+
+    app.add_middleware(UploadSizeLimitMiddleware, max_bytes=lambda: 20_000)
+    test_client = TestClient(app)
+    test_client.seen = seen
+    return test_client
+
+
+class TestUploadSizeLimitMiddleware:
+    """조기 거절 테스트"""
+
+    def test_small_upload_passes(self, client):
+        response = client.post("/upload", files={"file": ("a.pdf", b"%PDF" * 100)})
+        assert response.status_code == 200
+        assert response.json() == {"size": 400}
+
+    def test_declared_length_rejected_before_handler(self, client):
+        response = client.post("/upload", files={"file": ("a.pdf", b"x" * 30_000)})
+        assert response.status_code == 413
+        assert client.seen == []
+
+    def test_chunked_body_rejected_while_streaming(self, client):
+        def body():
+            for _ in range(10):
+                yield b"x" * 4096
+
+        response = client.post("/upload", content=body(),
+                               headers={"content-type": "multipart/form-data; boundary=abc"})
+        assert response.status_code == 413
+        assert client.seen == []
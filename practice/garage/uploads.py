@@ -0,0 +1,147 @@
+"""
+Streaming upload storage
+업로드 스트리밍 저장 (고정 크기 청크, 크기 제한, SHA-256 지문)
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Union
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1MB
+
+
+class UploadTooLarge(Exception):
+    """업로드가 크기 제한을 넘음"""
+
+    def __init__(self, max_bytes: int):
+        super().__init__(f"upload exceeds {max_bytes} bytes")
+        self.max_bytes = max_bytes
+
+
+@dataclass
+class StoredUpload:
+    """디스크에 저장된 업로드"""
+    path: Path
+    size: int
+    sha256: str
+
+
+def _write_chunk(fh, hasher, chunk: bytes) -> None:
+    hasher.update(chunk)
+    fh.write(chunk)
+
+
+async def stream_to_disk(source, dest: Path, max_bytes: int,
+                         chunk_size: int = UPLOAD_CHUNK_SIZE) -> StoredUpload:
+    """비동기 read(n) 을 가진 source 를 청크 단위로 dest 에 저장
+
+    - 파일 열기/쓰기/해시는 스레드에서 실행해 이벤트 루프를 막지 않는다
+    - 누적 크기가 max_bytes 를 넘는 순간 중단하고 부분 파일을 지운 뒤 UploadTooLarge
+    - 저장은 dest.part 에 한 뒤 완료 시 rename (중간 상태 파일이 남지 않도록)
+    """
+    part = dest.with_name(dest.name + ".part")
+    hasher = hashlib.sha256()
+    size = 0
+    fh = await asyncio.to_thread(open, part, "wb")
+    try:
+        while True:
+            chunk = await source.read(chunk_size)
+            if not chunk:
+                break
+            size += len(chunk)
+            if size > max_bytes:
+                raise UploadTooLarge(max_bytes)
+            await asyncio.to_thread(_write_chunk, fh, hasher, chunk)
+        await asyncio.to_thread(fh.close)
+        await asyncio.to_thread(os.replace, part, dest)
+    except BaseException:
+        await asyncio.to_thread(fh.close)
+        part.unlink(missing_ok=True)
+        raise
+    return StoredUpload(dest, size, hasher.hexdigest())
+
+
+class UploadSizeLimitMiddleware:
+    """요청 본문 크기 제한 ASGI 미들웨어
+
+    multipart 파싱(임시 파일 스풀)보다 앞에서 동작한다.
+    Content-Length 가 제한을 넘으면 본문을 읽지 않고 바로 413,
+    Content-Length 가 없으면(chunked) 받은 바이트를 세다가 제한을 넘는 순간 413 을 보내고
+    앱에는 http.disconnect 를 전달해 나머지 본문을 받지 않는다.
+    """
+
+    def __init__(self, app, max_bytes: Union[int, Callable[[], int]], paths=("/upload",)):
+        self.app = app
+        self._max_bytes = max_bytes  # 설정이 lifespan 에서 로드되는 경우를 위해 호출 가능 객체도 허용
+        self.paths = tuple(paths)
+
+    @property
+    def max_bytes(self) -> int:
+        return self._max_bytes() if callable(self._max_bytes) else self._max_bytes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        max_bytes = self.max_bytes
+        for name, value in scope["headers"]:
+            if name == b"content-length":
+                try:
+                    declared = int(value)
+                except ValueError:
+                    declared = None
+                if declared is not None and declared > max_bytes:
+                    await self._reject(send, max_bytes)
+                    return
+                break
+
+        received = 0
+        response_started = False
+        rejected = False
+
+        async def limited_receive():
+            nonlocal received, rejected
+            if rejected:
+                return {"type": "http.disconnect"}
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > max_bytes and not response_started:
+                    # 413 을 먼저 보내고 앱에는 연결 종료로 알려 파싱을 멈추게 한다
+                    rejected = True
+                    await self._reject(send, max_bytes)
+                    return {"type": "http.disconnect"}
+            return message
+
+        async def guarded_send(message):
+            nonlocal response_started
+            if rejected:
+                return  # 이미 413 을 보냈으므로 앱의 응답은 버린다
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except Exception:
+            if not rejected:
+                raise
+
+    @staticmethod
+    async def _reject(send, max_bytes: int):
+        body = json.dumps({"detail": f"파일 크기가 너무 큽니다 (최대: {max_bytes // (1024 * 1024)}MB)"},
+                          ensure_ascii=False).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [(b"content-type", b"application/json"),
+                        (b"content-length", str(len(body)).encode()),
+                        (b"connection", b"close")],
+        })
+        await send({"type": "http.response.body", "body": body})
+